@@ -23,6 +23,7 @@ pytableaux.lang.lex
 Lexical classes.
 """
 import operator as opr
+import threading
 from abc import abstractmethod
 from functools import partial
 from itertools import chain, repeat, starmap, zip_longest
@@ -90,7 +91,9 @@ class Lexical:
 
     The :attr:`hash` and :attr:`sort_tuple` attributes allow for rich
     comparison and ordering of items, with consistency for comparing
-    across different types.
+    across different types. Compound sentences compare and hash by their
+    :attr:`sort_head` and :attr:`sort_tail`, so that the whole tuple does
+    not need to be built.
 
     The :attr:`TYPE` refers to the corresponding member of the special
     :class:`LexType` enum class member, which holds meta information about
@@ -123,9 +126,22 @@ class Lexical:
     # **NB**: The first value of the sort_tuple must be the lexical rank of the
     # type as specified in the :class:`LexType` enum class.
 
+    sort_tail: tuple[Lexical, ...] = EMPTY_SEQ
+    """The sub-items whose :attr:`sort_tuple` values follow the :attr:`sort_head`
+    in the item's :attr:`sort_tuple`. Only :class:`Quantified` and :class:`Operated`
+    sentences have a non-empty tail.
+    """
+
     hash: int
     "The integer hash. Same as ``hash(obj)``."
 
+    @property
+    def sort_head(self) -> tuple[int, ...]:
+        """The leading values of the :attr:`sort_tuple` that belong to the item
+        itself, not including the :attr:`sort_tail`.
+        """
+        return self.sort_tuple
+
     @classmethod
     def first(cls) -> Self:
         """Get the canonically first item of the type. This can be called on
@@ -208,12 +224,13 @@ class Lexical:
 
     @staticmethod
     def hashitem(item: Lexical, /) -> int:
-        """Compute a hash for the item based on :attr:`sort_tuple`.
+        """Compute a hash for the item based on :attr:`sort_head` and the
+        hashes of the :attr:`sort_tail` items.
 
         This method should generally not need to be called, as it is used to
         generate and cache the instance :attr:`hash` property.
         """
-        return hash((__class__, item.sort_tuple))
+        return hash((__class__, item.sort_head, *map(hash, item.sort_tail)))
 
     @staticmethod
     def orderitems(lhs: Lexical, rhs: Lexical, /) -> int:
@@ -241,13 +258,25 @@ class Lexical:
         if lhs is rhs:
             return 0
         try:
-            it = zip_longest(lhs.sort_tuple, rhs.sort_tuple, fillvalue=0)
+            it = zip_longest(lhs.sort_head, rhs.sort_head, fillvalue=0)
         except AttributeError:
             check.inst(lhs, __class__)
             check.inst(rhs, __class__)
             raise # pragma: no cover
         for cmp in filter(None, starmap(opr.sub, it)):
             return cmp
+        # Equal heads have tails of the same length. Since each head determines
+        # the length of its sort tuple, comparing the tails in order is the
+        # same as comparing the flattened sort tuples.
+        stack = list(zip(reversed(lhs.sort_tail), reversed(rhs.sort_tail)))
+        while stack:
+            lhs, rhs = stack.pop()
+            if lhs is rhs:
+                continue
+            it = zip_longest(lhs.sort_head, rhs.sort_head, fillvalue=0)
+            for cmp in filter(None, starmap(opr.sub, it)):
+                return cmp
+            stack.extend(zip(reversed(lhs.sort_tail), reversed(rhs.sort_tail)))
         return 0
 
     @abcs.abcf.temp
@@ -312,7 +341,7 @@ class Lexical:
 class LexicalAbc(Lexical, metaclass=LexicalAbcMeta, lexcopy=True):
     'Base class for non-Enum lexical classes.'
 
-    __slots__ = ('_ident', '_hash',)
+    __slots__ = ('_ident', '_hash', '__weakref__')
 
     @lazy.prop
     def ident(self):
@@ -345,8 +374,9 @@ class LexicalAbc(Lexical, metaclass=LexicalAbcMeta, lexcopy=True):
                     raise Emsg.ReadOnly(self, name)
         super().__setattr__(name, value)
 
-    def __getnewargs__(self):
-        return self.spec
+    def __reduce__(self):
+        # Construct through the metaclass, so the result is interned.
+        return type(self), tuple(self.spec)
 
 
 class LexicalEnum(Lexical, LangCommonEnum, lexcopy=True):
@@ -690,6 +720,15 @@ class Sentence(LexicalAbc):
     operators: tuple[Operator, ...]
     "Sequence of operators, recursive."
 
+    id: int
+    """The intern table id. Equal sentences constructed while one of them is
+    alive are the same object, and have the same id."""
+
+    signature: tuple[type[Sentence], Lexical|None, type[Sentence]|None, Lexical|None]
+    """The compact signature compared by node filters: the sentence type and
+    its operator, quantifier, or predicate, followed by the same for the
+    negatum, if this is a negation, else ``None, None``."""
+
     def negate(self):
         """Negate this sentence, returning the new sentence. This can also be
         invoked using the ``~`` operator.
@@ -1023,11 +1062,15 @@ class Atomic(CoordsItem, Sentence):
     quantifiers = EMPTY_SEQ
     operators = EMPTY_SEQ
 
-    __slots__ = 'atomics'
+    __slots__ = ('_signature', 'atomics', 'id')
 
     def __init__(self, *spec):
         self.atomics = frozenset((self,))
 
+    @lazy.prop
+    def signature(self):
+        return Atomic, None, None, None
+
 class Predicated(Sentence, Sequence[Parameter]):
     'Predicated sentence implementation.'
 
@@ -1067,7 +1110,9 @@ class Predicated(Sentence, Sequence[Parameter]):
 
     __slots__ = (
         '_constants',
+        '_signature',
         '_variables',
+        'id',
         'params',
         'predicate',
         'predicates',
@@ -1084,6 +1129,10 @@ class Predicated(Sentence, Sequence[Parameter]):
     def constants(self):
         return frozenset(p for p in self if type(p) is Constant)
 
+    @lazy.prop
+    def signature(self):
+        return Predicated, self.predicate, None, None
+
     @lazy.prop
     def variables(self):
         return frozenset(p for p in self if type(p) is Variable)
@@ -1131,20 +1180,20 @@ class Quantified(Sentence, Sequence):
         self.items = (
             q := Quantifier(q), v := Variable(v), s := Sentence(s))
         self.quantifier, self.variable, self.sentence = self.items
-        self.spec = (*q.spec, v.spec, s.ident)
-        self.sort_tuple = (
-            self.TYPE.rank,
-            *q.sort_tuple,
-            *v.sort_tuple,
-            *s.sort_tuple)
+        self.sort_head = (self.TYPE.rank, *q.sort_tuple, *v.sort_tuple)
+        self.sort_tail = s,
 
     __slots__ = (
         '_quantifiers',
+        '_signature',
+        '_sort_tuple',
+        '_spec',
+        'id',
         'items',
         'quantifier',
         'sentence',
-        'sort_tuple',
-        'spec',
+        'sort_head',
+        'sort_tail',
         'variable')
 
     quantifier: Quantifier
@@ -1159,6 +1208,20 @@ class Quantified(Sentence, Sequence):
     items: tuple[Quantifier, Variable, Sentence]
     "The items sequence: :class:`Quantifer`, :class:`Variable`, :class:`Sentence`."
 
+    @lazy.prop
+    def spec(self):
+        _prefill(self, 'ident')
+        return (*self.quantifier.spec, self.variable.spec, self.sentence.ident)
+
+    @lazy.prop
+    def signature(self):
+        return Quantified, self.quantifier, None, None
+
+    @lazy.prop
+    def sort_tuple(self):
+        _prefill(self, 'sort_tuple')
+        return (*self.sort_head, *self.sentence.sort_tuple)
+
     @property
     def constants(self):
         return self.sentence.constants
@@ -1258,11 +1321,8 @@ class Operated(Sentence, Sequence[Sentence]):
             raise Emsg.ArityMismatch(oper, oper.arity, operands)
         if len(operands) != oper.arity:
             raise Emsg.ArityMismatch(oper, oper.arity, operands)
-        self.spec = (*oper.spec, tuple(s.ident for s in operands))
-        self.sort_tuple = (
-            self.TYPE.rank,
-            *oper.sort_tuple,
-            *(n for s in operands for n in s.sort_tuple))
+        self.sort_head = (self.TYPE.rank, *oper.sort_tuple)
+        self.sort_tail = operands
 
     __slots__ =  (
         '_atomics',
@@ -1270,13 +1330,17 @@ class Operated(Sentence, Sequence[Sentence]):
         '_operators',
         '_predicates',
         '_quantifiers',
+        '_signature',
+        '_sort_tuple',
+        '_spec',
         '_variables',
+        'id',
         'lhs',
         'operands',
         'operator',
         'rhs',
-        'sort_tuple',
-        'spec')
+        'sort_head',
+        'sort_tail')
 
     operator: Operator
     "The operator."
@@ -1290,6 +1354,23 @@ class Operated(Sentence, Sequence[Sentence]):
     rhs: Sentence
     "The last (right-most) operand."
 
+    @lazy.prop
+    def spec(self):
+        _prefill(self, 'ident')
+        return (*self.operator.spec, tuple(s.ident for s in self))
+
+    @lazy.prop
+    def signature(self):
+        if self.operator is Operator.Negation:
+            return Operated, Operator.Negation, *self.lhs.signature[0:2]
+        return Operated, self.operator, None, None
+
+    @lazy.prop
+    def sort_tuple(self):
+        _prefill(self, 'sort_tuple')
+        return (*self.sort_head, *chain.from_iterable(
+            s.sort_tuple for s in self))
+
     @lazy.prop
     def predicates(self):
         return frozenset(chain.from_iterable(s.predicates for s in self))
@@ -1338,6 +1419,24 @@ class Operated(Sentence, Sequence[Sentence]):
     def __getitem__(self, index: SupportsIndex|slice):
         return self.operands[index]
 
+def _prefill(item: Sentence, name: str, /):
+    """Compute a lazy attribute for the compound sub-sentences of a sentence
+    from the bottom up, so the computation for deeply nested sentences does
+    not recurse.
+    """
+    attr = f'_{name}'
+    stack = [item]
+    while stack:
+        s = stack[-1]
+        for sub in s.sort_tail:
+            if sub.sort_tail and not hasattr(sub, attr):
+                stack.append(sub)
+                break
+        else:
+            stack.pop()
+            if s is not item:
+                getattr(s, name)
+
 #----------------------------------------------------------
 #
 #   LexType
@@ -1513,46 +1612,65 @@ class LexType(LangCommonEnum):
 @closure
 def metacall():
 
-    import os
-    from collections import deque
-
-    class DequeCache:
-
-        __slots__ = ('queue', 'idx', 'rev')
-
-        queue: deque[Lexical]
-        idx: dict[Any, Lexical]
-        "Mapping of called args/specs to lexical, including the lexical itself"
-        rev: dict[Lexical, set]
-        "Mapping of leixcal to index keys, to enable removing"
+    from itertools import count
+    from weakref import WeakValueDictionary
 
+    class InternTable:
+        """Hash-consing table for lexical items. Items are looked up by
+        structure, where sub-sentences are referenced by :attr:`Sentence.id`,
+        and also by the arguments used to call the class. Entries are weak,
+        so an item is dropped once it is no longer referenced elsewhere.
+        """
 
-        def __init__(self, maxlen=int(os.getenv('ITEM_CACHE_SIZE', 1000) or 0)):
-            self.queue = deque(maxlen=maxlen)
-            self.idx = {}
-            self.rev = {}
+        __slots__ = ('calls', 'ids', 'items', 'lock')
+
+        items: WeakValueDictionary[tuple, LexicalAbc]
+        "Mapping of structure keys to items."
+
+        calls: WeakValueDictionary[tuple, LexicalAbc]
+        "Mapping of class name and call arguments, or ident, to items."
+
+        ids: Iterator[int]
+        "The sentence id counter."
+
+        lock: threading.Lock
+        "Guards the lookup and insert of :meth:`intern`."
+
+        def __init__(self):
+            self.items = WeakValueDictionary()
+            self.calls = WeakValueDictionary()
+            self.ids = count()
+            self.lock = threading.Lock()
+
+        def intern(self, inst: LexicalAbc, /) -> LexicalAbc:
+            "Return the existing equal item, or add the new item."
+            key = (inst.sort_head, *(s.id for s in inst.sort_tail))
+            with self.lock:
+                try:
+                    return self.items[key]
+                except KeyError:
+                    pass
+                if isinstance(inst, Sentence):
+                    inst.id = next(self.ids)
+                # Compute the hash while the sub-items' hashes are cached.
+                inst.hash
+                self.items[key] = inst
+                return inst
 
         def __getitem__(self, key):
-            return self.idx[key]
+            return self.calls[key]
 
         def __setitem__(self, key, value):
-            rev = self.rev
-            idx = self.idx
-            queue = self.queue
-            if value in rev:
-                value = idx[value]
-            else:
-                if len(rev) >= queue.maxlen:
-                    old = queue.popleft()
-                    for k in rev.pop(old):
-                        del(idx[k])
-                idx[value] = value
-                rev[value] = {value}
-                queue.append(value)
-            idx[key] = value
-            rev[value].add(key)
-
-    cache = DequeCache()
+            try:
+                self.calls[key] = value
+            except TypeError:
+                # Unhashable call arguments.
+                pass
+
+        def __len__(self):
+            return len(self.items)
+
+    cache = InternTable()
 
     supercall = LangCommonMeta.__call__
 
@@ -1577,7 +1695,7 @@ def metacall():
         try:
             # Check cache
             return cache[clsname, spec]
-        except KeyError:
+        except (KeyError, TypeError):
             pass
 
         try:
@@ -1608,14 +1726,16 @@ def metacall():
             try:
                 # Check cache
                 return cache[clsname, spec]
-            except KeyError:
+            except (KeyError, TypeError):
                 pass
 
             # Construct
             inst: Lexical = Class(*spec)
+        else:
+            inst = cache.intern(inst)
 
         # Save to cache.
-        cache[clsname, spec] = cache[inst.ident] = inst
+        cache[clsname, spec] = inst
 
         return inst
 
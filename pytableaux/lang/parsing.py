@@ -22,11 +22,10 @@ pytableaux.lang.parsing
 from __future__ import annotations
 
 from abc import abstractmethod as abstract
-from collections import deque
 from enum import Enum
 from types import MappingProxyType as MapProxy
-from typing import (TYPE_CHECKING, Any, ClassVar, Iterable, Iterator, Mapping,
-                    Self, TypeVar)
+from typing import (TYPE_CHECKING, Any, ClassVar, Iterable, Mapping, Self,
+                    TypeVar)
 
 from ..errors import (BoundVariableError, Emsg, IllegalStateError, ParseError,
                       UnboundVariableError, UndefinedPredicateError, check)
@@ -48,6 +47,9 @@ __all__ = (
 
 _T = TypeVar('_T')
 NOARG = object()
+END = object()
+"The item type of the end token."
+UNKNOWN = (None, None)
 
 
 class ParserMeta(LangCommonMeta):
@@ -203,22 +205,47 @@ class Parser(metaclass=ParserMeta):
             cls.notation.Parser = cls
 
 class ParseContext:
-    "Parse context."
+    """Parse context. Holds the tokens of the input, the index of the current
+    token, and the state of the sentence being read.
+    """
 
     __slots__ = (
+        '_groups',
         'bound',
+        'index',
         'input',
         'is_open',
-        'pos',
         'predicates',
-        'table')
+        'stack',
+        'table',
+        'tokens')
 
     bound: set[Variable]
+    "The variables bound by the quantifiers being read."
+
+    index: int
+    "The index of the current token."
+
     input: str
+    "The input string."
+
     is_open: bool
-    pos: int
+    "Whether the context is open."
+
     predicates: PredicatesBase
+    "The predicates store."
+
+    stack: list[list]
+    """The frames of the sentences being read. Each frame is a list, whose
+    first item is the method to call with the next sentence read."""
+
     table: ParseTable
+    "The parse table."
+
+    tokens: list[tuple[tuple[Any, Any], int]]
+    "The tokens of the input, followed by an end token."
+
+    _groups: dict[int, tuple[int|None, list[int]]]|None
 
     def __init__(self, input: str, table: ParseTable, predicates: PredicatesBase, /):
         self.input = input
@@ -227,24 +254,26 @@ class ParseContext:
         self.is_open = False
 
     def open(self) -> Self:
-        """Open the context. A context can only be opened once.
+        """Open the context, and tokenize the input. A context can only be
+        opened once.
         """
         if self.is_open:
             raise IllegalStateError('Context already open')
         self.is_open = True
+        self.tokens = self.table.tokenize(self.input)
+        self.tokens.append(((END, None), len(self.input)))
         self.bound = set()
-        self.pos = 0
-        self.chomp()
+        self.stack = []
+        self.index = 0
+        self._groups = None
         return self
 
     def close(self):
-        """Close the context. Eats remaining whitespace and checks that the
-        input is fully consumed.
+        """Close the context. Checks that the input is fully consumed.
 
         Raises:
             ParseError: if input is not fully consumed.
         """
-        self.chomp()
         self.assert_end()
 
     def __enter__(self) -> Self:
@@ -253,32 +282,53 @@ class ParseContext:
     def __exit__(self, typ, value, traceback):
         self.close()
 
-    def current(self) -> str|None:
-        'Return the current character, or ``None`` if after last.'
-        try:
-            return self.input[self.pos]
-        except IndexError:
-            pass
+    @property
+    def pos(self) -> int:
+        "The input position of the current token, or the length if after last."
+        return self.tokens[self.index][1]
 
-    def next(self, n: int = 1, /) -> str|None:
-        'Get the nth character after the current, or ``None``.'
-        try:
-            return self.input[self.pos + n]
-        except IndexError:
-            pass
+    def type(self) -> Any:
+        """Get the item type of the current token.
+
+        Returns:
+            The symbol type, e.g. ``Operator``, ``None`` for an unknown symbol,
+            or :obj:`END` if after last.
+        """
+        return self.tokens[self.index][0][0]
+
+    def value(self) -> Any:
+        """Get the item value of the current token.
+
+        Returns:
+            Table item value, e.g. ``1`` or ``Operator.Negation``.
+        """
+        return self.tokens[self.index][0][1]
+
+    def advance(self, n: int = 1, /) -> Self:
+        """Advance the current token index.
+
+        Args:
+            n: The number of tokens to advance, default ``1``.
+
+        Returns:
+            self
+        """
+        self.index += n
+        return self
 
     def assert_current(self) -> Any:
         """
         Returns:
-            Type of current char, e.g. ``Operator``, or ``None`` if
+            Type of current token, e.g. ``Operator``, or ``None`` if
             unknown type.
 
         Raises:
             ParseError: if after last.
         """
-        if not self.has_current():
+        ctype = self.tokens[self.index][0][0]
+        if ctype is END:
             raise ParseError(f'Unexpected end of input at position {self.pos}.')
-        return self.type(self.current(), None)
+        return ctype
 
     def assert_current_is(self, ctype: Any, /):
         """
@@ -299,76 +349,32 @@ class ParseContext:
 
     def assert_end(self):
         'Raise an error if not after last.'
-        if len(self.input) > self.pos:
+        if self.tokens[self.index][0][0] is not END:
             raise ParseError(self._unexp_msg())
 
-    def has_next(self, n = 1, /) -> bool:
-        'Whether there are n-many characters after the current.'
-        return len(self.input) > self.pos + n
-
-    def has_current(self) -> bool:
-        'Whether there is a current character.'
-        return len(self.input) > self.pos
-
-    def advance(self, n: int = 1, /) -> Self:
-        """Advance the current pointer n-many characters, and then eat whitespace.
-
-        Args:
-            n: The number of characters to advance, default ``1``.
-
-        Returns:
-            self
-        """
-        self.pos += n  
-        self.chomp()
-        return self
-
-    def chomp(self) -> ParseContext:
-        """Proceeed through whitepsace.
-        
-        Returns:
-            self
-        """
-        try:
-            while self.type(self.input[self.pos], None) is Marking.whitespace:
-                self.pos += 1
-        except IndexError:
-            pass
-        return self
-
-    def type(self, char: str, default = NOARG, /) -> Any:
-        """Get the item type for the character.
-
-        Args:
-            char: The character symbol.
-            default: The value to return if missing.
-
-        Returns:
-            The symbol type, or ``default`` if provided.
-
-        Raises:
-            KeyError: if symbol not in table and no default passed.
-        """
-        try:
-            return self.table[char][0]
-        except KeyError:
-            if default is NOARG:
-                raise
-            return default
-
-    def value(self, char: str, /) -> Any:
-        """Get the item value for the character.
-
-        Args:
-            char: The character symbol.
+    def group(self) -> tuple[int|None, list[int]]:
+        """Get the group opened by the current paren token. The groups of the
+        input are found in one pass, the first time this is called.
 
         Returns:
-            Table item value, e.g. ``1`` or ``Operator.Negation``.
-
-        Raises:
-            KeyError: if symbol not in table.
+            The index of the close paren token, or ``None`` if the group is
+            unterminated, and the indexes of the binary operator tokens in the
+            group, outside any inner group.
         """
-        return self.table[char][1]
+        if self._groups is None:
+            groups = self._groups = {}
+            opened = []
+            for i, ((ctype, value), _) in enumerate(self.tokens):
+                if ctype is Marking.paren_open:
+                    opened.append(i)
+                    groups[i] = None, []
+                elif ctype is Marking.paren_close:
+                    if opened:
+                        j = opened.pop()
+                        groups[j] = i, groups[j][1]
+                elif ctype is Operator and opened and Operator(value).arity == 2:
+                    groups[opened[-1]][1].append(i)
+        return self._groups[self.index]
 
     def bind(self, v: Variable, /) -> Variable:
         """Add a variable to the set of bound variables, checking that it is
@@ -428,20 +434,22 @@ class ParseContext:
         return v, s
 
     def _unexp_msg(self) -> str:
-        char = self.input[self.pos]
-        ctype = self.type(char, None)
+        (ctype, _), pos = self.tokens[self.index]
         if ctype is None:
             pfx = 'Unexpected symbol'
         else:
             pfx = f'Unexpected {ctype} symbol'
-        return f"{pfx} '{char}' at position {self.pos}"
+        return f"{pfx} '{self.input[pos]}' at position {pos}"
 
 class Ctype(frozenset, Enum):
     pred = {Predicate, Predicate.System}
     param = {Constant, Variable}
 
 class DefaultParser(Parser):
-    """Parser default implementation.
+    """Parser default implementation. The input is split into tokens by the
+    :class:`ParseTable`, and the operands of a sentence are read with the frame
+    stack of the :class:`ParseContext` instead of recursion, so the depth of a
+    sentence is not limited by the recursion limit.
     """
 
     def __call__(self, input: str, /) -> Sentence:
@@ -459,9 +467,10 @@ class DefaultParser(Parser):
 
     def _read(self, context: ParseContext, /) -> Sentence:
         """
-        Internal entrypoint for reading a sentence. Implementation is recursive.
-        This provides the default implementation for prefix notation sentences,
-        i.e. atomic, predicated, and quantified sentences.
+        Internal entrypoint for reading a sentence. Each read method returns
+        either a sentence, or ``None`` after pushing a frame for the sentences
+        it needs. A finished sentence is passed to the top frame, which likewise
+        returns a sentence after popping itself, or ``None`` to read the next.
 
         Args:
             context (ParseContext): The parse context
@@ -472,78 +481,104 @@ class DefaultParser(Parser):
         Raises:
             ParseError:
         """
-        try:
-            method = self._methodmap[context.assert_current()]
-        except KeyError:
-            raise ParseError(context._unexp_msg()) from None
-        return getattr(self, method)(context)
+        tokens = context.tokens
+        stack = context.stack
+        depth = len(stack)
+        methodmap = self._methodmap
+        while True:
+            try:
+                method = methodmap[tokens[context.index][0][0]]
+            except KeyError:
+                context.assert_current()
+                raise ParseError(context._unexp_msg()) from None
+            s = getattr(self, method)(context)
+            while s is not None:
+                if len(stack) == depth:
+                    return s
+                frame = stack[-1]
+                s = frame[0](context, frame, s)
 
     @abstract
-    def _read_operated(self, context: ParseContext, /) -> Operated:
+    def _read_operated(self, context: ParseContext, /) -> None:
         raise NotImplementedError
 
+    def _feed_operated(self, context: ParseContext, frame: list, s: Sentence, /) -> Operated|None:
+        'Add an operand, and make the sentence after the last.'
+        _, oper, operands = frame
+        operands.append(s)
+        if len(operands) < oper.arity:
+            return
+        context.stack.pop()
+        return oper(*operands)
+
     def _read_atomic(self, context: ParseContext, /) -> Atomic:
         'Read an atomic sentence.'
         return Atomic(self._read_coords(context))
 
     def _read_predicated(self, context: ParseContext, /) -> Predicated:
         'Read a predicated sentence.'
-        try:
-            pred = self._read_predicate(context)
-        except UndefinedPredicateError as err:
-            if not self.opts['auto_preds']:
-                raise
-            coords = err.coords
-        else:
-            return pred(self._read_params(context, pred.arity))
-        params = tuple(self._read_params_auto(context))
-        arity = len(params)
-        try:
-            pred = Predicate(*coords, arity)
-        except ValueError as err:
-            raise ParseError(
-                f'Error auto-creating predicate {coords=} {arity=}: {err}')
-        self.predicates.add(pred)
-        return pred(params)
-
-    def _read_quantified(self, context: ParseContext, /) -> Quantified:
-        'Read a quantified sentence.'
-        quant = context.value(context.current())
+        pred = self._read_predicate(context)
+        if isinstance(pred, Predicate):
+            return pred(*self._read_params(context, pred.arity))
+        params = self._read_params_auto(context)
+        return self._create_predicate(pred, len(params))(*params)
+
+    def _read_quantified(self, context: ParseContext, /) -> None:
+        'Read the quantifier and variable of a quantified sentence.'
+        quant = context.value()
         context.advance()
         context.assert_current_is(Variable)
-        return quant(
-            *context.unbind(
-                context.bind(Variable(self._read_coords(context))),
-                self._read(context)))
-
-    def _read_predicate(self, context: ParseContext, /) -> Predicate:
-        'Read a predicate.'
-        pchar = context.current()
-        if context.type(pchar) is Predicate.System:
+        v = context.bind(Variable(self._read_coords(context)))
+        context.stack.append([self._feed_quantified, quant, v])
+
+    def _feed_quantified(self, context: ParseContext, frame: list, s: Sentence, /) -> Quantified:
+        'Make the quantified sentence from the inner sentence.'
+        _, quant, v = frame
+        context.stack.pop()
+        return quant(*context.unbind(v, s))
+
+    def _read_predicate(self, context: ParseContext, /) -> Predicate|BiCoords:
+        """Read a predicate. If the predicate is not defined, and the `auto_preds`
+        option is enabled, return its coords.
+        """
+        (ctype, value), pos = context.tokens[context.index]
+        if ctype is Predicate.System:
             context.advance()
-            return Predicate(context.value(pchar))
+            return Predicate(value)
         coords = self._read_coords(context)
         try:
             return self.predicates.get(coords)
         except KeyError:
+            if self.opts['auto_preds']:
+                return coords
             raise UndefinedPredicateError(
                 coords,
-                f"Undefined predicate symbol '{pchar}' at position {context.pos}")
+                f"Undefined predicate symbol '{context.input[pos]}' at position {context.pos}")
+
+    def _create_predicate(self, coords: BiCoords, arity: int, /) -> Predicate:
+        'Create and add a predicate for the `auto_preds` option.'
+        try:
+            pred = Predicate(*coords, arity)
+        except ValueError as err:
+            raise ParseError(
+                f'Error auto-creating predicate {coords=} {arity=}: {err}')
+        self.predicates.add(pred)
+        return pred
 
-    def _read_params(self, context: ParseContext, num: int, /) -> Iterator[Parameter]:
+    def _read_params(self, context: ParseContext, num: int, /) -> list[Parameter]:
         'Read the given number of parameters.'
         read = self._read_parameter
-        for _ in range(num):
-            yield read(context)
+        return [read(context) for _ in range(num)]
 
-    def _read_params_auto(self, context: ParseContext, /) -> Iterator[Parameter]:
+    def _read_params_auto(self, context: ParseContext, /) -> list[Parameter]:
         'Read indefinite number of parameters'
         read = self._read_parameter
-        ftype = context.type
-        fcurr = context.current
+        tokens = context.tokens
         ctypes = Ctype.param
-        while ftype(fcurr(), None) in ctypes:
-            yield read(context)
+        params = []
+        while tokens[context.index][0][0] in ctypes:
+            params.append(read(context))
+        return params
 
     def _read_parameter(self, context: ParseContext, /) -> Parameter:
         'Read a single parameter (constant or variable)'
@@ -553,32 +588,27 @@ class DefaultParser(Parser):
             context.check_bound(param)
         return param
 
-    def _read_subscript(self, context: ParseContext, /) -> int:
-        """Read the subscript starting from the current character. If the current
-        character is not a digit, or we are after last, then the subscript is
-        ``0```. Otherwise, all consecutive digit characters are read
-        (whitespace allowed), and then converted to an integer, which is then
-        returned.
-        """
-        digits = deque()
-        while True:
-            cur = context.current()
-            if context.type(cur, None) is not Marking.digit:
-                break
-            digits.append(context.value(cur))
-            context.advance()
-        return int(''.join(map(str, digits)) or 0)
-
     def _read_coords(self, context: ParseContext, /) -> BiCoords:
-        """Read (index, subscript) coords starting from the current character,
-        which must be in the list of characters given. `index` is the list index in
-        the symbol set. This is a generic way to read user predicates,
-        atomics, variables, constants, etc. Note, this will not work for
-        system predicates, because they have string keys in the symbols set.
+        """Read (index, subscript) coords starting from the current token. `index`
+        is the value of the token. The subscript is read from all consecutive
+        digit tokens that follow (whitespace allowed), or is ``0`` if there
+        are none. This is a generic way to read user predicates, atomics,
+        variables, constants, etc. Note, this will not work for system
+        predicates, because they have string keys in the symbols set.
         """
-        index = context.value(context.current())
-        context.advance()
-        return BiCoords(index, self._read_subscript(context))
+        tokens = context.tokens
+        i = context.index
+        index = tokens[i][0][1]
+        i += 1
+        if tokens[i][0][0] is not Marking.digit:
+            context.index = i
+            return BiCoords(index, 0)
+        digits = []
+        while tokens[i][0][0] is Marking.digit:
+            digits.append(str(tokens[i][0][1]))
+            i += 1
+        context.index = i
+        return BiCoords(index, int(''.join(digits)))
 
     __delattr__ = Emsg.ReadOnly.razr
 
@@ -587,10 +617,9 @@ class PolishParser(DefaultParser, primary=True):
 
     notation = Notation.polish
 
-    def _read_operated(self, context: ParseContext, /) -> Operated:
-        oper = Operator(context.value(context.current()))
+    def _read_operated(self, context: ParseContext, /) -> None:
+        context.stack.append([self._feed_operated, Operator(context.value()), []])
         context.advance()
-        return oper(self._read(context) for _ in range(oper.arity))
 
 class StandardParser(DefaultParser, primary=True):
     """Standard notation parser.
@@ -621,27 +650,22 @@ class StandardParser(DefaultParser, primary=True):
         Constant: '_read_infix_predicated',
         Variable: '_read_infix_predicated'})
 
-    def _read_operated(self, context: ParseContext, /) -> Operated:
-        oper = Operator(context.value(context.current()))
+    def _read_operated(self, context: ParseContext, /) -> None:
+        oper = Operator(context.value())
         # only unary operators can be prefix operators
         if oper.arity != 1:
             raise ParseError(
-                f"Unexpected non-prefix operator symbol '{context.current()}' "
+                f"Unexpected non-prefix operator symbol '{context.input[context.pos]}' "
                 f"at position {context.pos}")
+        context.stack.append([self._feed_operated, oper, []])
         context.advance()
-        return oper(self._read(context))
 
     def _read_infix_predicated(self, context: ParseContext, /) -> Predicated:
         lhp = self._read_parameter(context)
         context.assert_current_in(Ctype.pred)
         ppos = context.pos
-        try:
-            pred = self._read_predicate(context)
-        except UndefinedPredicateError as err:
-            if not self.opts['auto_preds']:
-                raise
-            coords = err.coords
-        else:
+        pred = self._read_predicate(context)
+        if isinstance(pred, Predicate):
             arity = pred.arity
             if arity < 2:
                 raise ParseError(
@@ -652,65 +676,49 @@ class StandardParser(DefaultParser, primary=True):
         if arity < 2:
             raise ParseError(
                 f"Unexpected infixed {arity}-ary predicate symbol at position {ppos}")
-        try:
-            pred = Predicate(*coords, arity)
-        except ValueError as err:
+        return self._create_predicate(pred, arity)(*params)
+
+    def _read_from_paren_open(self, context: ParseContext, /) -> None:
+        # if we have an open parenthesis, then we demand a binary infix operator
+        # sentence. the groups give the corresponding close parenthesis, and the
+        # binary operators outside of any inner parentheses.
+        close, opers = context.group()
+        if len(opers) > 1:
+            oper = Operator(context.tokens[opers[0]][0][1])
             raise ParseError(
-                f'Error auto-creating predicate {coords=} {arity=}: {err}')
-        self.predicates.add(pred)
-        return pred(params)
-
-    def _read_from_paren_open(self, context: ParseContext, /) -> Operated:
-        # if we have an open parenthesis, then we demand a binary infix operator sentence.
-        # scan ahead to:
-        #   - find the corresponding close parenthesis position
-        #   - find the binary operator and its position
-        oper = oper_pos = None
-        depth = length = 1
-        while depth:
-            if not context.has_next(length):
-                raise ParseError(
-                    f'Unterminated open paren at position {context.pos}')
-            peek = context.next(length)
-            ptype = context.type(peek, None)
-            if ptype is Marking.paren_close:
-                depth -= 1
-            elif ptype is Marking.paren_open:
-                depth += 1
-            elif ptype is Operator:
-                peek_oper = Operator(context.value(peek))
-                if peek_oper.arity == 2 and depth == 1:
-                    oper_pos = context.pos + length
-                    if oper is not None:
-                        raise ParseError(
-                            f'Unexpected {oper.name} symbol at position {oper_pos}')
-                    oper = peek_oper
-            length += 1
-        if oper is None:
+                f'Unexpected {oper.name} symbol at position {context.tokens[opers[1]][1]}')
+        if close is None:
+            raise ParseError(
+                f'Unterminated open paren at position {context.pos}')
+        if not opers:
             raise ParseError(
                 f'Missing binary operator at position {context.pos}')
-        # now we can divide the string into lhs and rhs
+        oper_index, = opers
+        oper = Operator(context.tokens[oper_index][0][1])
         lhs_start = context.pos + 1
-        # move past the open paren
+        # move past the open paren, and read the lhs
+        context.stack.append([self._feed_from_paren_open, oper, oper_index, lhs_start, None])
         context.advance()
-        # read the lhs
-        lhs = self._read(context)
-        context.chomp()
-        if context.pos != oper_pos:
-            raise ParseError(
-                f'Invalid left side expression starting at position {lhs_start} '
-                f'and ending at position {context.pos}, which proceeds past operator '
-                f'({oper.name}) at position {oper_pos}')
-        # move past the operator
-        context.advance()
-        # read the rhs
-        rhs = self._read(context)
-        context.chomp()
+
+    def _feed_from_paren_open(self, context: ParseContext, frame: list, s: Sentence, /) -> Operated|None:
+        _, oper, oper_index, lhs_start, lhs = frame
+        if lhs is None:
+            if context.index != oper_index:
+                raise ParseError(
+                    f'Invalid left side expression starting at position {lhs_start} '
+                    f'and ending at position {context.pos}, which proceeds past operator '
+                    f'({oper.name}) at position {context.tokens[oper_index][1]}')
+            frame[-1] = s
+            # move past the operator, and read the rhs
+            context.advance()
+            return
         # now we should have a close paren
         context.assert_current_is(Marking.paren_close)
         # move past the close paren
         context.advance()
-        return oper(lhs, rhs)
+        context.stack.pop()
+        return oper(lhs, s)
+
 
 class ParseTable(MapCover[str, Any]):
     'Parser table data class.'
@@ -753,7 +761,10 @@ class ParseTable(MapCover[str, Any]):
     reversed: Mapping
     "Reversed mapping of item to symbol."
 
-    __slots__ = ('reversed', 'notation', 'dialect')
+    blank: frozenset[str]
+    "The whitespace symbols."
+
+    __slots__ = ('_lookup', 'blank', 'reversed', 'notation', 'dialect')
 
     def __init__(self, data: Mapping, /):
         """
@@ -771,8 +782,28 @@ class ParseTable(MapCover[str, Any]):
             if defaultkey in rev:
                 rev.setdefault(key, rev[defaultkey])
         self.reversed = MapProxy(rev)
+        self.blank = frozenset(
+            char for char, item in mapping.items()
+            if item[0] is Marking.whitespace)
+        self._lookup = mapping
         super().__init__(mapping)
 
+    def tokenize(self, input: str, /) -> list[tuple[tuple[Any, Any], int]]:
+        """Split the input into tokens, skipping whitespace. Each token is the
+        table item of the symbol, or ``(None, None)`` for an unknown symbol, and
+        its position in the input.
+
+        Args:
+            input: The input string.
+
+        Returns:
+            The list of tokens.
+        """
+        get = self._lookup.get
+        blank = self.blank
+        return [(get(char, UNKNOWN), pos)
+            for pos, char in enumerate(input) if char not in blank]
+
     _keydefaults = MapProxy({
         Marking.whitespace: (Marking.whitespace, 0),
         Marking.paren_open: (Marking.paren_open, 0),
@@ -113,7 +113,7 @@ class Rules(LogicType.Rules):
         def _find_closing_node(self, node, branch, /):
             s = self.sentence(node)
             if s is not None:
-                return branch.find(swnode(-s, node.get('world')))
+                return branch.find_literal(-s, None, node.get('world'))
 
         def example_nodes(self):
             s = Atomic.first()
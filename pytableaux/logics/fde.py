@@ -60,7 +60,7 @@ class Rules(LogicType.Rules):
         def _find_closing_node(self, node: Node, branch: Branch, /):
             s = self.sentence(node)
             if s is not None:
-                return branch.find(sdwnode(s, not node['designated'], node.get('world')))
+                return branch.find_literal(s, not node['designated'], node.get('world'))
 
         def example_nodes(self):
             s = Atomic.first()
@@ -49,7 +49,7 @@ class Rules(FDE.Rules):
 
         def _find_closing_node(self, node, branch, /):
             if node['designated']:
-                return branch.find(sdwnode(-node['sentence'], True, node.get('world')))
+                return branch.find_literal(-node['sentence'], True, node.get('world'))
 
         def example_nodes(self):
             a = Atomic.first()
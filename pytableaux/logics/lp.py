@@ -49,7 +49,7 @@ class Rules(FDE.Rules):
 
         def _find_closing_node(self, node, branch, /):
             if node['designated'] is False:
-                return branch.find(sdwnode(-self.sentence(node), False, node.get('world')))
+                return branch.find_literal(-self.sentence(node), False, node.get('world'))
 
         def example_nodes(self):
             s = Atomic.first()
@@ -27,7 +27,7 @@ from dataclasses import dataclass
 from functools import partial, reduce
 from itertools import product, starmap
 from types import MappingProxyType as MapProxy
-from typing import Any, Generic, Iterable, Iterator, Literal, Self, Sequence, TypeVar, TYPE_CHECKING
+from typing import Any, Callable, Generic, Iterable, Iterator, Literal, Self, Sequence, TypeVar, TYPE_CHECKING
 
 from ..errors import DenotationError, IllegalStateError, ModelValueError, check
 from ..lang import (Argument, Atomic, Constant, Operated, Operator, Predicate,Quantifier, 
@@ -162,13 +162,21 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
     R: Logic.Model.Access
     "The `access` relation"
 
+    evaluators: Mapping[type[Sentence], Callable[..., MvalT_co]]
+    "A map from sentence type to its ``value_of_`` method."
+
+    verify_ms: float|None
+    "The time in milliseconds to verify the model against the argument, if any."
+
     __slots__ = (
         '_finished',
         '_is_frame_complete',
+        '_memo',
         'constants',
         'frames',
         'R',
-        'sentences')
+        'sentences',
+        'verify_ms')
 
     @property
     def id(self) -> int:
@@ -181,6 +189,8 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
     def __init__(self):
         self._finished = False
         self._is_frame_complete = False
+        self._memo = {}
+        self.verify_ms = None
         if self.Meta.modal:
             self.frames = defaultdict(partial(self.Frame, self))
         else:
@@ -206,16 +216,29 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
                 self.is_sentence_opaque(s.lhs)))
 
     def value_of(self, s: Sentence, /, **kw) -> MvalT_co:
+        """Evaluate a sentence. Since the values cannot change once the model
+        is finished, the value for each sentence and world is memoized.
+        """
         self._check_finished()
+        if len(kw) > 1 or kw and 'world' not in kw:
+            return self._value_of(s, **kw)
+        key = s, kw.get('world', 0)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = self._memo[key] = self._value_of(s, **kw)
+        return value
+
+    def _value_of(self, s: Sentence, /, **kw) -> MvalT_co:
         if self.is_sentence_opaque(s):
             return self.value_of_opaque(s, **kw)
         try:
-            name = f'value_of_{type(s).__name__.lower()}'
-            func = getattr(self, name)
-        except AttributeError:
+            func = self.evaluators[type(s)]
+        except KeyError:
             check.inst(s, Sentence)
             raise NotImplementedError from ValueError(s)
-        return func(s, **kw)
+        return func(self, s, **kw)
 
     def value_of_opaque(self, s: Sentence, /, *, world: int = 0) -> MvalT_co:
         self._check_finished()
@@ -329,9 +352,14 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
         self.sentences.add(s)
 
     def is_countermodel_to(self, a: Argument, /) -> bool:
-        return (
-            all(map(self.Meta.designated_values.__contains__, map(self.value_of, a.premises))) and
-            self.value_of(a.conclusion) not in self.Meta.designated_values)
+        designated = self.Meta.designated_values
+        value_of = self.value_of
+        if value_of(a.conclusion) in designated:
+            return False
+        for s in a.premises:
+            if value_of(s) not in designated:
+                return False
+        return True
 
     def read_branch(self, branch: Branch, /) -> Self:
         self._check_not_finished()
@@ -488,6 +516,9 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
     @classmethod
     def __init_subclass__(cls):
         super().__init_subclass__()
+        cls.evaluators = MapProxy({
+            stype: getattr(cls, f'value_of_{stype.__name__.lower()}')
+            for stype in (Atomic, Predicated, Quantified, Operated)})
         Meta = cls.__dict__.get('Meta', LogicType.Meta.for_module(cls.__module__))
         if not Meta:
             return
@@ -498,12 +529,17 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
         cls.minval = min(values)
         cls.maxval = max(values)
         cls.truth_function = cls.TruthFunction(values)
+        cls.truth_function.tables.update(
+            (oper, cls.truth_table(oper).mapping)
+            for oper in Meta.truth_functional_operators)
 
     class TruthFunction(Generic[MvalT], metaclass=ModelsMeta):
 
         values: type[MvalT]
         maxval: MvalT
         minval: MvalT
+        tables: dict[Operator, Mapping[tuple[MvalT, ...], MvalT]]
+        "Lookup tables of the outputs for each operator, from the truth tables."
         generalizers = MapProxy({
             Quantifier.Existential: Operator.Disjunction,
             Quantifier.Universal: Operator.Conjunction,
@@ -513,14 +549,20 @@ class BaseModel(Generic[MvalT_co], metaclass=ModelsMeta):
         __slots__ = (
             'maxval',
             'minval',
+            'tables',
             'values')
 
         def __init__(self, values: type[MvalT]) -> None:
             self.values = values
             self.maxval = max(values)
             self.minval = min(values)
+            self.tables = {}
 
         def __call__(self, oper: Operator, *args: MvalT) -> MvalT:
+            try:
+                return self.tables[oper][args]
+            except KeyError:
+                pass
             try:
                 name = oper.name
             except AttributeError:
@@ -49,6 +49,7 @@ __all__ = (
     'helpers',
     'Modal',
     'Node',
+    'prove_many',
     'QuitFlagNode',
     'Rule',
     'sdnode',
@@ -178,6 +179,7 @@ class TableauMeta(abcs.AbcMeta):
         trunk  : StopWatch
         tree   : StopWatch
         models : StopWatch
+        verify : StopWatch
 
         @classmethod
         def create(cls):
@@ -205,6 +207,7 @@ class TableauMeta(abcs.AbcMeta):
         STEP_CLOSED = 'STEP_CLOSED'
         INDEX       = 'INDEX'
         PARENT      = 'PARENT'
+        FORK        = 'FORK'
         NODES       = 'NODES'
 
     class StepEntry(NamedTuple):
@@ -218,6 +221,21 @@ class TableauMeta(abcs.AbcMeta):
         def __repr__(self):
             return f'<StepEntry:{id(self)}:{self.rule.name}:{self.target.type}>'
 
+    class Delta(NamedTuple):
+        'The changes to a tableau from one step.'
+        step: int
+        "The current step number after the changes."
+        entry: StepEntry|None
+        "The step entry, or ``None`` for the initial state."
+        branches: tuple[Branch, ...]
+        "The added branches."
+        nodes: tuple[tuple[Node, Branch], ...]
+        "The added nodes, with their branches."
+        ticks: tuple[tuple[Node, Branch], ...]
+        "The ticked nodes, with their branches."
+        closed: tuple[Branch, ...]
+        "The closed branches."
+
 class GetLogicMetaMixinMetaType(type):
 
     @property
@@ -415,7 +433,10 @@ class RuleMeta(abcs.AbcMeta, GetLogicMetaMixinMetaType):
         def __init__(self, rule: Rule, /):
             self.rule = rule
             self.config = rule.Helpers.get(type(self))
-            self.listen_on()
+            if rule.tableau.profile is None:
+                self.listen_on()
+            else:
+                rule.tableau.profile.listen(self)
 
         def listen_on(self):
             pass
@@ -618,3 +639,6 @@ pass
 from . import filters as filters
 from . import helpers as helpers
 from .writers import TabWriter as TabWriter
+
+pass
+from .batch import prove_many as prove_many
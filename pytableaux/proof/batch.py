@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.proof.batch
+^^^^^^^^^^^^^^^^^^^^^^
+
+Build many proofs in parallel over a process pool.
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor, Future,
+                                ProcessPoolExecutor, wait)
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from ..errors import ProofTimeoutError
+from ..lang import Argument
+from ..logics import LogicType, registry
+from ..tools import EMPTY_SEQ
+from .tableaux import Tableau
+
+__all__ = (
+    'ProofJob',
+    'ProofResult',
+    'prove_many')
+
+class ProofJob(NamedTuple):
+    "The payload sent to a worker process."
+
+    index: int
+    "The position of the pair in the input."
+    logic: str
+    "The logic name."
+    argstr: str
+    "The argument string, see :meth:`Argument.argstr`."
+    title: str|None
+    "The argument title."
+    opts: dict[str, Any]
+    "The tableau options."
+    models: bool
+    "Whether to include model data in the result."
+
+    @classmethod
+    def create(cls, index: int, logic: Any, argument: Argument|str, /,
+        opts: dict[str, Any], models: bool) -> ProofJob:
+        if not isinstance(argument, Argument):
+            argument = Argument(argument)
+        return cls(
+            index,
+            registry(logic).Meta.name,
+            argument.argstr(),
+            argument.title,
+            opts,
+            models)
+
+class ProofResult(NamedTuple):
+    "A lightweight record of a finished proof."
+
+    index: int
+    "The position of the pair in the input."
+    logic: str
+    "The logic name."
+    argstr: str
+    "The argument string."
+    title: str|None
+    "The argument title."
+    result: str
+    """The result word from the tableau ``stats``, ``'Timeout'`` if the
+    `build_timeout` was exceeded, or ``'Error'``."""
+    valid: bool|None
+    "Whether the argument is valid, or ``None`` if the proof is not completed."
+    stats: dict[str, Any]
+    "The tableau stats."
+    models: tuple[dict, ...]
+    "The model data, if requested."
+    error: str|None
+    "The error message, if any."
+
+    @property
+    def timed_out(self) -> bool:
+        return self.result == 'Timeout'
+
+    @classmethod
+    def failed(cls, index: int, logic: str, argstr: str, title: str|None,
+        err: Exception, /) -> ProofResult:
+        "Make the ``'Error'`` result for a job that raised `err`."
+        return cls(
+            index  = index,
+            logic  = logic,
+            argstr = argstr,
+            title  = title,
+            result = 'Error',
+            valid  = None,
+            stats  = {},
+            models = EMPTY_SEQ,
+            error  = f'{type(err).__name__}: {err}')
+
+def prove(job: ProofJob, /) -> ProofResult:
+    """Build the proof for a job. This is the function run in the worker
+    processes. Timeouts and other errors are caught and recorded on the
+    result, so the worker is never lost.
+
+    Args:
+        job (ProofJob): The job payload.
+
+    Returns:
+        ProofResult: The result.
+    """
+    models = EMPTY_SEQ
+    error = None
+    try:
+        argument = Argument.from_argstr(job.argstr, title=job.title)
+        tab = Tableau(job.logic, argument, **job.opts)
+        try:
+            tab.build()
+        except ProofTimeoutError as err:
+            result = 'Timeout'
+            error = str(err)
+        else:
+            result = tab.stats['result']
+            if job.models:
+                models = tuple(model.get_data() for model in tab.models)
+    except Exception as err:
+        return ProofResult.failed(job.index, job.logic, job.argstr, job.title, err)
+    return ProofResult(
+        index  = job.index,
+        logic  = job.logic,
+        argstr = job.argstr,
+        title  = job.title,
+        result = result,
+        valid  = tab.valid,
+        stats  = dict(tab.stats),
+        models = models,
+        error  = error)
+
+def _jobs(pairs: Iterable[tuple[Any, Argument|str]], opts: dict[str, Any],
+    models: bool, /) -> Iterator[ProofJob|ProofResult]:
+    "Create the jobs, or the error results for the pairs that cannot be sent."
+    for index, (logic, argument) in enumerate(pairs):
+        try:
+            yield ProofJob.create(index, logic, argument, opts, models)
+        except Exception as err:
+            if isinstance(argument, Argument):
+                argstr, title = argument.argstr(), argument.title
+            else:
+                argstr, title = str(argument), None
+            yield ProofResult.failed(index, str(logic), argstr, title, err)
+
+def prove_many(pairs: Iterable[tuple[str|LogicType, Argument|str]], /, *,
+    workers: int|None = None, timeout: int|None = None,
+    max_steps: int|None = None, models: bool = False, ordered: bool = False,
+    **opts) -> Iterator[ProofResult]:
+    """Build proofs for (logic, argument) pairs over a process pool, yielding
+    the results as they complete.
+
+    The arguments are sent to the workers as argument strings, and only
+    the :class:`ProofResult` records are sent back. The number of jobs in
+    flight, including results held back for the `ordered` option, is
+    bounded, so `pairs` may be a long-running generator. A pair whose logic
+    or argument is invalid, or whose worker is lost, gets an ``'Error'``
+    result, and the other jobs continue.
+
+    Args:
+        pairs: An iterable of (logic, argument) pairs. The logic can be
+            anything accepted by the registry, and the argument can be an
+            :class:`Argument` or an argument string.
+
+    Keyword Args:
+        workers (int): The number of worker processes. ``None`` uses the
+            CPU count. ``0`` builds the proofs serially in this process.
+        timeout (int): The `build_timeout` option for each proof, in ms.
+        max_steps (int): The `max_steps` option for each proof.
+        models (bool): Whether to build models and include their data in
+            the results. Default ``False``.
+        ordered (bool): Whether to yield the results in the input order.
+            Default ``False``.
+        **opts: Other tableau options.
+
+    Returns:
+        Iterator[ProofResult]: The results.
+    """
+    opts = dict(opts,
+        build_timeout = timeout,
+        max_steps = max_steps,
+        is_build_models = models)
+    jobs = _jobs(pairs, opts, models)
+    if workers == 0:
+        for job in jobs:
+            yield prove(job) if isinstance(job, ProofJob) else job
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    limit = 2 * workers
+    order = deque()
+    done: dict[int, ProofResult] = {}
+    with ProcessPoolExecutor(workers) as pool:
+        pending: dict[Future, ProofJob] = {}
+        def release():
+            if not ordered:
+                yield from done.values()
+                done.clear()
+                return
+            while order and order[0] in done:
+                yield done.pop(order.popleft())
+        def collect():
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = pending.pop(future)
+                try:
+                    res = future.result()
+                except BrokenExecutor as err:
+                    res = ProofResult.failed(job.index, job.logic, job.argstr, job.title, err)
+                done[res.index] = res
+            yield from release()
+        for job in jobs:
+            # Results held back behind a slow job count against the limit.
+            while len(pending) + len(done) >= limit:
+                yield from collect()
+            if ordered:
+                order.append(job.index)
+            if isinstance(job, ProofJob):
+                try:
+                    pending[pool.submit(prove, job)] = job
+                    continue
+                except BrokenExecutor as err:
+                    job = ProofResult.failed(job.index, job.logic, job.argstr, job.title, err)
+            done[job.index] = job
+            yield from release()
+        while pending:
+            yield from collect()
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.proof.cache
+^^^^^^^^^^^^^^^^^^^^^^
+
+Cache of finished proofs.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Protocol
+
+from ..errors import Emsg, check
+from ..lang import Argument
+from ..logics import registry
+from .tableaux import Rule, Tableau
+
+__all__ = (
+    'ProofCache',
+    'ProofCodec')
+
+class ProofCodec(Protocol):
+    "Serialization interface for the on-disk tier of :class:`ProofCache`."
+
+    def dumps(self, tableau: Tableau, /) -> bytes: ...
+    def loads(self, data: bytes, /) -> Tableau: ...
+
+class ProofCache:
+    """Finished proofs keyed by logic, argument and its title, and the options
+    that affect the result. Holds at most `maxsize` tableaux in memory, evicting the
+    least recently used. If a `path` and `codec` are given, proofs are also
+    stored in an SQLite database, which is consulted on a memory miss, so a
+    restarted process keeps a warm cache.
+
+    The cache is thread safe.
+    """
+
+    ignore_opts = frozenset(('build_timeout', 'is_agenda'))
+    "Options that do not affect a finished proof, and are left out of the key."
+
+    maxsize: int
+    "The maximum number of tableaux to keep in memory."
+
+    hits: int
+    "The number of lookups found in memory or on disk."
+
+    misses: int
+    "The number of lookups not found."
+
+    __slots__ = ('_codec', '_conn', '_data', '_lock', 'hits', 'maxsize', 'misses', 'path')
+
+    def __init__(self, maxsize: int = 128, /, *, path: str|None = None,
+        codec: ProofCodec|None = None):
+        """
+        Args:
+            maxsize (int): The maximum number of tableaux to keep in memory.
+
+        Keyword Args:
+            path (str): The SQLite database path for the on-disk tier.
+            codec (ProofCodec): The serializer for the on-disk tier.
+        """
+        self.maxsize = check.inst(maxsize, int)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, Tableau] = OrderedDict()
+        self._lock = threading.Lock()
+        self._codec = codec
+        self._conn = None
+        if path is not None:
+            if codec is None:
+                raise Emsg.MissingValue('codec')
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS proofs '
+                    '(key TEXT PRIMARY KEY, data BLOB NOT NULL)')
+
+    @classmethod
+    def key(cls, logic: Any, argument: Argument, opts: Mapping[str, Any], /) -> str:
+        """Compute the cache key.
+
+        Args:
+            logic: The logic name or module.
+            argument (Argument): The argument.
+            opts (Mapping): The tableau options.
+
+        Returns:
+            str: The key.
+        """
+        opts = Tableau.defaults | Rule.defaults | opts
+        spec = repr((
+            registry(logic).Meta.name,
+            argument.argstr(),
+            argument.title,
+            sorted((k, v) for k, v in opts.items() if k not in cls.ignore_opts)))
+        return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+    def get(self, logic: Any, argument: Argument, opts: Mapping[str, Any], /) -> Tableau|None:
+        """Get the cached tableau, if any.
+
+        Args:
+            logic: The logic name or module.
+            argument (Argument): The argument.
+            opts (Mapping): The tableau options.
+
+        Returns:
+            The tableau or ``None``.
+        """
+        key = self.key(logic, argument, opts)
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                return self._data[key]
+            tab = self._load(key)
+            if tab is None:
+                self.misses += 1
+                return
+            self.hits += 1
+            self._store(key, tab)
+            return tab
+
+    def put(self, tableau: Tableau, /) -> bool:
+        """Add a finished tableau to the cache. Tableaux that are not finished,
+        or that exceeded the `build_timeout` are not added. The lazy ``tree``
+        is built before adding, so a cached tableau is not modified by the
+        readers it is shared with.
+
+        Args:
+            tableau (Tableau): The tableau.
+
+        Returns:
+            bool: Whether the tableau was added.
+        """
+        if not tableau.finished or tableau.flag.TIMED_OUT in tableau.flag:
+            return False
+        tableau.tree
+        key = self.key(tableau.logic, tableau.argument, tableau.opts)
+        with self._lock:
+            self._store(key, tableau)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO proofs (key, data) VALUES (?, ?)',
+                        (key, self._codec.dumps(tableau)))
+        return True
+
+    def build(self, logic: Any, argument: Argument, opts: Mapping[str, Any], /, *,
+        hook: Callable[[Tableau], Any]|None = None) -> Tableau:
+        """Get the cached tableau, or build and cache a new one.
+
+        Args:
+            logic: The logic name or module.
+            argument (Argument): The argument.
+            opts (Mapping): The tableau options.
+
+        Keyword Args:
+            hook: Optional function called with the new tableau instead of
+                ``Tableau.build()``.
+
+        Returns:
+            Tableau: The tableau.
+        """
+        tab = self.get(logic, argument, opts)
+        if tab is None:
+            tab = Tableau(logic, argument, **opts)
+            if hook is None:
+                tab.build()
+            else:
+                hook(tab)
+            self.put(tab)
+        return tab
+
+    def clear(self) -> None:
+        "Clear the memory tier, and the disk tier if any."
+        with self._lock:
+            self._data.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('DELETE FROM proofs')
+
+    def close(self) -> None:
+        "Close the database connection, if any."
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _store(self, key: str, tableau: Tableau, /):
+        data = self._data
+        data[key] = tableau
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def _load(self, key: str, /) -> Tableau|None:
+        if self._conn is None:
+            return
+        row = self._conn.execute(
+            'SELECT data FROM proofs WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            return self._codec.loads(row[0])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} size:{len(self)}/{self.maxsize} '
+            f'hits:{self.hits} misses:{self.misses}>')
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from collections.abc import Mapping, Set
+from itertools import chain
 from types import MappingProxyType as MapProxy
 from typing import (TYPE_CHECKING, Any, Iterable, Iterator, Literal, Optional,
                     Self, SupportsIndex)
@@ -239,10 +240,9 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
     _model: BaseModel
     _nextconst: Constant
     _nextworld: int
-    _nodes: qset[Node]
     _origin: Branch
     _parent: Branch|None
-    _ticked: set[Node]
+    _seg: Branch.Segment
     _worlds: set[int]
 
     __slots__ = (
@@ -251,10 +251,9 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         '_model',
         '_nextconst',
         '_nextworld',
-        '_nodes',
         '_origin',
         '_parent',
-        '_ticked',
+        '_seg',
         '_worlds',
         'constants',
         'worlds')
@@ -267,18 +266,20 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         (Node.Key.world1,),
         (Node.Key.world2,))
 
+    FLATTEN_DEPTH = 32
+    "The segment chain depth at which :meth:`copy` flattens the shared prefix."
+
     def __init__(self, parent:Branch|None=None, /):
         """Create a branch.
         
         Args:
             parent (Optional[Branch]): The parent branch, if any.
         """
-        EventEmitter.__init__(self, *Branch.Events)
+        EventEmitter.__init__(self, *Branch.Events, counting=False)
         self.parent = parent
         # Make sure properties are copied if needed in copy()
-        self._nodes = qset()
-        self._ticked = set()
-        self._index = self.Index(self.INDEX_KEYS)
+        self._seg = self.Segment(self.INDEX_KEYS)
+        self._index = self._seg.index
         self._worlds = set()
         self._constants = set()
         self._nextworld = 0
@@ -288,6 +289,11 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
 
     def copy(self, *, parent:Branch|None=None, listeners=False) -> Self:
         """Copy of the branch.
+
+        The nodes, ticks, and index are not copied, but shared with the new
+        branch through a chain of frozen segments. Both branches continue
+        on a new empty segment, so the copy is constant time, until the
+        chain reaches :attr:`FLATTEN_DEPTH`.
         
         Args:
             parent (Optional[Branch]): The branch to set as the new branch's parent.
@@ -297,13 +303,20 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         Returns:
             Branch: The new branch.
         """
+        seg = self._seg
+        if seg.nodes or seg.ticked:
+            if seg.depth >= self.FLATTEN_DEPTH:
+                seg = seg.flatten()
+            self._seg = self.Segment(self.INDEX_KEYS, seg)
+            self._index = self._seg.index
+        else:
+            seg = seg.prev
         cls = type(self)
         b = cls.__new__(cls)
         b.parent = parent
         b.events = self.events.copy(listeners=listeners)
-        b._nodes = self._nodes.copy()
-        b._ticked = self._ticked.copy()
-        b._index = self._index.copy()
+        b._seg = self.Segment(self.INDEX_KEYS, seg)
+        b._index = b._seg.index
         b._worlds = self._worlds.copy()
         b._constants = self._constants.copy()
         b._nextworld = self._nextworld
@@ -377,6 +390,23 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
             if node.meets(mapping):
                 yield node
 
+    def find_literal(self, s: Sentence, designated: bool|None = None,
+            world: int|None = None, /) -> Node|None:
+        """Find a sentence node with exactly the given sentence, designation,
+        and world. Unlike :meth:`find`, a missing designation or world only
+        matches a node that also lacks it. This is a hash lookup in each
+        segment, which makes it suitable for closure checks.
+
+        Args:
+            s (Sentence): The sentence.
+            designated (Optional[bool]): The designation, if any.
+            world (Optional[int]): The world, if any.
+
+        Returns:
+            Optional[Node]: The node, or ``None`` if not found.
+        """
+        return self._index.literal((s, designated, world))
+
     def append(self, node: Node|Mapping, /) -> Self:
         """Append a node.
 
@@ -393,8 +423,11 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
             raise Emsg.IllegalState('Already closed')
         if not isinstance(node, Node):
             node = Node.for_mapping(node)
-        
-        self._nodes.append(node)
+        if node in self:
+            raise Emsg.DuplicateValue(node)
+        seg = self._seg
+        seg.nodes.append(node)
+        seg.nodeset.add(node)
 
         if isinstance(node, SentenceNode):
             s: Sentence = node[Node.Key.sentence]
@@ -412,7 +445,7 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
                 self._worlds.update(worlds)
 
         # Add to index *before* after_node_add event
-        self._index.add(node)
+        seg.index.add(node)
         self.emit(Branch.Events.AFTER_ADD, node, self)
         if isinstance(node, ClosureNode):
             self.emit(Branch.Events.AFTER_CLOSE, self)
@@ -443,7 +476,7 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
             Branch: self
         """
         if not self.is_ticked(node):
-            self._ticked.add(node)
+            self._seg.ticked.add(node)
             node.ticked = True
             self.emit(Branch.Events.AFTER_TICK, node, self)
         return self
@@ -466,7 +499,18 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         Returns
             bool: Whether the node is ticked.
         """
-        return node in self._ticked
+        try:
+            if not node.ticked:
+                return False
+        except AttributeError:
+            # Never ticked on any branch.
+            return False
+        seg = self._seg
+        while seg is not None:
+            if node in seg.ticked:
+                return True
+            seg = seg.prev
+        return False
 
     def new_constant(self) -> Constant:
         """Return a new constant that does not appear on the branch.
@@ -484,11 +528,44 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         """
         return self._nextworld
 
+    def index(self, node, start = 0, stop = None, /) -> int:
+        'Get the index of the node in the sequence.'
+        if start == 0 and stop is None:
+            seg = self._seg
+            while seg is not None:
+                if node in seg.nodeset:
+                    return seg.offset + seg.nodes.index(node)
+                seg = seg.prev
+            raise Emsg.MissingValue(node)
+        return super().index(node, start, stop)
+
     def __getitem__(self, i: SupportsIndex|slice):
-        return self._nodes[i]
+        if isinstance(i, SupportsIndex):
+            seg = self._seg
+            size = seg.offset + len(seg.nodes)
+            i = i.__index__()
+            if i < 0:
+                i += size
+            if not 0 <= i < size:
+                raise IndexError('branch index out of range')
+            while i < seg.offset:
+                seg = seg.prev
+            return seg.nodes[i - seg.offset]
+        if isinstance(i, slice):
+            return qset(list(self)[i])
+        raise Emsg.InstCheck(i, (slice, SupportsIndex))
 
     def __len__(self):
-        return len(self._nodes)
+        seg = self._seg
+        return seg.offset + len(seg.nodes)
+
+    def __iter__(self) -> Iterator[Node]:
+        for seg in reversed(tuple(self._seg.chain())):
+            yield from seg.nodes
+
+    def __reversed__(self) -> Iterator[Node]:
+        for seg in self._seg.chain():
+            yield from reversed(seg.nodes)
 
     def __bool__(self):
         return True
@@ -500,7 +577,12 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         return id(self)
 
     def __contains__(self, node):
-        return node in self._nodes
+        seg = self._seg
+        while seg is not None:
+            if node in seg.nodeset:
+                return True
+            seg = seg.prev
+        return False
 
     def __iadd__(self, other: Mapping|Iterable[Mapping]) -> Self:
         if isinstance(other, Mapping):
@@ -519,12 +601,20 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
         return self
 
     class Index(dict[tuple[str, ...], dict[tuple[Any, ...], set[Node]]], abcs.Copyable):
-        "Branch node index."
+        """Branch node index. An index may be chained to the index of a frozen
+        previous segment, in which case lookups consult the whole chain.
+        """
+
+        prev: Branch.Index|None
+        literals: dict[tuple[Sentence, bool|None, int|None], Node]
+        "Sentence nodes keyed by (sentence, designation, world)."
 
-        __slots__ = EMPTY_SET
+        __slots__ = ('prev', 'literals')
 
-        def __init__(self, indexes: Iterable[tuple[str, ...]]):
+        def __init__(self, indexes: Iterable[tuple[str, ...]], prev: Branch.Index|None = None):
             self.update((key, defaultdict(set)) for key in indexes)
+            self.prev = prev
+            self.literals = {}
 
         def add(self, node: Node, /):
             for key in self:
@@ -533,28 +623,110 @@ class Branch(SequenceSet[Node], EventEmitter, abcs.Copyable, metaclass=BranchMet
                 except KeyError:
                     continue
                 self[key][value].add(node)
+            if isinstance(node, SentenceNode):
+                self.literals.setdefault((
+                    node[Node.Key.sentence],
+                    node[Node.Key.designation],
+                    node[Node.Key.world]), node)
+
+        def literal(self, key: tuple[Sentence, bool|None, int|None], /) -> Node|None:
+            "Look up a sentence node by (sentence, designation, world)."
+            for index in self.chain():
+                if (node := index.literals.get(key)) is not None:
+                    return node
+
+        def chain(self) -> Iterator[Branch.Index]:
+            "Yield this index and each previous index."
+            index = self
+            while index is not None:
+                yield index
+                index = index.prev
 
         def copy(self):
+            "Flattened copy of the index chain."
             inst = type(self)(self)
-            for key, index in self.items():
-                for value, base in index.items():
-                    inst[key][value].update(base)
+            for index in self.chain():
+                for key, base in index.items():
+                    for value, nodes in base.items():
+                        inst[key][value].update(nodes)
+                for key, node in index.literals.items():
+                    inst.literals.setdefault(key, node)
             return inst
 
-        def select(self, mapping: Mapping, default: Set[Node], /) -> set[Node]:
+        def select(self, mapping: Mapping, default: Iterable[Node], /) -> Iterable[Node]:
             bestsize = max(map(len, (self, mapping)))
             best = default
+            bestlen = len(default)
             for key in self:
-                if len(best) <= bestsize:
+                if bestlen <= bestsize:
                     break
                 try:
                     value = tuple(map(mapping.__getitem__, key))
                 except KeyError:
                     continue
-                base = self[key].get(value, EMPTY_SET)
-                if len(base) < len(best):
-                    best = base
-            return best
+                bases = [base for index in self.chain()
+                    if (base := index[key].get(value))]
+                size = sum(map(len, bases))
+                if size < bestlen:
+                    best = bases
+                    bestlen = size
+            if best is default:
+                return default
+            if len(best) == 1:
+                return best[0]
+            if not best:
+                return EMPTY_SET
+            return chain.from_iterable(best)
+
+    class Segment:
+        """A run of nodes added to a branch between copies. Once a branch is
+        copied, its current segment is frozen and shared by both branches.
+        """
+
+        prev: Branch.Segment|None
+        "The previous (frozen) segment, if any."
+        offset: int
+        "The total number of nodes in the previous segments."
+        depth: int
+        "The number of previous segments."
+        nodes: list[Node]
+        nodeset: set[Node]
+        ticked: set[Node]
+        index: Branch.Index
+
+        __slots__ = ('prev', 'offset', 'depth', 'nodes', 'nodeset', 'ticked', 'index')
+
+        def __init__(self, indexes: Iterable[tuple[str, ...]], prev: Branch.Segment|None = None):
+            self.prev = prev
+            self.nodes = []
+            self.nodeset = set()
+            self.ticked = set()
+            if prev is None:
+                self.offset = self.depth = 0
+                self.index = Branch.Index(indexes)
+            else:
+                self.offset = prev.offset + len(prev.nodes)
+                self.depth = prev.depth + 1
+                self.index = Branch.Index(indexes, prev.index)
+
+        def chain(self) -> Iterator[Branch.Segment]:
+            "Yield this segment and each previous segment."
+            seg = self
+            while seg is not None:
+                yield seg
+                seg = seg.prev
+
+        def flatten(self) -> Branch.Segment:
+            "Merge the segment chain into a new single segment."
+            segs = tuple(self.chain())
+            inst = object.__new__(type(self))
+            inst.prev = None
+            inst.offset = inst.depth = 0
+            inst.nodes = [node for seg in reversed(segs) for node in seg.nodes]
+            inst.nodeset = set(inst.nodes)
+            inst.ticked = set().union(*(seg.ticked for seg in segs))
+            inst.index = self.index.copy()
+            return inst
 
 class Target(dictattr):
     """Rule application target.
@@ -37,7 +37,8 @@ __all__ = (
     'NodeDesignation',
     'CompareNode',
     'CompareSentence',
-    'NodeSentence')
+    'NodeSentence',
+    'signature')
 
 def getattr_safe(obj: Any, name: str) -> Any:
     return getattr(obj, name, None)
@@ -51,6 +52,17 @@ def getkey_safe(obj: Any, key: Any) -> Any:
     except KeyError:
         return None
 
+def signature(node: Node, /) -> tuple:
+    """The features of the node that the signed node filters compare: the node
+    type, the designation, and the :attr:`Sentence.signature` of the sentence,
+    if any.
+    """
+    s = node.get(Node.Key.sentence)
+    return (
+        type(node),
+        node.get(Node.Key.designated),
+        None if s is None else s.signature)
+
 class ComparerMeta(abcs.AbcMeta):
     @classmethod
     def __prepare__(cls, clsname, bases, **kw):
@@ -250,6 +262,10 @@ class CompareSentence(Comparer):
 class CompareNode(Comparer):
     "Node filter mixin class."
 
+    signed: bool = False
+    """Whether the filter compares only the features of the node's
+    :func:`signature`."""
+
     @abstractmethod
     def example_node(self) -> dict:
         raise NotImplementedError
@@ -257,6 +273,8 @@ class CompareNode(Comparer):
 class NodeSentence(CompareSentence, CompareNode):
     "Sentence node filter."
 
+    signed = True
+
     @staticmethod
     def rget(node: Node, /):
         return node.get(Node.Key.sentence)
@@ -272,6 +290,7 @@ class NodeDesignation(CompareAttr, CompareNode):
     "Designation node filter."
 
     attrmap = MapProxy(dict(designation = Node.Key.designated))
+    signed = True
 
     @staticmethod
     def rget(node: Node, key: str, /):
@@ -285,6 +304,7 @@ class NodeType(CompareType, CompareNode):
 
     attr = 'NodeType'
     basetype = Node
+    signed = True
 
     def example_node(self):
         obj = dictns()
@@ -26,6 +26,7 @@ from collections.abc import Set
 from copy import copy
 from functools import partial
 from itertools import filterfalse
+from time import perf_counter
 from types import MappingProxyType as MapProxy
 from typing import (TYPE_CHECKING, Any, Callable, Iterator, Mapping,
                     NamedTuple, Sequence, TypeVar)
@@ -362,12 +363,16 @@ class FilterNodeCache(BranchCache[set[Node]]):
         def after_node_add(node: Node, branch: Branch):
             if self(node, branch):
                 self[branch].add(node)
-        self.tableau.on(Tableau.Events.AFTER_NODE_ADD, after_node_add)
+        self.listen_node_add(after_node_add)
         if self.config.ignore_ticked:
             def after_node_tick(node: Node, branch: Branch):
                 self[branch].discard(node)
             self.tableau.on(Tableau.Events.AFTER_NODE_TICK, after_node_tick)
 
+    def listen_node_add(self, callback: Callable[[Node, Branch], Any], /):
+        'Attach the ``AFTER_NODE_ADD`` callback.'
+        self.tableau.on(Tableau.Events.AFTER_NODE_ADD, callback)
+
     @classmethod
     def configure_rule(cls, rulecls, config):
         ":class:`Rule.Helper` init hook. Verify `ignore_ticked` attribute."
@@ -379,13 +384,17 @@ class FilterNodeCache(BranchCache[set[Node]]):
     def node_targets(cls, wrapped: Callable[[_RT, Node, Branch], Any], /):
         """
         Method decorator to only iterate through nodes matching the
-        configured `FilterNodeCache` filters.
+        configured `FilterNodeCache` filters. The tableau deadline is checked
+        before each node.
         """
         @wraps(wrapped)
         def wrapper(rule: _RT, branch: Branch, /):
             helper = rule[cls]
             helper.gc()
+            deadline = rule.tableau.deadline
             for node in helper[branch]:
+                if deadline is not None and perf_counter() > deadline:
+                    rule.tableau.check_deadline()
                 for target in wrapped(rule, node, branch):
                     if isinstance(target, Target):
                         target.update(rule=rule, branch=branch, node=node)
@@ -432,6 +441,17 @@ class FilterHelper(FilterNodeCache):
             super().__call__(node, branch) and
             self.config.pred(node))
 
+    def listen_node_add(self, callback: Callable[[Node, Branch], Any], /):
+        """Attach the ``AFTER_NODE_ADD`` callback through the node dispatch of
+        the tableau rules, so it is only called for nodes that can pass the
+        filters. If a filter is not signed, or the rules are already locked,
+        the callback is attached to the tableau."""
+        dispatch = self.tableau.rules.dispatch
+        if dispatch.locked or not isinstance(self.config.pred, self.SignedPred):
+            super().listen_node_add(callback)
+        else:
+            dispatch.add(self.config.pred, callback)
+
     def example_node(self) -> Node:
         """Construct an example node based on the filter conditions.
         
@@ -494,12 +514,16 @@ class FilterHelper(FilterNodeCache):
             filter_class for filter_class, config in configs.items()
                 if config is not NotImplemented)
         funcs = cls.PredTuple(filter_class(rulecls) for filter_class in filter_classes)
-        return cls.Config(MapProxy(dict(zip(filter_classes, funcs))), funcs, *base_config)
+        if all(filter_class.signed for filter_class in filter_classes):
+            pred = cls.SignedPred(funcs)
+        else:
+            pred = funcs
+        return cls.Config(MapProxy(dict(zip(filter_classes, funcs))), pred, *base_config)
 
     class Config(NamedTuple):
         filters: TypeInstMap[filters.CompareNode]
         "Mapping from ``NodeCompare`` class to instance."
-        pred: FilterHelper.PredTuple
+        pred: FilterHelper.PredTuple|FilterHelper.SignedPred
         "A single predicate of all filters."
         ignore_ticked: bool
         """Whether to ignore and discard nodes after they are ticked."""
@@ -512,6 +536,25 @@ class FilterHelper(FilterNodeCache):
         def __call__(self, node: Node, /) -> bool:
             return all(func(node) for func in self)
 
+    class SignedPred(dict[tuple, bool], Callable[[Node], bool]):
+        """Callable predicate of signed filters. The result is computed once
+        for each node :func:`filters.signature`, and then looked up."""
+
+        __slots__ = ('funcs',)
+
+        funcs: FilterHelper.PredTuple
+        "The filter predicates."
+
+        def __init__(self, funcs: FilterHelper.PredTuple, /):
+            self.funcs = funcs
+
+        def __call__(self, node: Node, /) -> bool:
+            key = filters.signature(node)
+            try:
+                return self[key]
+            except KeyError:
+                return self.setdefault(key, self.funcs(node))
+
 
 class NodeConsts(BranchDictCache[Node, set[Constant]]):
     """Track the unapplied constants per branch for each potential node.
@@ -597,7 +640,7 @@ class MaxConsts(Rule.HelperDict[Branch, int]):
 
     def __init__(self, rule, /):
         super().__init__(rule)
-        self.wconsts = WorldConsts(self.rule)
+        self.wconsts = self.tableau.rules.share(WorldConsts, rule)
 
     def listen_on(self):
         super().listen_on()
@@ -641,12 +684,14 @@ class MaxConsts(Rule.HelperDict[Branch, int]):
             world = 0
         return len(self.wconsts[branch][world]) > self.get(branch.origin, 1)
 
-    def quit_flag(self, branch: Branch, /) -> QuitFlagNode:
+    def quit_flag(self, branch: Branch, /, rule: Rule|None = None) -> QuitFlagNode:
         """
         Generate a quit flag node for the branch.
 
         Args:
             branch (Branch): The branch
+            rule (Rule): The rule quitting. Defaults to the helper's rule,
+                which, since the helper is shared, is the first rule to use it.
 
         Returns:
             QuitFlagNode: A QuitFlagNode with the following keys:
@@ -656,8 +701,9 @@ class MaxConsts(Rule.HelperDict[Branch, int]):
                     ``rule.name``, and ``n`` is the computed max allowed
                     constants for the branch.
         """
+        rule = rule or self.rule
         return QuitFlagNode(Node.PropMap.QuitFlag | {Node.Key.info: (
-            f'{self.rule.name}:{type(self).__name__}'
+            f'{rule.name}:{type(self).__name__}'
             f'({self.get(branch.origin, 1)})')})
 
     def _compute(self, branch: Branch, /) -> int:
@@ -738,12 +784,14 @@ class MaxWorlds(Rule.HelperDict[Branch, int]):
         origin = branch.origin
         return origin in self and len(branch.worlds) > self[origin]
 
-    def quit_flag(self, branch: Branch, /) -> QuitFlagNode:
+    def quit_flag(self, branch: Branch, /, rule: Rule|None = None) -> QuitFlagNode:
         """
         Generate a quit flag node for the branch.
 
         Args:
             branch (Branch): The branch
+            rule (Rule): The rule quitting. Defaults to the helper's rule,
+                which, since the helper is shared, is the first rule to use it.
 
         Returns:
             QuitFlagNode: A QuitFlagNode with the following keys:
@@ -753,8 +801,9 @@ class MaxWorlds(Rule.HelperDict[Branch, int]):
                     ``rule.name``, and ``n`` is the computed max allowed
                     worlds for the branch.
         """
+        rule = rule or self.rule
         return QuitFlagNode(Node.PropMap.QuitFlag | {Node.Key.info: (
-            f'{self.rule.name}:{type(self).__name__}({self.get(branch.origin)})')})
+            f'{rule.name}:{type(self).__name__}({self.get(branch.origin)})')})
 
     def _compute(self, branch: Branch, /) -> int:
         """Project the maximum number of worlds for a branch (origin) as
@@ -216,7 +216,7 @@ class NarrowQuantifierRule(GetNodeTargetsRule[SentenceNode], QuantifiedSentenceR
         if self[MaxConsts].is_exceeded(branch, node.get(Node.Key.world)):
             self[FilterHelper].release(node, branch)
             if not self[QuitFlag].get(branch):
-                fnode = self[MaxConsts].quit_flag(branch)
+                fnode = self[MaxConsts].quit_flag(branch, self)
                 yield Target(adds(group(fnode),
                     flag=fnode[Node.Key.flag],
                     branch=branch,
@@ -409,7 +409,7 @@ class ModalOperatorRule(OperatorNodeRule, intermediate=True):
         if self[MaxWorlds].is_exceeded(branch):
             self[FilterHelper].release(node, branch)
             if not self[QuitFlag].get(branch):
-                fnode = self[MaxWorlds].quit_flag(branch)
+                fnode = self[MaxWorlds].quit_flag(branch, self)
                 return adds(group(fnode), flag=fnode[Node.Key.flag])
             return True
         return False
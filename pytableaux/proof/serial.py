@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.proof.serial
+^^^^^^^^^^^^^^^^^^^^^^^
+
+Compact serialization of finished tableaux.
+
+The format is a zlib-compressed JSON array. Sentences are interned in a
+table of argument strings, and nodes are flat lists that reference the
+sentence and key tables. Branches are stored as a parent index, the length
+of the prefix shared with the parent, and the new nodes. History entries
+are stored as rule and target indexes.
+
+The module can be passed as the `codec` of a :class:`~pytableaux.proof.cache.ProofCache`.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterator, Sequence
+
+from ..errors import Emsg, check
+from ..lang import Argument, Sentence
+from ..logics import LogicType, registry
+from ..tools import EMPTY_SET, SeqCover
+from ..tools.timing import Counter
+from . import Branch, Node, Tableau, Target
+
+__all__ = (
+    'dumps',
+    'loads',
+    'TableauRecord')
+
+MAGIC = b'PTAB'
+VERSION = 1
+
+TREE_FIELDS = (
+    'root',
+    'leaf',
+    'closed',
+    'open',
+    'left',
+    'right',
+    'descendant_node_count',
+    'structure_node_count',
+    'depth',
+    'has_open',
+    'has_closed',
+    'closed_step',
+    'step',
+    'width',
+    'balanced_line_width',
+    'balanced_line_margin',
+    'is_only_branch',
+    'branch_step')
+
+class TableauRecord:
+    """A finished tableau reloaded by :func:`loads`. The branches, nodes,
+    history, :attr:`tree`, and :attr:`stats` are restored, but not the rules,
+    so the record can be written and inspected, but not built further.
+
+    If the original tableau had models, they are rebuilt from the open
+    branches.
+    """
+
+    logic: LogicType
+    "The logic."
+
+    argument: Argument
+    "The argument."
+
+    opts: dict
+    "The build options of the original tableau."
+
+    flag: Tableau.Flag
+    "The :class:`Tableau.Flag` value of the original tableau."
+
+    history: Sequence[Tableau.StepEntry]
+    """The history. The rule of each entry is the rule class, and the target
+    has only the branch, node, and nodes values."""
+
+    open: Sequence[Branch]
+    "The open branches."
+
+    tree: Tableau.Tree|None
+    "The tree structure, if it was built."
+
+    stats: dict
+    "The stats of the original tableau."
+
+    models: frozenset
+    "The models."
+
+    __slots__ = (
+        '_branches',
+        'argument',
+        'flag',
+        'history',
+        'logic',
+        'models',
+        'open',
+        'opts',
+        'stats',
+        'tree')
+
+    finished = Tableau.finished
+    completed = Tableau.completed
+    premature = Tableau.premature
+    valid = Tableau.valid
+    invalid = Tableau.invalid
+
+    @property
+    def id(self) -> int:
+        "The unique object ID of the record."
+        return id(self)
+
+    def __len__(self):
+        return len(self._branches)
+
+    def __getitem__(self, index):
+        return self._branches[index]
+
+    def __iter__(self) -> Iterator[Branch]:
+        return iter(self._branches)
+
+    def __repr__(self):
+        info = dict(
+            logic = self.logic.Meta.name,
+            len = len(self),
+            result = self.stats.get('result'))
+        return f'<{type(self).__name__} ' + ' '.join(
+            f'{k}:{v}' for k, v in info.items()) + '>'
+
+def dumps(tableau: Tableau, /) -> bytes:
+    """Serialize a finished tableau.
+
+    Args:
+        tableau (Tableau): The tableau.
+
+    Returns:
+        bytes: The data.
+
+    Raises:
+        IllegalStateError: if the tableau is not finished.
+    """
+    if not tableau.finished:
+        raise Emsg.IllegalState('Tableau not finished')
+    sentences: dict[Sentence, int] = {}
+    keys: dict[str, int] = {}
+    nodes: dict[Node, int] = {}
+    rules: dict[str, int] = {}
+    branches = {branch: i for i, branch in enumerate(tableau)}
+    lw = Argument._argstr_lw
+
+    def value(value):
+        if isinstance(value, Sentence):
+            if value not in sentences:
+                sentences[value] = len(sentences)
+            return [sentences[value]]
+        return value
+
+    def node(node: Node):
+        if node not in nodes:
+            nodes[node] = len(nodes)
+            item = [getattr(node, 'step', None)]
+            for key in node:
+                if key not in keys:
+                    keys[key] = len(keys)
+                item.append(keys[key])
+                item.append(value(node[key]))
+            nodelist.append(item)
+        return nodes[node]
+
+    nodelist = []
+    branchlist = []
+    for branch in tableau:
+        parent = branch.parent
+        fork = 0
+        if parent is None:
+            pindex = None
+        else:
+            pindex = branches[parent]
+            for a, b in zip(branch, parent):
+                if a is not b:
+                    break
+                fork += 1
+        branchlist.append([
+            pindex,
+            fork,
+            [node(n) for n in branch[fork:]],
+            [nodes[n] for n in branch if branch.is_ticked(n)]])
+    history = []
+    for step in tableau.history:
+        rule, target = step.rule, step.target
+        if rule.name not in rules:
+            rules[rule.name] = len(rules)
+        history.append([
+            rules[rule.name],
+            branches[target.branch],
+            nodes[target['node']] if 'node' in target else None,
+            [nodes[n] for n in target['nodes']] if 'nodes' in target else None,
+            step.duration.value])
+
+    branch_ids = {branch.id: i for branch, i in branches.items()}
+    argument = tableau.argument
+    data = [
+        VERSION,
+        tableau.logic.Meta.name,
+        argument.argstr(),
+        argument.title,
+        {k: v for k, v in tableau.opts.items() if _jsonable(v)},
+        tableau.flag.value,
+        tableau.stats,
+        branchlist,
+        history,
+        None if tableau.tree is None else _dump_tree(tableau.tree, nodes, branch_ids),
+        bool(tableau.models),
+        nodelist,
+        list(keys),
+        list(rules),
+        list(map(lw, sentences))]
+    return MAGIC + zlib.compress(
+        json.dumps(data, separators=(',', ':')).encode('utf-8'), 9)
+
+def loads(data: bytes, /) -> TableauRecord:
+    """Load a tableau serialized with :func:`dumps`.
+
+    Args:
+        data (bytes): The data.
+
+    Returns:
+        TableauRecord: The tableau record.
+
+    Raises:
+        ValueError: if the data is not in the serial format.
+    """
+    check.inst(data, bytes)
+    if not data.startswith(MAGIC):
+        raise ValueError('Not a serialized tableau')
+    (version, logic, argstr, title, opts, flag, stats, branchlist, history,
+        tree, has_models, nodelist, keys, rules, sentences
+    ) = json.loads(zlib.decompress(data[len(MAGIC):]).decode('utf-8'))
+    if version != VERSION:
+        raise ValueError(f'Unsupported version: {version}')
+    parser = Argument._argstr_pclass(auto_preds=True)
+    sentences = list(map(parser, sentences))
+    rec = object.__new__(TableauRecord)
+    rec.logic = registry(logic)
+    rec.argument = Argument.from_argstr(argstr, title=title)
+    rec.opts = Tableau.defaults | opts
+    rec.flag = Tableau.Flag(flag)
+    rec.stats = stats
+    nodes = []
+    for step, *props in nodelist:
+        it = iter(props)
+        node = Node.for_mapping({
+            keys[k]: sentences[v[0]] if isinstance(v, list) else v
+            for k, v in zip(it, it)})
+        if step is not None:
+            node.step = step
+        nodes.append(node)
+    rec._branches = branches = []
+    for parent, fork, delta, ticked in branchlist:
+        if parent is None:
+            branch = Branch()
+        else:
+            branch = Branch(branches[parent])
+            branch.extend(branches[parent][:fork])
+        branch.extend(nodes[i] for i in delta)
+        for i in ticked:
+            branch.tick(nodes[i])
+        branches.append(branch)
+    rec.open = SeqCover([branch for branch in branches if not branch.closed])
+    rules = [rec.logic.Rules.get(name) for name in rules]
+    rec.history = SeqCover([
+        Tableau.StepEntry(rules[rule], _target(
+            rules[rule], branches[branch],
+            None if node is None else nodes[node],
+            None if targets is None else set(nodes[i] for i in targets)),
+            Counter(duration))
+        for rule, branch, node, targets, duration in history])
+    if has_models:
+        rec.models = frozenset(_gen_models(rec))
+    else:
+        rec.models = EMPTY_SET
+    if tree is None:
+        rec.tree = None
+    else:
+        rec.tree = _load_tree(tree, nodes, branches)
+    return rec
+
+def _target(rule, branch, node, nodes, /) -> Target:
+    target = Target(rule=rule, branch=branch)
+    if node is not None:
+        target['node'] = node
+    if nodes is not None:
+        target['nodes'] = nodes
+    return target
+
+def _gen_models(rec: TableauRecord, /):
+    Model = rec.logic.Model
+    for branch in rec.open:
+        model = Model()
+        model.read_branch(branch)
+        branch.model = model
+        yield model
+
+def _dump_tree(tree: Tableau.Tree, nodes: dict[Node, int], branch_ids: dict[int, int], /) -> list:
+    item = [getattr(tree, name) for name in TREE_FIELDS]
+    item.append([nodes[node] for node in tree.nodes])
+    item.append(tree.ticksteps)
+    item.append(None if tree.branch_id is None else branch_ids[tree.branch_id])
+    item.append(getattr(tree, 'distinct_nodes', None))
+    item.append([_dump_tree(child, nodes, branch_ids) for child in tree.children])
+    return item
+
+def _load_tree(item: list, nodes: list[Node], branches: list[Branch], /) -> Tableau.Tree:
+    tree = Tableau.Tree()
+    it = iter(item)
+    for name, value in zip(TREE_FIELDS, it):
+        setattr(tree, name, value)
+    tree.nodes = [nodes[i] for i in next(it)]
+    tree.ticksteps = next(it)
+    branch = next(it)
+    if branch is not None:
+        branch = branches[branch]
+        tree.branch_id = branch.id
+        if branch.model is not None:
+            tree.model_id = branch.model.id
+    distinct_nodes = next(it)
+    if distinct_nodes is not None:
+        tree.distinct_nodes = distinct_nodes
+    tree.children = [_load_tree(child, nodes, branches) for child in next(it)]
+    tree.degree = len(tree.children)
+    for i, child in enumerate(tree.children):
+        child.index = i
+    return tree
+
+def _jsonable(value: Any, /) -> bool:
+    return value is None or isinstance(value, (bool, int, float, str))
@@ -22,10 +22,14 @@ pytableaux.proof.tableaux
 from __future__ import annotations
 
 import operator as opr
+import threading
 from abc import abstractmethod
 from collections import deque
 from collections.abc import Set
 from dataclasses import dataclass
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter
 from types import MappingProxyType as MapProxy
 from typing import (TYPE_CHECKING, Any, Callable, Generic, Iterable, Iterator,
                     Mapping, Optional, Self, Sequence, SupportsIndex, TypeVar,
@@ -37,12 +41,13 @@ from ..lang.lex import Sentence
 from ..logics import registry
 from ..tools import (EMPTY_MAP, EMPTY_SET, SeqCover, absindex, for_defaults,
                      qset, qsetf, wraps)
-from ..tools.events import EventEmitter
+from ..tools.events import EventEmitter, Listener
 from ..tools.hybrids import SequenceSet, qset
 from ..tools.linked import linqset
 from ..tools.timing import Counter, StopWatch
 from . import RuleMeta, TableauMeta
 from .common import Branch, Node, Target
+from .filters import signature
 
 if TYPE_CHECKING:
     from typing import overload
@@ -56,6 +61,7 @@ _RT = TypeVar('_RT', bound='Rule')
 _RHT = TypeVar('_RHT', bound=RuleMeta.AbstractHelper)
 
 __all__ = (
+    'NodeDispatch',
     'Rule',
     'RuleGroup',
     'RuleGroups',
@@ -139,7 +145,7 @@ class Rule(EventEmitter, metaclass=RuleMeta):
 
     def __init__(self, tableau: Tableau, /, **opts):
         self.state = Rule.State(0)
-        super().__init__(*Rule.Events)
+        super().__init__(*Rule.Events, counting=False)
         self.tableau = tableau
         self.opts = MapProxy(for_defaults(self.defaults, opts))
         self.timers = {name: StopWatch() for name in self.timer_names}
@@ -148,7 +154,10 @@ class Rule(EventEmitter, metaclass=RuleMeta):
         self.helpers = {}
         # Add one at a time, to support helper dependency checks.
         for Helper in self.Helpers:
-            self.helpers[Helper] = Helper(self)
+            if Helper.shareable:
+                self.helpers[Helper] = tableau.rules.share(Helper, self)
+            else:
+                self.helpers[Helper] = Helper(self)
         if not self.opts['nolock']:
             tableau.once(Tableau.Events.AFTER_BRANCH_ADD, self.lock)
         self.state |= self.state.INIT
@@ -188,23 +197,34 @@ class Rule(EventEmitter, metaclass=RuleMeta):
     def target(self, branch: Branch, /) -> Target|None:
         "Get the rule target if it applies."
         with self.timers['search']:
-            targets = self._get_targets(branch)
-            if targets:
-                if not isinstance(targets, Sequence):
-                    targets = deque(targets)
-                    if not targets:
-                        return
-                self._extend_targets(targets)
-                return self._select_best_target(targets)
+            if self.tableau.profile is not None:
+                return self.tableau.profile.search(self, branch)
+            return self._search(branch)
 
     @final
     def apply(self, target: Target, /) -> None:
         "Apply the rule to a target returned from ``.target()``."
         with self.timers['apply']:
-            self.emit(Rule.Events.BEFORE_APPLY, target)
-            self._apply(target)
-            self.emit(Rule.Events.AFTER_APPLY, target)
-            self.tableau.emit(Tableau.Events.AFTER_RULE_APPLY, target)
+            if self.tableau.profile is not None:
+                self.tableau.profile.apply(self, target)
+            else:
+                self._run(target)
+
+    def _search(self, branch: Branch, /) -> Target|None:
+        targets = self._get_targets(branch)
+        if targets:
+            if not isinstance(targets, Sequence):
+                targets = deque(targets)
+                if not targets:
+                    return
+            self._extend_targets(targets)
+            return self._select_best_target(targets)
+
+    def _run(self, target: Target, /) -> None:
+        self.emit(Rule.Events.BEFORE_APPLY, target)
+        self._apply(target)
+        self.emit(Rule.Events.AFTER_APPLY, target)
+        self.tableau.emit(Tableau.Events.AFTER_RULE_APPLY, target)
 
     def lock(self, *_):
         if self.locked:
@@ -545,13 +565,84 @@ class RuleGroups(Sequence[RuleGroup]):
         return (f'<{type(self).__name__} logic:{logic} groups:{len(self)} '
             f'names:{list(self.names())} rules:{sum(map(len, self))}>')
 
+class NodeDispatch:
+    """Route the tableau's ``AFTER_NODE_ADD`` event to only the callbacks whose
+    predicate can match the node.
+
+    Callbacks are added with a predicate before the rules are locked. The
+    predicate must depend only on the features of the node's
+    :func:`filters.signature`. For each distinct signature, the predicates are
+    evaluated once, on the first node, and the matching callbacks are cached.
+    """
+
+    __slots__ = ('avoided', 'calls', 'entries', 'index', 'locked', 'tableau')
+
+    avoided: int
+    "The number of callbacks not called, since the predicate did not match."
+    calls: int
+    "The number of callbacks called."
+    entries: list[tuple[Callable[[Node], bool], Callable[[Node, Branch], Any]]]
+    "The predicate and callback entries."
+    index: dict[tuple, tuple[Callable[[Node, Branch], Any], ...]]
+    "The matching callbacks for each node signature."
+    locked: bool
+    tableau: Tableau
+
+    def __init__(self, tableau: Tableau, /):
+        self.tableau = tableau
+        self.entries = []
+        self.index = {}
+        self.calls = 0
+        self.avoided = 0
+        self.locked = False
+
+    def add(self, pred: Callable[[Node], bool], callback: Callable[[Node, Branch], Any], /):
+        """Add a callback for the nodes that match the predicate.
+
+        Raises:
+          errors.IllegalStateError: If locked.
+        """
+        if self.locked:
+            raise Emsg.IllegalState('locked')
+        self.entries.append((pred, callback))
+
+    def lock(self):
+        'Lock the entries, and start listening to the tableau, if needed.'
+        if self.locked:
+            raise Emsg.IllegalState('locked')
+        self.locked = True
+        if self.entries:
+            self.tableau.on(Tableau.Events.AFTER_NODE_ADD, self)
+
+    def __call__(self, node: Node, branch: Branch, /):
+        key = signature(node)
+        try:
+            callbacks = self.index[key]
+        except KeyError:
+            callbacks = self.index[key] = tuple(
+                callback for pred, callback in self.entries
+                    if pred(node))
+        self.calls += len(callbacks)
+        self.avoided += len(self.entries) - len(callbacks)
+        for callback in callbacks:
+            callback(node, branch)
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} entries:{len(self.entries)} '
+            f'signatures:{len(self.index)} calls:{self.calls} '
+            f'avoided:{self.avoided}>')
+
 class RulesRoot(Sequence[Rule]):
     'Grouped and named collection of rules for a tableau.'
 
-    __slots__ = ('_map', 'groups', 'locked', 'root', 'tableau')
+    __slots__ = ('_map', 'dispatch', 'groups', 'locked', 'root', 'shared', 'tableau')
  
+    dispatch: NodeDispatch
+    "The node dispatch for the rule helpers."
     groups: RuleGroups
     "The rule groups sequence view."
+    shared: dict[type[Rule.Helper], Rule.Helper]
+    "The shared helper instances mapped by class."
     locked: bool
     root: RulesRoot
     tableau: Tableau
@@ -563,6 +654,8 @@ class RulesRoot(Sequence[Rule]):
         self.root = self
         self.tableau = tableau
         self.groups = RuleGroups(self)
+        self.dispatch = NodeDispatch(tableau)
+        self.shared = {}
         tableau.once(Tableau.Events.AFTER_BRANCH_ADD, self.lock)
 
     def append(self, rulecls: type[Rule], /, name: str|None = None):
@@ -581,11 +674,32 @@ class RulesRoot(Sequence[Rule]):
     get = RuleGroup.get
     names = RuleGroup.names
 
+    def share(self, helpercls: type[_RHT], rule: Rule, /) -> _RHT:
+        """Get the shared instance of a shareable helper class, and create it
+        for the rule if it does not exist. The helper is created once per
+        tableau, so its per-branch bookkeeping is done only once.
+
+        Args:
+          helpercls: The helper class.
+          rule: The rule requesting the helper.
+
+        Returns:
+          The helper instance.
+        """
+        try:
+            return self.shared[helpercls]
+        except KeyError:
+            pass
+        helper = helpercls(rule)
+        self.shared[helpercls] = helper
+        return helper
+
     @locking
     def lock(self, _ = None):
         self.tableau.off(Tableau.Events.AFTER_BRANCH_ADD, self.lock)
         self.groups.lock()
         self._map = MapProxy(self._map)
+        self.dispatch.lock()
         self.locked = True
 
     def __len__(self):
@@ -648,11 +762,6 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
     history: Sequence[Tableau.StepEntry]
     "The history of rule applications."
 
-    tree: Tableau.Tree
-    """A tree structure of the tableau. This is generated after the tableau
-    is finished. If the `build_timeout` was exceeded, the tree is `not`
-    built."""
-
     stats: dict
     "The stats, built after finished."
 
@@ -660,33 +769,57 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
     """The models, built after finished if the tableau is `invalid` and the
     `is_build_models` option is enabled."""
 
+    countermodels: frozenset[BaseModel]
+    """The models verified to be countermodels to the argument, if the
+    `is_verify_models` option is enabled. If the `is_first_countermodel`
+    option is enabled, verification stops after the first countermodel."""
+
     timers: Tableau.Timers
     "The tableau timers."
 
+    profile: Tableau.Profile|None
+    "The rule and helper profile, if the `is_profile` option is enabled."
+
+    deadline: float|None
+    """The :func:`time.perf_counter` time at which the `build_timeout` is
+    exceeded, set at the start of each step. See :meth:`check_deadline()`."""
+
     flag: Tableau.Flag
     "The :class:`Tableau.Flag` value."
 
     defaults = MapProxy(dict(
         auto_build_trunk = True,
         is_group_optim  = True,
+        is_agenda       = True,
         is_build_models = False,
+        is_verify_models = False,
+        is_first_countermodel = False,
+        decide_only     = False,
+        is_profile      = False,
         build_timeout   = None,
         max_steps       = None))
 
     __slots__ = (
+        '_agenda',
         '_argument',
         '_complexities',
+        '_decided',
+        '_distinct_nodes',
         '_logic',
+        '_tree',
+        '_tree_lock',
+        'countermodels',
+        'deadline',
         'flag',
         'history',
         'models',
         'open',
         'opts',
+        'profile',
         'rules',
         'stat',
         'stats',
         'timers',
-        'tree',
         '__contains__',
         '__getitem__',
         '__len__')
@@ -698,11 +831,15 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
             argument: The argument for the tableau.
             **opts: The build options.
         """
-        EventEmitter.__init__(self)
+        EventEmitter.__init__(self, counting=False)
         self.flag = Tableau.Flag.PREMATURE
         self.models = EMPTY_SET
+        self.countermodels = EMPTY_SET
         self.stats = EMPTY_MAP
-        self.tree = None
+        self._tree = None
+        self._tree_lock = threading.Lock()
+        self._distinct_nodes = 0
+        self.deadline = None
         self.__listen_on(
             history := [],
             stat := self.Stat(),
@@ -715,9 +852,18 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
         self.history = SeqCover(history)
         self.opts = self.defaults | opts
         self.timers = Tableau.Timers.create()
+        if self.opts['is_profile']:
+            self.profile = self.Profile(self)
+        else:
+            self.profile = None
         self.rules = RulesRoot(self)
         self.open = SeqCover(opens)
         self._complexities: dict[Node, int] = {}
+        self._decided: Branch|None = None
+        if self.opts['is_agenda']:
+            self._agenda = self.Agenda(self)
+        else:
+            self._agenda = None
         maxsteps = self.opts['max_steps']
         if maxsteps is not None and maxsteps > 0:
             self.flag |= self.flag.HAS_STEP_LIMIT
@@ -823,6 +969,24 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
         if self.completed and self.argument is not None:
             return len(self.open) > 0
 
+    @property
+    def tree(self) -> Tableau.Tree|None:
+        """A tree structure of the tableau. This is built on first access after
+        the tableau is finished. If the `build_timeout` was exceeded, or the
+        `decide_only` option is enabled, the tree is `not` built, and the value
+        is None. In case of `max_steps` excess, however, the tree `is` built.
+        The ``tree_duration_ms`` stat is updated once the tree is built.
+        """
+        if self._tree is None and self.flag.FINISHED in self.flag:
+            if self.flag.TIMED_OUT not in self.flag and not self.opts['decide_only']:
+                with self._tree_lock:
+                    if self._tree is None:
+                        with self.timers.tree:
+                            self._tree = self.Tree.make(self)
+                        if self.stats:
+                            self.stats['tree_duration_ms'] = self.timers.tree.elapsed_ms()
+        return self._tree
+
     @property
     def current_step(self) -> int:
         """The current step number. This is the number of rule applications, plus 1
@@ -842,13 +1006,23 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
         """Choose the next rule step to perform. Returns the StepEntry or ``None``
         if no rule can be applied.
 
-        This iterates over the open branches, then over rule groups.
+        This iterates over the open branches, then over rule groups. If the
+        `is_agenda` option is enabled, the :class:`Tableau.Agenda` skips the
+        branches that have not changed since they were last checked.
+
+        If the `decide_only` option is enabled, ``None`` is returned as soon
+        as an open branch is found to which no rule can be applied, since the
+        argument is then known to be invalid.
         """
+        if self._agenda is not None:
+            return self._agenda.next()
+        decide = self.opts['decide_only']
         for branch in self.open:
-            for group in self.rules.groups:
-                res = self._get_group_application(branch, group)
-                if res:
-                    return res
+            res = self._get_branch_application(branch)
+            if res:
+                return res
+            if decide and self._decide(branch):
+                return
 
     def step(self) -> Tableau.StepEntry|None:
         """Find, execute, and return the next rule application. If no rule can
@@ -888,6 +1062,45 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
                 break
             yield step
 
+    def deltas(self) -> Iterator[Tableau.Delta]:
+        """Returns an iterator like :meth:`stepiter()` that yields the changes
+        to the tableau. The first :class:`Tableau.Delta` has the current state,
+        with no entry, then one follows for each step. The tableau is built only
+        as far as the iterator is consumed, so closing it stops the build.
+
+        A new branch starts with the nodes and ticks of its parent up to the
+        fork, and the first delta repeats the ticks of the parent branches.
+        """
+        branches, nodes, ticks, closed = [], [], [], []
+        for branch in self:
+            branches.append(branch)
+            fork = self.stat(branch, Tableau.StatKey.FORK) or 0
+            for node in branch[fork:]:
+                nodes.append((node, branch))
+            for node in branch:
+                if branch.is_ticked(node):
+                    ticks.append((node, branch))
+            if branch.closed:
+                closed.append(branch)
+        def delta(entry: Tableau.StepEntry|None, /) -> Tableau.Delta:
+            result = Tableau.Delta(self.current_step, entry,
+                tuple(branches), tuple(nodes), tuple(ticks), tuple(closed))
+            for items in (branches, nodes, ticks, closed):
+                items.clear()
+            return result
+        listeners = {
+            Tableau.Events.AFTER_BRANCH_ADD: branches.append,
+            Tableau.Events.AFTER_BRANCH_CLOSE: closed.append,
+            Tableau.Events.AFTER_NODE_ADD: lambda *args: nodes.append(args),
+            Tableau.Events.AFTER_NODE_TICK: lambda *args: ticks.append(args)}
+        self.on(listeners)
+        try:
+            yield delta(None)
+            for entry in self.stepiter():
+                yield delta(entry)
+        finally:
+            self.off(listeners)
+
     def branch(self, /, parent: Branch = None) -> Branch:
         """Create a new branch on the tableau, as a copy of ``parent``, if given.
 
@@ -918,7 +1131,8 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
 
     def finish(self) -> Self:
         """Mark the tableau as finished, and perform post-build tasks, including
-        populating the ``tree``, ``stats``, and ``models`` properties.
+        populating the ``stats``, and ``models`` properties. The ``tree`` is
+        built lazily on first access.
         
         When using the ``build()`` or ``step()`` methods, there is never a need
         to call this method, since it is handled internally. However, this
@@ -939,12 +1153,12 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
                     self.models = frozenset(self._gen_models())
                 except ProofTimeoutError as err:
                     timeouterr = err
-        if self.flag.TIMED_OUT not in self.flag:
-            # In case of a timeout, we do `not` build the tree in order to best
-            # respect the timeout. In case of `max_steps` excess, however, we
-            # `do` build the tree.
-            with self.timers.tree:
-                self.tree = self.Tree.make(self)
+            if self.models and self.opts['is_verify_models'] and not timeouterr:
+                with self.timers.verify:
+                    try:
+                        self.countermodels = frozenset(self._verify_models())
+                    except ProofTimeoutError as err:
+                        timeouterr = err
         self.stats = self._compute_stats()
         self.emit(Tableau.Events.AFTER_FINISH, self)
         if timeouterr:
@@ -1041,6 +1255,7 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
         def after_node_add(node: Node, branch: Branch):
             bstat = stat[branch].node(node)
             bstat[Tableau.StatKey.STEP_ADDED] = node.step = self.current_step
+            self._distinct_nodes += 1
             self.emit(Tableau.Events.AFTER_NODE_ADD, node, branch)
 
         def after_tick(node: Node, branch: Branch):
@@ -1064,7 +1279,8 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
             stat[branch] = self.BranchStat({
                 Tableau.StatKey.STEP_ADDED : self.current_step,
                 Tableau.StatKey.INDEX      : len(branches) - 1,
-                Tableau.StatKey.PARENT     : branch.parent})
+                Tableau.StatKey.PARENT     : branch.parent,
+                Tableau.StatKey.FORK       : None if branch.parent is None else len(branch)})
             # For corner case of an AFTER_BRANCH_ADD callback adding a node, make
             # sure we don't emit AFTER_NODE_ADD twice, so prefetch the nodes.
             if branch.parent is None:
@@ -1094,6 +1310,15 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
 
         self.on(tab_listeners)
 
+    def _get_branch_application(self, branch: Branch, /) -> Tableau.StepEntry|None:
+        """Find and return the next available rule application for the given
+        open branch, checking each rule group in order.
+        """
+        for group in self.rules.groups:
+            res = self._get_group_application(branch, group)
+            if res:
+                return res
+
     def _get_group_application(self, branch, group: Sequence[Rule], /) -> Tableau.StepEntry:
         """Find and return the next available rule application for the given open
         branch and rule group. 
@@ -1169,18 +1394,18 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
 
     def _compute_stats(self):
         'Compute the stats property after the tableau is finished.'
-        try:
-            distinct_nodes = self.tree.distinct_nodes
-        except AttributeError:
-            distinct_nodes = None
         timers = self.timers
+        verify_ms = [
+            branch.model.verify_ms
+            for branch in self.open
+                if branch.model is not None and branch.model.verify_ms is not None]
         return dict(
             result          = self._result_word(),
             branches        = len(self),
             open_branches   = len(self.open),
             closed_branches = len(self) - len(self.open),
             steps           = len(self.history),
-            distinct_nodes  = distinct_nodes,
+            distinct_nodes  = self._distinct_nodes,
             rules_duration_ms = sum(
                 step.duration.value
                 for step in self.history),
@@ -1188,18 +1413,50 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
             trunk_duration_ms  = timers.trunk.elapsed_ms(),
             tree_duration_ms   = timers.tree.elapsed_ms(),
             models_duration_ms = timers.models.elapsed_ms(),
+            verify_duration_ms = timers.verify.elapsed_ms(),
+            models_verified = len(verify_ms),
+            dispatch_calls  = self.rules.dispatch.calls,
+            dispatch_avoided = self.rules.dispatch.avoided,
+            countermodels   = len(self.countermodels),
+            model_verify_ms = verify_ms,
+            timeout_overrun_ms = self._overrun_ms(),
             rules_time_ms = sum(
                 rule.timers[name].elapsed_ms()
                 for rule in self.rules
                     for name in ('search', 'apply')))
 
+    def check_deadline(self):
+        """Raise ``ProofTimeoutError`` if the :attr:`deadline` has passed. This
+        is cheap enough to call in loops, and is checked in the rule searches,
+        and in building the models. Before raising, the tableau is
+        finished, and the time past the deadline is recorded in the stats as
+        ``timeout_overrun_ms``.
+        """
+        if self.deadline is None or perf_counter() <= self.deadline:
+            return
+        self.flag |= self.flag.TIMED_OUT
+        if self.flag.FINISHED in self.flag:
+            if self.stats:
+                self.stats['timeout_overrun_ms'] = self._overrun_ms()
+        else:
+            self.finish()
+        raise Emsg.Timeout(self.opts['build_timeout'])
+
     def _check_timeout(self):
         if self.flag.HAS_TIME_LIMIT not in self.flag:
             return
-        if self.timers.build.elapsed_ms() > self.opts['build_timeout']:
-            self.flag |= self.flag.TIMED_OUT
-            self.finish()
-            raise Emsg.Timeout(self.opts['build_timeout'])
+        self._set_deadline()
+        self.check_deadline()
+
+    def _set_deadline(self):
+        "Set the deadline by the time left of the `build_timeout`."
+        if self.flag.HAS_TIME_LIMIT in self.flag:
+            left = self.opts['build_timeout'] - self.timers.build.elapsed_ms()
+            self.deadline = perf_counter() + left / 1000
+
+    def _overrun_ms(self) -> float|None:
+        if self.flag.TIMED_OUT in self.flag and self.deadline is not None:
+            return round(max(0.0, perf_counter() - self.deadline) * 1000, 3)
 
     def _is_max_steps_exceeded(self) -> bool:
         return (
@@ -1215,16 +1472,276 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
             return 'Completed'
         return 'Unfinished'
 
+    def _decide(self, branch: Branch, /) -> bool:
+        """For the `decide_only` option, whether the open branch, to which no
+        rule can be applied, decides the result. A branch that the last step
+        applied to does not decide, since some rules, like the Serial rule,
+        check the last history entry."""
+        if self.history and self.history[-1].target.branch is branch:
+            return False
+        self._decided = branch
+        return True
+
     def _gen_models(self):
-        'Build models for the open branches.'
+        """Build models for the open branches. If the result was decided by
+        the `decide_only` option, only the deciding branch is used."""
         Model = self.logic.Model
-        for branch in self.open:
-            self._check_timeout()
+        if self._decided is None:
+            branches = self.open
+        else:
+            branches = self._decided,
+        for branch in branches:
+            self.check_deadline()
             model = Model()
             model.read_branch(branch)
             branch.model = model
             yield model
 
+    def _verify_models(self):
+        """Check the models against the argument, in the order of the open
+        branches, and yield the countermodels. The time for each model is
+        recorded on its ``verify_ms`` attribute."""
+        argument = self.argument
+        # A model cannot be a countermodel if the conclusion is a premise.
+        impossible = argument.conclusion in argument.premises
+        first = self.opts['is_first_countermodel']
+        for branch in self.open:
+            self.check_deadline()
+            model = branch.model
+            if model is None:
+                continue
+            start = perf_counter()
+            result = not impossible and model.is_countermodel_to(argument)
+            model.verify_ms = round((perf_counter() - start) * 1000, 3)
+            if result:
+                yield model
+                if first:
+                    break
+
+    class Profile:
+        """Rule and helper profile for the `is_profile` option.
+
+        For each rule, this records the number of searches and applications,
+        the number of targets produced and selected, the time spent searching
+        and applying, and the number of nodes added while applying. For each
+        helper, it records the number of calls to its event listeners and the
+        time spent in them. The times are in milliseconds, and include the time
+        of any nested listeners.
+        """
+
+        __slots__ = ('current', 'helpers', 'rules', 'tableau')
+
+        RULE_KEYS = ('searches', 'search_ms', 'targets', 'applied', 'apply_ms', 'nodes')
+        HELPER_KEYS = ('calls', 'listen_ms')
+
+        current: dict[str, Any]|None
+        "The entry of the rule being applied, if any."
+        helpers: list[dict[str, Any]]
+        "The entries for each helper, in the order created."
+        rules: dict[Rule, dict[str, Any]]
+        "The entries for each rule."
+        tableau: Tableau
+
+        def __init__(self, tableau: Tableau, /):
+            self.tableau = tableau
+            self.rules = {}
+            self.helpers = []
+            self.current = None
+            def after_node_add(node: Node, branch: Branch):
+                if self.current is not None:
+                    self.current['nodes'] += 1
+            tableau.on(Tableau.Events.AFTER_NODE_ADD, after_node_add)
+
+        def entry(self, rule: Rule, /) -> dict[str, Any]:
+            "Get the entry for the rule, and create if missing."
+            try:
+                return self.rules[rule]
+            except KeyError:
+                return self.rules.setdefault(rule, dict.fromkeys(self.RULE_KEYS, 0))
+
+        def search(self, rule: Rule, branch: Branch, /) -> Target|None:
+            "Profile :meth:`Rule.target`."
+            entry = self.entry(rule)
+            start = perf_counter()
+            try:
+                target = rule._search(branch)
+            finally:
+                entry['search_ms'] += (perf_counter() - start) * 1000
+                entry['searches'] += 1
+            if target is not None:
+                entry['targets'] += target['total_candidates']
+            return target
+
+        def apply(self, rule: Rule, target: Target, /):
+            "Profile :meth:`Rule.apply`."
+            self.current = entry = self.entry(rule)
+            start = perf_counter()
+            try:
+                rule._run(target)
+            finally:
+                entry['apply_ms'] += (perf_counter() - start) * 1000
+                entry['applied'] += 1
+                self.current = None
+
+        def listen(self, helper: Rule.AbstractHelper, /):
+            """Call the helper's ``listen_on()`` method, and time the listeners
+            it adds to the tableau, the rule, or the node dispatch."""
+            emitters = self.tableau, helper.rule
+            marks = [(listeners, len(listeners))
+                for emitter in emitters
+                    for listeners in emitter.events.values()]
+            entries = self.tableau.rules.dispatch.entries
+            mark = len(entries)
+            helper.listen_on()
+            entry = dict(
+                helper = type(helper).__name__,
+                rule   = helper.rule.name,
+                **dict.fromkeys(self.HELPER_KEYS, 0))
+            self.helpers.append(entry)
+            for listeners, size in marks:
+                added = list(listeners)[size:]
+                for listener in added:
+                    listeners.remove(listener)
+                listeners.extend(
+                    Listener(self._timed(entry, listener.cb), listener.once)
+                    for listener in added)
+            for i in range(mark, len(entries)):
+                pred, callback = entries[i]
+                entries[i] = pred, self._timed(entry, callback)
+
+        @staticmethod
+        def _timed(entry: dict[str, Any], callback: Callable, /) -> Callable:
+            def timed(*args, **kw):
+                start = perf_counter()
+                try:
+                    return callback(*args, **kw)
+                finally:
+                    entry['listen_ms'] += (perf_counter() - start) * 1000
+                    entry['calls'] += 1
+            return timed
+
+        def report(self) -> dict[str, list[dict[str, Any]]]:
+            """Build the report.
+
+            Returns:
+                A dict with ``rules`` and ``helpers`` lists of entries, with
+                the times rounded to microseconds.
+            """
+            rules = []
+            for rule in self.tableau.rules:
+                entry = dict(rule = rule.name, **self.entry(rule))
+                rules.append(self._rounded(entry))
+            helpers = list(map(self._rounded, self.helpers))
+            return dict(rules = rules, helpers = helpers)
+
+        for_json = report
+
+        def table(self) -> str:
+            "Format the report as a text table, by descending total time."
+            report = self.report()
+            numeric = {*self.RULE_KEYS, *self.HELPER_KEYS}
+            lines = []
+            for name, keys, entries, timekeys in (
+                ('rule', self.RULE_KEYS, report['rules'], ('search_ms', 'apply_ms')),
+                ('helper', ('rule', *self.HELPER_KEYS), report['helpers'], ('listen_ms',))):
+                entries = sorted(entries,
+                    key = lambda entry: sum(map(entry.get, timekeys)),
+                    reverse = True)
+                cols = (name, *keys)
+                rows = [tuple(map(str, map(entry.get, cols))) for entry in entries]
+                widths = [max(map(len, col)) for col in zip(cols, *rows)]
+                for row in (cols, *rows):
+                    lines.append('  '.join(
+                        value.rjust(width) if col in numeric
+                        else value.ljust(width)
+                        for col, value, width in zip(cols, row, widths)).rstrip())
+                lines.append('')
+            return '\n'.join(lines[:-1])
+
+        @staticmethod
+        def _rounded(entry: dict[str, Any], /) -> dict[str, Any]:
+            return {key: round(value, 3) if isinstance(value, float) else value
+                for key, value in entry.items()}
+
+        def __repr__(self):
+            return (f'<{type(self).__name__} rules:{len(self.rules)} '
+                f'helpers:{len(self.helpers)}>')
+
+    class Agenda:
+        """Incremental step scheduler for :meth:`Tableau.next`.
+
+        The application found for each open branch is kept until an event
+        changes the branch: a node is added or ticked, or a rule is applied
+        to it. Since some rules consult the last history entry, the branch
+        of the previous application is also refreshed after each step.
+
+        Branches waiting to be checked, or with an application ready, are held
+        in a priority queue in the order they were added to the tableau, which
+        is the order of :attr:`Tableau.open`. So the selection is the same as
+        checking every open branch in turn.
+        """
+
+        __slots__ = ('entries', 'last', 'order', 'queue', 'queued', 'tableau')
+
+        def __init__(self, tableau: Tableau, /):
+            self.tableau = tableau
+            self.entries: dict[Branch, Tableau.StepEntry|None] = {}
+            self.order: dict[Branch, int] = {}
+            self.queue: list[tuple[int, Branch]] = []
+            self.queued: set[Branch] = set()
+            self.last: Branch|None = None
+            counter = count()
+            def after_branch_add(branch: Branch):
+                if branch in tableau.open:
+                    self.order[branch] = next(counter)
+                    self.push(branch)
+            def after_branch_close(branch: Branch):
+                self.order.pop(branch, None)
+                self.entries.pop(branch, None)
+            def after_node_change(node: Node, branch: Branch):
+                self.invalidate(branch)
+            def after_rule_apply(target: Target):
+                if self.last is not None:
+                    self.invalidate(self.last)
+                self.last = target.branch
+                self.invalidate(target.branch)
+            tableau.on({
+                Tableau.Events.AFTER_BRANCH_ADD: after_branch_add,
+                Tableau.Events.AFTER_BRANCH_CLOSE: after_branch_close,
+                Tableau.Events.AFTER_NODE_ADD: after_node_change,
+                Tableau.Events.AFTER_NODE_TICK: after_node_change,
+                Tableau.Events.AFTER_RULE_APPLY: after_rule_apply})
+
+        def push(self, branch: Branch, /):
+            "Queue the branch to be checked, if it is open and not queued."
+            if branch in self.order and branch not in self.queued:
+                heappush(self.queue, (self.order[branch], branch))
+                self.queued.add(branch)
+
+        def invalidate(self, branch: Branch, /):
+            "Discard the known application for the branch and queue it."
+            self.entries.pop(branch, None)
+            self.push(branch)
+
+        def next(self) -> Tableau.StepEntry|None:
+            "Return the application for the first eligible branch, if any."
+            queue = self.queue
+            entries = self.entries
+            while queue:
+                _, branch = queue[0]
+                if branch in self.order:
+                    try:
+                        entry = entries[branch]
+                    except KeyError:
+                        entry = entries[branch] = (
+                            self.tableau._get_branch_application(branch))
+                    if entry is not None:
+                        return entry
+                    if self.tableau.opts['decide_only'] and self.tableau._decide(branch):
+                        return
+                heappop(queue)
+                self.queued.discard(branch)
+
     class NodeStat(dict):
         __slots__ = EMPTY_SET
         Flag = TableauMeta.Flag
@@ -1246,7 +1763,8 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
             Key.STEP_ADDED  : Flag(0),
             Key.STEP_CLOSED : Flag(0),
             Key.INDEX       : None,
-            Key.PARENT      : None})
+            Key.PARENT      : None,
+            Key.FORK        : None})
 
         def __init__(self, mapping = None, /):
             super().__init__(self.defaults)
@@ -1390,6 +1908,12 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
         branch_step: int = None
         "The step at which the branch was added"
 
+        index: int = 0
+        "The index of this structure among its parent's child structures."
+
+        degree: int = 0
+        "The number of child structures."
+
         def __init__(self):
             self.nodes = []
             self.ticksteps = []
@@ -1398,19 +1922,186 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
 
         @classmethod
         def make(cls, tab: Tableau):
-            return cls._build(tab, tab)
+            """Build the tree for the tableau. If the branches form a single fork
+            tree, the structure is derived from the fork graph, in time linear in
+            the number of distinct nodes. Otherwise, the branches are compared
+            node by node."""
+            forks = cls._forks(tab)
+            if forks is None:
+                return cls._build(tab, tab)
+            return cls._build_fork(tab, tab[0], 0, forks, None, 0)
 
         @classmethod
-        def _build(cls, tab: Tableau, branches: Sequence[Branch], depth=0, memo=None,/) -> Tableau.Tree:
+        def _forks(cls, tab: Tableau, /) -> dict[Branch, deque[tuple[int, Branch]]]|None:
+            """Map each branch to its fork indexes and child branches, in order
+            of creation. Returns None if the branches do not form a single fork
+            tree, or if a child does not diverge from its parent at the fork."""
+            if not len(tab) or tab[0].parent is not None:
+                return None
             StatKey = Tableau.StatKey
-            tree = cls()
+            forks = {}
+            for branch in tab:
+                forks[branch] = deque()
+                parent = branch.parent
+                if parent is None:
+                    if len(forks) > 1:
+                        return None
+                    continue
+                if parent not in forks:
+                    return None
+                fork = tab.stat(branch, StatKey.FORK)
+                if (len(branch) <= fork or len(parent) <= fork or
+                    branch[fork] is parent[fork] or
+                    fork and branch[fork - 1] is not parent[fork - 1]):
+                    return None
+                forks[parent].append((fork, branch))
+            return forks
+
+        @classmethod
+        def _build_fork(cls, tab: Tableau, branch: Branch, start: int, forks: dict, memo: dict|None, index: int, /) -> Tableau.Tree:
+            'Build the structure for the branch from start, and its forks after.'
+            tree = cls._start(memo, index)
             if memo is None:
                 memo = dict(pos=1, depth=0, distinct_nodes=0, root=tree)
+            end = cls._fork_segment(tab, tree, branch, start, forks)
+            memo['distinct_nodes'] += len(tree.nodes)
+            if not forks[branch]:
+                cls._build_leaf(tab, tree, branch, memo)
+            else:
+                group = cls._fork_group(tab, branch, end, forks)
+                tree.degree = len(group)
+                memo['depth'] += 1
+                widths = [0] * 3
+                for i, member in enumerate(group):
+                    memo['pos'] += 1
+                    child = cls._build_fork(tab, member, end, forks, memo, i)
+                    tree.has_open = tree.has_open or child.has_open
+                    tree.has_closed = tree.has_closed or child.has_closed
+                    cls._add_child(tree, child, widths)
+                memo['depth'] -= 1
+                cls._balance(tree, widths)
+            tree.structure_node_count = tree.descendant_node_count + len(tree.nodes)
+            memo['pos'] += 1
+            tree.right = memo['pos']
+            if memo['root'] is tree:
+                tree.distinct_nodes = memo['distinct_nodes']
+            return tree
+
+        @classmethod
+        def walk(cls, tab: Tableau) -> Iterator[Tableau.Tree]:
+            """Generate the structures of the tableau in pre-order, without
+            building the whole tree. The structures are not linked, so each
+            can be released once consumed.
+
+            A generated structure has no `children`, and the attributes that
+            depend on its descendants, such as `width`, `right`, and, except
+            for a leaf, `has_open` and `has_closed`, are not set. Use the
+            `depth`, `index`, and `degree` attributes to recover the shape of
+            the tree.
+            """
+            forks = cls._forks(tab)
+            if forks is None:
+                return cls._walk(tab, tab, 0, None, 0)
+            return cls._walk_fork(tab, forks)
+
+        @classmethod
+        def _walk_fork(cls, tab: Tableau, forks: dict, /) -> Iterator[Tableau.Tree]:
+            'Generate the structures from the fork graph, with an explicit stack.'
+            memo = dict(pos=1, depth=0)
+            # Each entry is (branch, start, depth, index), or None to leave
+            # a structure after its descendants.
+            stack = [(tab[0], 0, 0, 0)]
+            while stack:
+                entry = stack.pop()
+                if entry is None:
+                    memo['pos'] += 1
+                    continue
+                branch, start, depth, index = entry
+                if depth:
+                    memo['pos'] += 1
+                tree = cls()
+                tree.root = not depth
+                tree.depth = memo['depth'] = depth
+                tree.left = memo['pos']
+                tree.index = index
+                end = cls._fork_segment(tab, tree, branch, start, forks)
+                stack.append(None)
+                if not forks[branch]:
+                    cls._build_leaf(tab, tree, branch, memo)
+                else:
+                    group = cls._fork_group(tab, branch, end, forks)
+                    tree.degree = len(group)
+                    for i in reversed(range(len(group))):
+                        stack.append((group[i], end, depth + 1, i))
+                yield tree
+
+        @classmethod
+        def _fork_segment(cls, tab: Tableau, tree: Tableau.Tree, branch: Branch, start: int, forks: dict, /) -> int:
+            """Add the nodes of the branch from start to its first fork, and
+            return the index of the fork, or the length of the branch."""
+            StatKey = Tableau.StatKey
+            children = forks[branch]
+            end = children[0][0] if children else len(branch)
+            for i in range(start, end):
+                node = branch[i]
+                tree.nodes.append(node)
+                tree.ticksteps.append(tab.stat(branch, node, StatKey.STEP_TICKED))
+                step_added = tab.stat(branch, node, StatKey.STEP_ADDED)
+                if tree.step is None or step_added < tree.step:
+                    tree.step = step_added
+            return end
+
+        @staticmethod
+        def _fork_group(tab: Tableau, branch: Branch, end: int, forks: dict, /) -> list[Branch]:
+            """Collect the branches that diverge at end, including forks of forks
+            that were made before any node was added, in branch order."""
+            group = [branch]
+            for member in group:
+                children = forks[member]
+                while children and children[0][0] == end:
+                    group.append(children.popleft()[1])
+            group.sort(key = lambda b: tab.stat(b, Tableau.StatKey.INDEX))
+            return group
+
+        @classmethod
+        def _walk(cls, tab: Tableau, branches: Sequence[Branch], depth: int, memo: dict|None, index: int, /) -> Iterator[Tableau.Tree]:
+            tree = cls._start(memo, index)
+            if memo is None:
+                memo = dict(pos=1, depth=0)
+            nodes, depth = cls._segment(tab, tree, branches, depth)
+            if len(branches) == 1:
+                cls._build_leaf(tab, tree, branches[0], memo)
+                yield tree
+            else:
+                tree.degree = len(nodes)
+                yield tree
+                memo['depth'] += 1
+                for i, node in enumerate(nodes):
+                    memo['pos'] += 1
+                    next_branches = deque(b for b in branches if b[depth] == node)
+                    yield from cls._walk(tab, next_branches, depth, memo, i)
+                memo['depth'] -= 1
+            memo['pos'] += 1
+
+        @classmethod
+        def _start(cls, memo: dict|None, index: int, /) -> Tableau.Tree:
+            'Create a structure at the current position.'
+            tree = cls()
+            if memo is None:
                 tree.root = True
+                tree.left = 1
             else:
-                memo['pos'] += 1
-            tree.depth = memo['depth']
-            tree.left = memo['pos']
+                tree.depth = memo['depth']
+                tree.left = memo['pos']
+            tree.index = index
+            return tree
+
+        @classmethod
+        def _segment(cls, tab: Tableau, tree: Tableau.Tree, branches: Sequence[Branch], depth: int, /) -> tuple[Set[Node], int]:
+            """Collect the nodes shared by all the branches, starting at depth.
+            Returns the distinct nodes at the depth where the branches diverge,
+            and that depth."""
+            StatKey = Tableau.StatKey
             while True:
                 # Each branch's node at depth.
                 nodes = qset()
@@ -1428,7 +2119,7 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
                         tree.has_open = True
                 if len(nodes) != 1:
                     # There is *not* a singular node shared by all branches at depth.
-                    break
+                    return nodes, depth
                 # There is one node shared by all branches at depth, thus the
                 # branches are equivalent up to this depth.
                 branch = specimen
@@ -1439,6 +2130,13 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
                 if tree.step is None or step_added < tree.step:
                     tree.step = step_added
                 depth += 1
+
+        @classmethod
+        def _build(cls, tab: Tableau, branches: Sequence[Branch], depth=0, memo=None, index=0,/) -> Tableau.Tree:
+            tree = cls._start(memo, index)
+            if memo is None:
+                memo = dict(pos=1, depth=0, distinct_nodes=0, root=tree)
+            nodes, depth = cls._segment(tab, tree, branches, depth)
             memo['distinct_nodes'] += len(tree.nodes)
             if len(branches) == 1:
                 # Finalize leaf attributes.
@@ -1481,23 +2179,35 @@ class Tableau(Sequence[Branch], EventEmitter, metaclass=TableauMeta):
 
             # Widths of first, middle, last
             widths = [0] * 3
+            tree.degree = len(nodes)
             for i, node in enumerate(nodes):
                 # recurse
+                memo['pos'] += 1
                 next_branches = deque(b for b in branches if b[depth] == node)
-                child = cls._build(tab, next_branches, depth, memo)
-                tree.descendant_node_count = len(child.nodes) + child.descendant_node_count
-                tree.width += child.width
-                tree.children.append(child)
-                if i == 0:
-                    # first node
-                    tree.branch_step = child.step
-                    widths[0] = child.width / 2
-                elif i == len(nodes) - 1:
-                    # last node
-                    widths[2] = child.width / 2
-                else:
-                    widths[1] += child.width
-                tree.branch_step = min(tree.branch_step, child.step)
+                child = cls._build(tab, next_branches, depth, memo, i)
+                cls._add_child(tree, child, widths)
+            cls._balance(tree, widths)
+
+        @staticmethod
+        def _add_child(tree: Tableau.Tree, child: Tableau.Tree, widths: list, /):
+            'Append the child structure, and update the widths of first, middle, last.'
+            tree.descendant_node_count = len(child.nodes) + child.descendant_node_count
+            tree.width += child.width
+            tree.children.append(child)
+            if child.index == 0:
+                # first node
+                tree.branch_step = child.step
+                widths[0] = child.width / 2
+            elif child.index == tree.degree - 1:
+                # last node
+                widths[2] = child.width / 2
+            else:
+                widths[1] += child.width
+            tree.branch_step = min(tree.branch_step, child.step)
+
+        @staticmethod
+        def _balance(tree: Tableau.Tree, widths: list, /):
+            'Set the balanced line attributes from the widths of first, middle, last.'
             if tree.width > 0:
                 tree.balanced_line_width = sum(widths) / tree.width
                 tree.balanced_line_margin = widths[0] / tree.width
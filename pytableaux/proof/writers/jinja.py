@@ -78,17 +78,33 @@ class TextTabWriter(JinjaTabWriter):
 
     def __call__(self, tab: Tableau) -> str:
         template = self.get_template(self.template_name)
-        return self._write_structure(tab.tree, template)
-
-    def _write_structure(self, s: Tableau.Tree, template: jinja2.Template, *, prefix = ''):
-        nodestr = template.render(structure = s)
+        if isinstance(tab, Tableau):
+            structures = tab.Tree.walk(tab)
+        else:
+            # A reloaded record has only the built tree.
+            structures = self._preorder(tab.tree)
         lines = deque()
-        lines.append(prefix + nodestr)
-        prefix += ' ' * (len(nodestr) - 1)
-        for c, child in enumerate(s.children):
-            is_last = c == len(s.children) - 1
-            next_pfx = prefix + (' ' if is_last else '|')
-            lines.append(self._write_structure(child, template, prefix=next_pfx))
-            if not is_last:
-                lines.append(next_pfx)
+        # The child prefix and degree of each ancestor structure.
+        stack = deque()
+        for s in structures:
+            while len(stack) > s.depth:
+                stack.pop()
+            if stack:
+                prefix, degree = stack[-1]
+                if s.index:
+                    lines.append(prefix + '|')
+                prefix += ' ' if s.index == degree - 1 else '|'
+            else:
+                prefix = ''
+            nodestr = template.render(structure = s)
+            lines.append(prefix + nodestr)
+            stack.append((prefix + ' ' * (len(nodestr) - 1), s.degree))
         return '\n'.join(lines)
+
+    @staticmethod
+    def _preorder(tree: Tableau.Tree):
+        stack = [tree]
+        while stack:
+            s = stack.pop()
+            yield s
+            stack.extend(reversed(s.children))
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.synthetic
+^^^^^^^^^^^^^^^^^^^^
+
+Generated argument families of controlled size, for stress testing. Each
+family takes the size ``n`` as the first argument, and the random families
+take a ``seed``, so the same call always makes the same argument.
+"""
+
+from __future__ import annotations
+
+from functools import reduce
+from itertools import combinations, pairwise
+from random import Random
+from types import MappingProxyType as MapProxy
+from typing import Callable
+
+from .lang import (Argument, Atomic, Constant, Operator, Predicate,
+                   Quantifier, Sentence, Variable)
+
+__all__ = (
+    'alternations',
+    'cnf',
+    'designations',
+    'disjunctions',
+    'dnf',
+    'families',
+    'modals',
+    'pigeonhole',
+    'syllogisms')
+
+def disjunctions(n: int, /) -> Argument:
+    """Disjunctive syllogism with `n` disjuncts: a disjunction of `n` atomics,
+    and the negations of all but the last, therefore the last."""
+    atoms = tuple(Atomic.gen(n))
+    return Argument(atoms[-1], (
+        reduce(Operator.Disjunction, atoms),
+        *map(Operator.Negation, atoms[:-1])),
+        title=f'disjunctions-{n}')
+
+def pigeonhole(n: int, /) -> Argument:
+    """The pigeonhole principle for `n` + 1 pigeons and `n` holes. The premises
+    put every pigeon in some hole, and no two pigeons in the same hole, so
+    they are classically inconsistent, and the conclusion is a fresh atomic."""
+    atoms = Atomic.gen(None)
+    rows = tuple(tuple(next(atoms) for _ in range(n)) for _ in range(n + 1))
+    premises = [reduce(Operator.Disjunction, row) for row in rows]
+    for hole in range(n):
+        for a, b in combinations((row[hole] for row in rows), 2):
+            premises.append(Operator.Negation(Operator.Conjunction(a, b)))
+    return Argument(next(atoms), premises, title=f'pigeonhole-{n}')
+
+def syllogisms(n: int, /) -> Argument:
+    """A chain of `n` universally quantified conditionals from F to the
+    `n`-th next predicate, with Fa, therefore the last predicate of a."""
+    x, a = Variable.first(), Constant.first()
+    preds = tuple(Predicate.gen(n + 1))
+    return Argument(preds[-1](a), (
+        *(Quantifier.Universal(x, Operator.MaterialConditional(p(x), q(x)))
+            for p, q in pairwise(preds)),
+        preds[0](a)),
+        title=f'syllogisms-{n}')
+
+def alternations(n: int, /) -> Argument:
+    """An `n`-ary predicate under `n` alternating quantifiers, starting with
+    Existential. The conclusion swaps each Existential with the Universal that
+    follows it, which is classically valid."""
+    variables = tuple(Variable.gen(n))
+    s: Sentence = Predicate(0, 0, n)(variables)
+    order = [(Quantifier.Universal if i % 2 else Quantifier.Existential, v)
+        for i, v in enumerate(variables)]
+    swapped = list(order)
+    for i in range(0, n - 1, 2):
+        swapped[i], swapped[i + 1] = swapped[i + 1], swapped[i]
+    def quantify(order):
+        return reduce(lambda s, qv: qv[0](qv[1], s), reversed(order), s)
+    return Argument(quantify(swapped), (quantify(order),),
+        title=f'alternations-{n}')
+
+def modals(n: int, /) -> Argument:
+    """Modus ponens under a chain of `n` Necessity operators."""
+    a, b = Atomic.gen(2)
+    def chain(s):
+        return reduce(lambda s, _: Operator.Necessity(s), range(n), s)
+    return Argument(chain(b), (
+        chain(Operator.MaterialConditional(a, b)),
+        chain(a)),
+        title=f'modals-{n}')
+
+def cnf(n: int, /, width: int = 3, depth: int|None = None, *, seed: int = 0) -> Argument:
+    """A random formula in conjunctive normal form over `n` atomics, with
+    `depth` clauses (default `n`), each a disjunction of `width` literals,
+    therefore a random literal."""
+    random = Random(seed)
+    atoms = tuple(Atomic.gen(n))
+    s = _normal(random, atoms, width, depth or n, Operator.Disjunction, Operator.Conjunction)
+    return Argument(_literal(random, atoms), (s,),
+        title=f'cnf-{n}-{width}-{depth or n}-{seed}')
+
+def dnf(n: int, /, width: int = 3, depth: int|None = None, *, seed: int = 0) -> Argument:
+    """A random formula in disjunctive normal form over `n` atomics, with
+    `depth` terms (default `n`), each a conjunction of `width` literals,
+    therefore a random literal."""
+    random = Random(seed)
+    atoms = tuple(Atomic.gen(n))
+    s = _normal(random, atoms, width, depth or n, Operator.Conjunction, Operator.Disjunction)
+    return Argument(_literal(random, atoms), (s,),
+        title=f'dnf-{n}-{width}-{depth or n}-{seed}')
+
+def designations(n: int, /, *, seed: int = 0) -> Argument:
+    """Random premises over `n` atomics, each an atomic, its negation, an
+    instance of excluded middle, or an instance of non-contradiction. In FDE
+    and its extensions, these mix designated and undesignated nodes, and gluts
+    and gaps, on the same branch."""
+    random = Random(seed)
+    atoms = tuple(Atomic.gen(n))
+    forms: tuple[Callable[[Sentence], Sentence], ...] = (
+        lambda a: a,
+        Operator.Negation,
+        lambda a: Operator.Disjunction(a, Operator.Negation(a)),
+        lambda a: Operator.Negation(Operator.Conjunction(a, Operator.Negation(a))))
+    premises = [random.choice(forms)(a) for a in atoms]
+    conclusion = Operator.Disjunction(_literal(random, atoms), _literal(random, atoms))
+    return Argument(conclusion, premises, title=f'designations-{n}-{seed}')
+
+def _literal(random: Random, atoms: tuple[Atomic, ...], /) -> Sentence:
+    a = random.choice(atoms)
+    return Operator.Negation(a) if random.random() < 0.5 else a
+
+def _normal(random: Random, atoms: tuple[Atomic, ...], width: int, depth: int, inner: Operator, outer: Operator, /) -> Sentence:
+    return reduce(outer, (
+        reduce(inner, (_literal(random, atoms) for _ in range(width)))
+        for _ in range(depth)))
+
+families: MapProxy[str, Callable[..., Argument]] = MapProxy(dict(
+    alternations = alternations,
+    cnf          = cnf,
+    designations = designations,
+    disjunctions = disjunctions,
+    dnf          = dnf,
+    modals       = modals,
+    pigeonhole   = pigeonhole,
+    syllogisms   = syllogisms))
+"The families by name."
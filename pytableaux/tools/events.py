@@ -42,8 +42,8 @@ class EventEmitter:
 
     __slots__ = 'events',
 
-    def __init__(self, *events):
-        self.events = EventsListeners(*events)
+    def __init__(self, *events, counting: bool = True):
+        self.events = EventsListeners(*events, counting=counting)
 
     def on(self, *args, **kw):
         self.events.on(*args, **kw)
@@ -95,35 +95,92 @@ class Listener:
 class Listeners(linqset[Listener]):
     """
     A group of listeners for an event.
+
+    The callbacks are compiled into a tuple of plain callables, which is
+    rebuilt only after the listeners change. As long as no ``once`` listener
+    is attached, emitting calls the tuple directly, and the per-listener
+    ``callcount`` is not updated. Listeners attached or detached by a callback
+    take effect on the next emit.
     """
 
     emitcount: int
     callcount: int
+    calls: tuple[Callable, ...]|None
+    "The compiled callbacks, or ``None`` if the listeners have changed."
+    onces: bool
+    "Whether a ``once`` listener was attached when last compiled."
 
-    __slots__ = ('emitcount', 'callcount')
+    __slots__ = ('emitcount', 'callcount', 'calls', 'onces')
 
     def __init__(self, values = None):
+        self.calls = None
+        self.onces = False
         super().__init__(values)
         self.callcount = 0
         self.emitcount = 0
 
+    def compile(self) -> tuple[Callable, ...]:
+        "Build the tuple of callbacks."
+        self.onces = any(listener.once for listener in self)
+        self.calls = calls = tuple(listener.cb for listener in self)
+        return calls
+
+    def fire(self, *args, **kw) -> int:
+        """Call the listeners without updating the counters.
+
+        Returns:
+            int: The number of listeners called.
+        """
+        if (calls := self.calls) is None:
+            calls = self.compile()
+        if self.onces:
+            return self._emit_each(*args, **kw)
+        for cb in calls:
+            cb(*args, **kw)
+        return len(calls)
+
     def emit(self, *args, **kw) -> int:
         self.emitcount += 1
+        count = self.fire(*args, **kw)
+        self.callcount += count
+        return count
+
+    def _emit_each(self, *args, **kw) -> int:
         count = 0
-        try:
-            for listener in self:
-                try:
-                    listener(*args, **kw)
-                    count += 1
-                finally:
-                    if listener.once:
-                        # Discard instead of remove, since a consumer might
-                        # manually remove the listener when it is called.
-                        self.discard(listener)
-        finally:
-            self.callcount += count
+        for listener in self:
+            try:
+                listener(*args, **kw)
+                count += 1
+            finally:
+                if listener.once:
+                    # Discard instead of remove, since a consumer might
+                    # manually remove the listener when it is called.
+                    self.discard(listener)
         return count
 
+    def _seed(self, link, /):
+        self.calls = None
+        super()._seed(link)
+
+    def _spot(self, rel, neighbor, link, /):
+        self.calls = None
+        super()._spot(rel, neighbor, link)
+
+    def _unlink(self, link, /):
+        self.calls = None
+        super()._unlink(link)
+
+    def clear(self):
+        self.calls = None
+        super().clear()
+
+    def copy(self):
+        inst = super().copy()
+        inst.calls = None
+        inst.onces = False
+        inst.emitcount = inst.callcount = 0
+        return inst
+
     def __repr__(self):
         return (
             f'<{type(self).__name__} listeners:{len(self)} '
@@ -136,12 +193,15 @@ class EventsListeners(dict[Any, Listeners]):
 
     emitcount: int
     callcount: int
+    counting: bool
+    "Whether to update the emit and call counters."
 
-    __slots__ = ('emitcount', 'callcount')
+    __slots__ = ('emitcount', 'callcount', 'counting')
 
-    def __init__(self, *events):
+    def __init__(self, *events, counting: bool = True):
         self.emitcount = 0
         self.callcount = 0
+        self.counting = counting
         if events:
             self.create(*events)
 
@@ -219,6 +279,8 @@ class EventsListeners(dict[Any, Listeners]):
             int: The number of listeners called.
         """
         listeners = self[event]
+        if not self.counting:
+            return listeners.fire(*args, **kw)
         self.emitcount += 1
         callcount = listeners.emit(*args, **kw)
         self.callcount += callcount
@@ -230,13 +292,15 @@ class EventsListeners(dict[Any, Listeners]):
         Args:
             listeners (bool): Copy listeners.
         """
-        if listeners:
-            return super().copy()
         cls = type(self)
         inst = cls.__new__(cls)
         inst.emitcount = 0
         inst.callcount = 0
-        inst.create(*self)
+        inst.counting = self.counting
+        if listeners:
+            inst.update(self)
+        else:
+            inst.create(*self)
         return inst
 
     def __repr__(self):
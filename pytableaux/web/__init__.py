@@ -81,6 +81,45 @@ class EnvConfig(ItemMapEnum):
         default = 30000,
         envvar  = 'PT_MAXTIMEOUT',
         type    = int)
+    proof_cache_size = dict(
+        default = 128,
+        envvar  = 'PT_PROOF_CACHE_SIZE',
+        type    = int,
+        min     = 0)
+    response_cache_bytes = dict(
+        default = 32 * 1024 * 1024,
+        envvar  = 'PT_RESPONSE_CACHE_BYTES',
+        type    = int,
+        min     = 0)
+    proof_pool_size = dict(
+        default = 0,
+        envvar  = 'PT_PROOF_POOL_SIZE',
+        type    = int,
+        min     = 0)
+    proof_queue_size = dict(
+        default = 16,
+        envvar  = 'PT_PROOF_QUEUE_SIZE',
+        type    = int,
+        min     = 0)
+    batch_max_jobs = dict(
+        default = 100,
+        envvar  = 'PT_BATCH_MAX_JOBS',
+        type    = int,
+        min     = 1)
+    batch_max_serial_jobs = dict(
+        default = 10,
+        envvar  = 'PT_BATCH_MAX_SERIAL_JOBS',
+        type    = int,
+        min     = 1)
+    proof_kill_grace = dict(
+        default = 0,
+        envvar  = 'PT_PROOF_KILL_GRACE',
+        type    = int,
+        min     = 0)
+    proof_cache_path = dict(
+        default = None,
+        envvar  = 'PT_PROOF_CACHE_PATH',
+        type    = str)
     doc_dir = dict(
         default = os.path.abspath(f'{package.root}/../doc/_build/html'),
         envvar  = 'PT_DOC_DIR',
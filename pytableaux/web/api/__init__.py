@@ -80,6 +80,8 @@ from . import views
 class App:
     parse = views.ParseView()
     prove = views.ProveView()
+    prove.stream = views.ProveStreamView()
+    prove.batch = views.ProveBatchView()
     default = View()
 
 app = App()
\ No newline at end of file
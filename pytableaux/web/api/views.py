@@ -20,20 +20,30 @@ pytableaux.web.api.views
 """
 from __future__ import annotations
 
+import time
 from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor,
+                                CancelledError, Future, wait)
 from types import MappingProxyType as MapProxy
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
+
+from cherrypy import HTTPError
 
 from ... import logics
-from ...errors import ParseError
-from ...lang import Argument, LexWriter, Notation, Parser, Predicates
-from ...proof import Tableau, writers
-from ...tools import EMPTY_MAP
+from ...errors import ParseError, ProofTimeoutError
+from ...lang import (Argument, LexWriter, Notation, Parser, Predicates,
+                     TriCoords)
+from ...proof import Branch, Node, Tableau, writers
+from ...tools import EMPTY_MAP, dmerged
 from ...tools.timing import StopWatch
+from ..pool import PoolFull
+from ..util import tojson
 from . import View
 
 __all__ = (
     'ParseView',
+    'ProveBatchView',
+    'ProveStreamView',
     'ProveView')
 
 EMPTY = ()
@@ -131,6 +141,16 @@ class ProveView(View):
             attachments=False,
             options=EMPTY_MAP))))
 
+    def __call__(self, *args, **kw):
+        return self.respond_cached(self.cache_key(), super().__call__, *args, **kw)
+
+    def cache_key(self) -> Any:
+        "The normalized request for the response cache, or None."
+        if self.request.method != 'POST' or self.is_debug:
+            return
+        payload = getattr(self.request, 'json', None) or EMPTY_MAP
+        return type(self).__qualname__, dmerged(self.payload_defaults, payload)
+
     def setup(self, *args, **kw):
         super().setup(*args, **kw)
         self.payload['output:options:debug'] = self.is_debug
@@ -191,36 +211,72 @@ class ProveView(View):
         if self.errors:
             return
         self.tableau = self.build()
+        return self.get_result(self.tableau, self.pw,
+            attachments = self.payload['output:attachments'])
+
+    @staticmethod
+    def get_result(tab: Tableau, pw: writers.TabWriter, /, *, attachments: bool = False) -> dict[str, Any]:
+        "The result data for a finished tableau, written by `pw`."
         data = dict(
             tableau = dict(
-                logic = self.logic.Meta.name,
+                logic = tab.logic.Meta.name,
                 argument = dict(
-                    premises   = tuple(map(self.pw.lw, self.argument.premises)),
-                    conclusion = self.pw.lw(self.argument.conclusion)),
-                valid  = self.tableau.valid,
-                body   = self.pw(self.tableau),
-                stats  = self.tableau.stats,
-                result = self.tableau.stats['result']),
+                    premises   = tuple(map(pw.lw, tab.argument.premises)),
+                    conclusion = pw.lw(tab.argument.conclusion)),
+                valid  = tab.valid,
+                body   = pw(tab),
+                stats  = tab.stats,
+                result = tab.stats['result']),
             writer = dict(
-                engine  = self.pw.engine,
-                format  = self.pw.format,
-                notation = self.pw.lw.notation.name,
-                options = self.pw.opts))
-        if self.payload['output:attachments']:
-            data['attachments'] = self.pw.attachments()
+                engine  = pw.engine,
+                format  = pw.format,
+                notation = pw.lw.notation.name,
+                options = pw.opts))
+        if attachments:
+            data['attachments'] = pw.attachments()
         return data
 
     def build(self):
+        cache = self.app.proof_cache
+        tab = cache.get(self.logic, self.argument, self.tabopts)
+        if tab is None:
+            tab = self.build_tableau()
+            cache.put(tab)
+        elif self.config['metrics_enabled']:
+            self.app.metrics.proofs_cache_hits_count(
+                tab.logic.Meta.name, tab.stats['result']).inc()
+        return tab
+
+    def build_tableau(self):
         metrics = self.app.metrics if self.config['metrics_enabled'] else None
+        pool = self.app.proof_pool
         logic = self.logic
         with StopWatch() as timer:
             if metrics:
                 metrics.proofs_inprogress_count(logic.Meta.name).inc()
-            tab = Tableau(logic, self.argument, **self.tabopts)
             try:
-                tab.build()
+                if pool is None:
+                    tab = Tableau(logic, self.argument, **self.tabopts)
+                    tab.build()
+                else:
+                    tab = pool.build(logic, self.argument, self.tabopts,
+                        cancel = self.is_disconnected)
                 if metrics:
                     metrics.proofs_completed_count(logic.Meta.name, tab.stats['result']).inc()
+            except ProofTimeoutError:
+                if metrics and pool is None:
+                    overrun = tab.stats.get('timeout_overrun_ms')
+                    if overrun is not None:
+                        metrics.proofs_timeout_overrun_time(logic.Meta.name).observe(overrun / 1000)
+                raise
+            except PoolFull as err:
+                self.response.headers['Retry-After'] = str(err.retry_after)
+                raise HTTPError(503, str(err)) from None
+            except CancelledError:
+                raise HTTPError(499, 'Client closed request') from None
+            except BrokenExecutor:
+                self.response.headers['Retry-After'] = '1'
+                raise HTTPError(503, 'Proof workers restarted') from None
             finally:
                 if metrics:
                     metrics.proofs_inprogress_count(logic.Meta.name).dec()
@@ -238,7 +294,7 @@ class ProveView(View):
         if payload['max_steps'] is not None:
             try:
                 payload['max_steps'] = int(payload['max_steps'])
-            except ValueError as err:
+            except (TypeError, ValueError) as err:
                 self.errors['max_steps'] = f"Invalid int value: {err}"
         return dict(
             is_rank_optim   = bool(payload['rank_optimizations']),
@@ -308,3 +364,350 @@ class ProveView(View):
             errors['output:format'] = f"Unsupported format: {err}"
             return
         return WriterClass(lw = lw, **payload['output:options'])
+
+class ProveStreamView(ProveView):
+    """Stream the proof as it is built, one JSON event per step, as
+    newline-delimited JSON, or as server-sent events if the request accepts
+    ``text/event-stream``. The proof is built only as fast as the client reads,
+    and stops when the client disconnects.
+    """
+
+    _cp_config = dict(ProveView._cp_config) | {
+        'response.stream': True,
+        'tools.gzip.on': False}
+
+    def cache_key(self):
+        return None
+
+    def __call__(self, *args, **kw):
+        self.events = None
+        body = super().__call__(*args, **kw)
+        if self.events is None:
+            return body
+        headers = self.response.headers
+        headers['Cache-Control'] = 'no-cache'
+        headers['X-Accel-Buffering'] = 'no'
+        # Each event is on one line, even if the app indents its JSON.
+        lines = (tojson(event).encode() for event in self.events)
+        if 'text/event-stream' in self.request.headers.get('Accept', ''):
+            headers['Content-Type'] = 'text/event-stream'
+            return (b'data: %s\n\n' % line for line in lines)
+        headers['Content-Type'] = 'application/x-ndjson'
+        return (b'%s\n' % line for line in lines)
+
+    def POST(self):
+        """
+        The request body is the same as for :class:`ProveView`. Each event
+        is an object with an ``event`` key, one of ``start``, ``step``, ``end``,
+        or ``error``. The ``step`` events have the changes from one step, with
+        integer IDs for the branches and nodes::
+
+            {"event": "start", "logic": "CPL", "argument": {...}, "writer": {...}}
+            {
+                "event": "step",
+                "step": 2,
+                "rule": "MaterialConditional",
+                "branches": [[1, 0, 2]],
+                "nodes": [[3, 0, {"sentence": "B"}], [4, 1, {"sentence": "\u00acA"}]],
+                "ticks": [[0, 0], [1, 0]],
+                "closed": []
+            }
+            {"event": "end", "valid": true, "result": "Valid", "stats": {...}}
+
+        The branches are ``[id, parent, fork]``, the nodes are
+        ``[id, branch, props]``, and the ticks are ``[branch, node]``.
+        """
+        self.argument = self.get_argument()
+        self.logic = self.get_logic()
+        self.pw = self.get_pw()
+        self.tabopts = self.get_tabopts()
+        if self.errors:
+            return
+        self.tableau = Tableau(self.logic, self.argument, **self.tabopts)
+        self.events = self.stream(self.tableau, self.pw)
+        return True
+
+    def stream(self, tab: Tableau, pw: writers.TabWriter, /) -> Iterator[dict[str, Any]]:
+        """Generate the events. This runs after the handler returns, so it does
+        not read the request state of the view."""
+        lw = pw.lw
+        name = tab.logic.Meta.name
+        metrics = self.app.metrics if self.config['metrics_enabled'] else None
+        branchids: dict[Branch, int] = {}
+        nodeids: dict[Node, int] = {}
+        def props(node: Node) -> dict[str, Any]:
+            return {key: lw(value) if key == 'sentence' else value
+                for key, value in node.items()}
+        yield dict(
+            event = 'start',
+            logic = name,
+            argument = dict(
+                premises   = tuple(map(lw, tab.argument.premises)),
+                conclusion = lw(tab.argument.conclusion)),
+            writer = dict(
+                format   = pw.format,
+                notation = lw.notation.name))
+        if metrics:
+            metrics.proofs_inprogress_count(name).inc()
+        deltas = tab.deltas()
+        try:
+            with StopWatch() as timer:
+                for delta in deltas:
+                    for branch in delta.branches:
+                        branchids[branch] = len(branchids)
+                    for node, _ in delta.nodes:
+                        nodeids.setdefault(node, len(nodeids))
+                    yield dict(
+                        event = 'step',
+                        step = delta.step,
+                        rule = delta.entry and delta.entry.rule.name,
+                        branches = [
+                            (branchids[b], branchids.get(b.parent), tab.stat(b, Tableau.StatKey.FORK))
+                            for b in delta.branches],
+                        nodes = [
+                            (nodeids[node], branchids[b], props(node))
+                            for node, b in delta.nodes],
+                        ticks = [
+                            (branchids[b], nodeids[node])
+                            for node, b in delta.ticks],
+                        closed = [branchids[b] for b in delta.closed])
+        except ProofTimeoutError as err:
+            yield dict(event = 'error', error = type(err).__name__, message = str(err))
+            return
+        finally:
+            deltas.close()
+            if metrics:
+                metrics.proofs_inprogress_count(name).dec()
+                metrics.proofs_execution_time(name).observe(timer.elapsed_secs())
+        if metrics:
+            metrics.proofs_completed_count(name, tab.stats['result']).inc()
+        yield dict(
+            event  = 'end',
+            valid  = tab.valid,
+            result = tab.stats['result'],
+            stats  = tab.stats)
+
+class ProveBatchView(ProveStreamView):
+    """Prove many jobs in one request, and stream each result as a JSON line
+    as soon as it is finished. The jobs share the parsers, the writer, and the
+    options of the request, and are run on the proof pool if it is enabled,
+    otherwise one after another.
+    """
+
+    payload_defaults: Mapping[str, Any] = MapProxy(dict(
+        ProveView.payload_defaults,
+        jobs=EMPTY,
+        logics=EMPTY,
+        deadline=None))
+
+    def POST(self):
+        """
+        Each job has a ``logic`` and ``argument``, like the request body for
+        :class:`ProveView`, and an optional ``max_steps``. Values missing from
+        a job are taken from the request. To prove one argument in many
+        logics, give ``logics`` instead of ``jobs``. The ``deadline`` is the
+        time in milliseconds for the whole batch, up to the server timeout.
+
+        At most ``batch_max_jobs`` jobs are accepted. The jobs run
+        concurrently only on the proof pool. If the pool is disabled, they run
+        one after another on the request thread, and at most
+        ``batch_max_serial_jobs`` are accepted.
+        Example request body::
+
+            {
+                "jobs": [
+                    {"logic": "CPL", "argument": "Aab:a"},
+                    {"logic": "FDE", "argument": "Aab:a", "max_steps": 10}
+                ],
+                "output": {"format": "text"},
+                "deadline": 5000
+            }
+
+        Each line is a ``result`` event with the index of the job, and the
+        ``status``, with either the ``result`` like :class:`ProveView`, or the
+        ``error`` and ``message``. The last line is an ``end`` event::
+
+            {"event": "result", "index": 1, "status": 200, "result": {...}}
+            {"event": "result", "index": 0, "status": 200, "result": {...}}
+            {"event": "end", "count": 2, "elapsed_ms": 25}
+        """
+        payload = self.payload
+        self.pw = self.get_pw()
+        self.tabopts = self.get_tabopts()
+        specs = self.get_specs()
+        deadline = self.config['maxtimeout']
+        if payload['deadline'] is not None:
+            try:
+                value = int(payload['deadline'])
+            except (TypeError, ValueError) as err:
+                self.errors['deadline'] = f"Invalid int value: {err}"
+            else:
+                if value > 0:
+                    deadline = min(deadline, value)
+                else:
+                    self.errors['deadline'] = f"Must be positive: {value}"
+        if self.errors:
+            return
+        jobs = [self.get_job(i, spec) for i, spec in enumerate(specs)]
+        self.events = self.batch(jobs, self.pw,
+            time.perf_counter() + deadline / 1000,
+            attachments = bool(payload['output:attachments']))
+        return True
+
+    def get_specs(self) -> list[Mapping[str, Any]]:
+        "Check the ``jobs`` or ``logics``, and return the job specs."
+        errors = self.errors
+        payload = self.payload
+        if payload['jobs']:
+            specs = payload['jobs']
+            if not isinstance(specs, (list, tuple)):
+                errors['jobs'] = f"Invalid jobs list: {type(specs).__name__}"
+                return []
+            for i, spec in enumerate(specs):
+                if not isinstance(spec, Mapping):
+                    errors['jobs'] = f"Invalid job at index {i}: {type(spec).__name__}"
+                    return []
+        else:
+            names = payload['logics']
+            if not isinstance(names, (list, tuple)):
+                errors['logics'] = f"Invalid logics list: {type(names).__name__}"
+                return []
+            specs = [dict(logic=logic) for logic in names]
+        if not specs:
+            errors['jobs'] = 'No jobs'
+            return specs
+        if self.app.proof_pool is None:
+            maxjobs = min(self.config['batch_max_jobs'], self.config['batch_max_serial_jobs'])
+        else:
+            maxjobs = self.config['batch_max_jobs']
+        if len(specs) > maxjobs:
+            errors['jobs'] = f"Too many jobs, max is {maxjobs}"
+        return specs
+
+    def get_job(self, index: int, spec: Mapping[str, Any], /) -> dict[str, Any]:
+        "Parse a job, and return a dict with either the tableau args or the errors."
+        payload = self.payload
+        job = dict(index=index, errors={})
+        errors = job['errors']
+        try:
+            job['logic'] = logics.registry(spec.get('logic', payload['logic']))
+        except Exception as err:
+            errors['logic'] = err
+        try:
+            job['argument'] = self.parse_argument(spec.get('argument', payload['argument']))
+        except Exception as err:
+            errors['argument'] = err
+        job['opts'] = dict(self.tabopts)
+        if 'max_steps' in spec:
+            try:
+                job['opts']['max_steps'] = None if spec['max_steps'] is None else int(spec['max_steps'])
+            except (TypeError, ValueError) as err:
+                errors['max_steps'] = f"Invalid int value: {err}"
+        return job
+
+    def parse_argument(self, spec: str|Mapping[str, Any], /) -> Argument:
+        "Parse an argument string or spec, sharing the parsers across jobs."
+        if isinstance(spec, str):
+            return Argument.from_argstr(spec)
+        spec = dmerged(self.payload_defaults['argument'], spec)
+        key = spec['notation'], tuple(map(tuple, spec['predicates']))
+        try:
+            parser = self.parsers[key]
+        except KeyError:
+            preds = Predicates(map(TriCoords.make, spec['predicates']))
+            parser = self.parsers[key] = Parser(
+                notation=Notation[spec['notation']], predicates=preds)
+        return Argument(parser(spec['conclusion']), map(parser, spec['premises']))
+
+    def setup(self, *args, **kw):
+        super().setup(*args, **kw)
+        self.parsers = {}
+
+    def batch(self, jobs: list[dict[str, Any]], pw: writers.TabWriter, deadline: float, /, *,
+        attachments: bool = False) -> Iterator[dict[str, Any]]:
+        """Generate the events. This runs after the handler returns, so it does
+        not read the request state of the view."""
+        pool = self.app.proof_pool
+        cache = self.app.proof_cache
+        metrics = self.app.metrics if self.config['metrics_enabled'] else None
+        maxtimeout = self.config['maxtimeout']
+        queue = deque()
+        inflight: dict[Future, dict[str, Any]] = {}
+        count = 0
+        def event(job: dict[str, Any], tab = None, err: Exception|None = None, status: int = 200):
+            nonlocal count
+            count += 1
+            data = dict(event='result', index=job['index'], status=status)
+            if err is not None:
+                data.update(error=type(err).__name__, message=str(err))
+            elif job['errors']:
+                data.update(status=400, errors=job['errors'])
+            else:
+                data['result'] = self.get_result(tab, pw, attachments=attachments)
+            return data
+        def run(job: dict[str, Any]) -> dict[str, Any]:
+            "Build a job in this thread."
+            tab = Tableau(job['logic'], job['argument'], **job['opts'])
+            try:
+                tab.build()
+            except ProofTimeoutError as err:
+                return event(job, err=err, status=408)
+            except Exception as err:
+                return event(job, err=err, status=500)
+            cache.put(tab)
+            return event(job, tab)
+        with StopWatch() as timer:
+            for job in jobs:
+                if job['errors']:
+                    yield event(job)
+                    continue
+                tab = cache.get(job['logic'], job['argument'], job['opts'])
+                if tab is not None:
+                    if metrics:
+                        metrics.proofs_cache_hits_count(
+                            tab.logic.Meta.name, tab.stats['result']).inc()
+                    yield event(job, tab)
+                    continue
+                queue.append(job)
+            try:
+                while queue or inflight:
+                    left = deadline - time.perf_counter()
+                    if left <= 0:
+                        break
+                    if pool is None:
+                        job = queue.popleft()
+                        job['opts']['build_timeout'] = min(maxtimeout, max(1, int(left * 1000)))
+                        yield run(job)
+                        continue
+                    while queue and len(inflight) < pool.size:
+                        job = queue[0]
+                        job['opts']['build_timeout'] = min(maxtimeout, max(1, int(left * 1000)))
+                        try:
+                            future = pool.submit(job['logic'], job['argument'], job['opts'])
+                        except PoolFull:
+                            break
+                        inflight[future] = queue.popleft()
+                    if not inflight:
+                        time.sleep(min(left, pool.poll))
+                        continue
+                    done, _ = wait(inflight, min(left, pool.poll), FIRST_COMPLETED)
+                    for future in done:
+                        job = inflight.pop(future)
+                        try:
+                            tab = pool.result(future)
+                        except ProofTimeoutError as err:
+                            yield event(job, err=err, status=408)
+                        except BrokenExecutor as err:
+                            yield event(job, err=err, status=503)
+                        except Exception as err:
+                            yield event(job, err=err, status=500)
+                        else:
+                            cache.put(tab)
+                            yield event(job, tab)
+            finally:
+                for future in inflight:
+                    future.cancel()
+            err = ProofTimeoutError('Batch deadline exceeded')
+            for job in sorted((*queue, *inflight.values()), key=lambda job: job['index']):
+                yield event(job, err=err, status=408)
+        yield dict(event='end', count=count, elapsed_ms=timer.elapsed_ms())
@@ -34,10 +34,13 @@ from ... import examples, logics, package
 from ...lang import (Argument, LexType, LexWriter, Notation, Operator,
                      ParseTable, Predicate, Quantifier)
 from ...logics import LogicType
-from ...proof import writers
+from ...proof import serial, writers
+from ...proof.cache import ProofCache
 from ...tools import inflect
 from ...tools.events import EventEmitter
 from .. import EnvConfig, StaticResource, Wevent, api
+from ..cache import ResponseCache
+from ..pool import ProofPool
 from ..util import cp_staticdir_conf, get_logger, tojson
 from . import views
 
@@ -78,6 +81,15 @@ class App(EventEmitter):
     metrics: AppMetrics
     "Prometheus metrics helper."
 
+    proof_cache: ProofCache
+    "Finished proofs cache."
+
+    proof_pool: ProofPool|None
+    "Worker process pool for proofs, if enabled."
+
+    response_cache: ResponseCache|None
+    "Rendered response cache, if enabled."
+
     logger: logging.Logger
     "Logger instance."
 
@@ -152,6 +164,18 @@ class App(EventEmitter):
 
             from ..metrics import AppMetrics
             self.metrics = AppMetrics(self.config, CollectorRegistry())
+        self.proof_cache = ProofCache(self.config['proof_cache_size'],
+            path = self.config['proof_cache_path'],
+            codec = serial)
+        if self.config['proof_pool_size']:
+            self.proof_pool = ProofPool(self.config,
+                metrics = self.metrics if self.config['metrics_enabled'] else None)
+        else:
+            self.proof_pool = None
+        if self.config['response_cache_bytes']:
+            self.response_cache = ResponseCache(self.config['response_cache_bytes'])
+        else:
+            self.response_cache = None
         self.template_cache = {}
         self.jinja = jinja2.Environment(
             loader = jinja2.FileSystemLoader(self.config['templates_path']))
@@ -188,6 +212,9 @@ class App(EventEmitter):
             self.mailroom.start()
         if self.config['metrics_enabled']:
             self._start_metrics_server()
+        if self.proof_pool is not None:
+            self.proof_pool.start()
+            cherrypy.engine.subscribe('stop', self.proof_pool.shutdown)
         cherrypy.quickstart(self, '/', self.cp_config)
 
     def before_dispatch(self, path):
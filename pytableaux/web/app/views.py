@@ -27,12 +27,13 @@ from types import MappingProxyType as MapProxy
 from typing import Any, Mapping
 
 import simplejson as json
+from cherrypy import HTTPError
 
 from ... import package
 from ...lang import LexWriter, Notation
 from .. import api
 from ..mail import is_valid_email
-from ..util import tojson
+from ..util import fix_uri_req_data, tojson
 from ..views import FormView, JsonView
 
 __all__ = (
@@ -62,6 +63,23 @@ class ProveView(FormView):
     def api(self) -> api.ProveView:
         return self.app.api.prove
 
+    def __call__(self, *args, **kw):
+        return self.respond_cached(self.cache_key(*args, **kw), super().__call__, *args, **kw)
+
+    def cache_key(self, *args, **kw) -> Any:
+        "The normalized request for the response cache, or None."
+        if self.is_debug or args:
+            return
+        form = dict(self.form_defaults)
+        form.update(fix_uri_req_data(kw))
+        try:
+            form['api-json'] = json.loads(form['api-json'])
+        except KeyError:
+            pass
+        except Exception:
+            return
+        return type(self).__qualname__, self.request.method, form
+
     @property
     def errors(self) -> dict:
         return self.api.errors
@@ -117,6 +135,8 @@ class ProveView(FormView):
         self.api.setup(self.api_payload)
         try:
             self.resp_data = self.api.POST()
+        except HTTPError:
+            raise
         except Exception as err:
             self.errors['tableau'] = err
         if not self.is_proof:
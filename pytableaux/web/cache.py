@@ -0,0 +1,168 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.web.cache
+--------------------
+
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from ..errors import check
+from .util import tojson
+
+__all__ = (
+    'CachedResponse',
+    'ResponseCache')
+
+class CachedResponse(NamedTuple):
+    'A rendered response body.'
+
+    body: bytes
+    "The body."
+
+    gzipped: bytes
+    "The gzip compressed body."
+
+    etag: str
+    "The strong entity tag, with quotes."
+
+    content_type: str|None
+    "The content type header."
+
+    @property
+    def size(self) -> int:
+        "The number of bytes held."
+        return len(self.body) + len(self.gzipped)
+
+class ResponseCache:
+    """Rendered response bodies keyed by the normalized request. Holds at most
+    `maxbytes` of plain and compressed bodies, evicting the least recently
+    used.
+
+    The cache is thread safe.
+    """
+
+    compresslevel: int = 6
+    "The gzip compression level."
+
+    maxbytes: int
+    "The maximum number of bytes to hold."
+
+    size: int
+    "The number of bytes held."
+
+    hits: int
+    "The number of lookups found."
+
+    misses: int
+    "The number of lookups not found."
+
+    __slots__ = ('_data', '_lock', 'hits', 'maxbytes', 'misses', 'size')
+
+    def __init__(self, maxbytes: int, /):
+        """
+        Args:
+            maxbytes (int): The maximum number of bytes to hold.
+        """
+        self.maxbytes = check.inst(maxbytes, int)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data: Any, /) -> str:
+        """Compute the cache key from JSON-able request data. Mappings are
+        compared with sorted keys.
+
+        Args:
+            data: The request data.
+
+        Returns:
+            str: The key.
+        """
+        spec = tojson(data, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, /) -> CachedResponse|None:
+        """Get the cached response, if any.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            The response or ``None``.
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: str, body: bytes, content_type: str|None = None, /) -> CachedResponse:
+        """Compress and add a response body. A body larger than `maxbytes` is
+        returned but not added.
+
+        Args:
+            key (str): The key.
+            body (bytes): The body.
+            content_type (str): The content type header.
+
+        Returns:
+            The response.
+        """
+        entry = CachedResponse(body,
+            gzip.compress(body, self.compresslevel, mtime=0),
+            '"%s"' % hashlib.sha256(body).hexdigest()[:32],
+            content_type)
+        with self._lock:
+            if entry.size > self.maxbytes:
+                return entry
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._data[key] = entry
+            self.size += entry.size
+            while self.size > self.maxbytes:
+                _, old = self._data.popitem(last=False)
+                self.size -= old.size
+        return entry
+
+    def clear(self) -> None:
+        "Clear the cache."
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} size:{self.size}/{self.maxbytes} '
+            f'len:{len(self)} hits:{self.hits} misses:{self.misses}>')
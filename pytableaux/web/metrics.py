@@ -75,6 +75,10 @@ class AppMetrics(MapCover[str, MetricType], abcs.Abc):
     def proofs_completed_count() -> pm.Counter:
         return pm.Counter, 'total proofs completed', ['logic', 'result']
 
+    @mwrap
+    def proofs_cache_hits_count() -> pm.Counter:
+        return pm.Counter, 'total proofs served from the proof cache', ['logic', 'result']
+
     @mwrap
     def proofs_inprogress_count() -> pm.Gauge:
         return pm.Gauge, 'total proofs in progress', ['logic']
@@ -83,6 +87,26 @@ class AppMetrics(MapCover[str, MetricType], abcs.Abc):
     def proofs_execution_time() -> pm.Summary:
         return pm.Summary, 'total proof execution time', ['logic']
 
+    @mwrap
+    def proofs_timeout_overrun_time() -> pm.Summary:
+        return pm.Summary, 'time proofs ran past the timeout', ['logic']
+
+    @mwrap
+    def response_cache_hits_count() -> pm.Counter:
+        return pm.Counter, 'total response cache hits', ['view']
+
+    @mwrap
+    def response_cache_misses_count() -> pm.Counter:
+        return pm.Counter, 'total response cache misses', ['view']
+
+    @mwrap
+    def proofs_queue_depth() -> pm.Gauge:
+        return pm.Gauge, 'proofs submitted to the pool and not finished', []
+
+    @mwrap
+    def proofs_queue_wait_time() -> pm.Summary:
+        return pm.Summary, 'time proofs wait for a pool worker', []
+
     # ------------------------------------------------------------------
 
     def __init__(self, config, registry: CollectorRegistry = None, /):
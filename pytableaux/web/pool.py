@@ -0,0 +1,259 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+pytableaux.web.pool
+-------------------
+
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import MappingProxyType as MapProxy
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+from ..errors import Emsg
+from ..lang import Argument
+from ..logics import registry
+from ..proof import Tableau, serial
+from . import get_logger
+
+if TYPE_CHECKING:
+    from .metrics import AppMetrics
+
+__all__ = (
+    'PoolFull',
+    'ProofPool')
+
+class PoolFull(Exception):
+    "Raised when the pool has no room for another job."
+
+    retry_after: int
+    "The suggested number of seconds to wait before retrying."
+
+    def __init__(self, retry_after: int, /):
+        super().__init__(f'Proof queue is full, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+class ProofPool:
+    """Build proofs in a pool of worker processes, so that long proofs do not
+    hold the GIL of the web server. At most `proof_pool_size` proofs run at
+    once, and at most `proof_queue_size` more wait for a worker. The finished
+    tableaux are returned as :class:`~pytableaux.proof.serial.TableauRecord`
+    instances.
+
+    If `proof_kill_grace` is set, a proof that runs that many milliseconds past
+    its `build_timeout` is stopped by terminating the workers. The other running
+    jobs then fail with ``BrokenProcessPool``, and new workers are started for
+    the next job.
+    """
+
+    config: Mapping[str, Any]
+    "Instance config."
+
+    logger: logging.Logger
+    "Logger instance."
+
+    metrics: AppMetrics|None
+    "The metrics, if enabled."
+
+    size: int
+    "The number of worker processes."
+
+    maxqueue: int
+    "The number of jobs that can wait for a worker."
+
+    grace: int
+    "The milliseconds past the timeout before the workers are killed, or 0."
+
+    poll: float = 0.1
+    "The seconds between checks for cancellation while waiting on a job."
+
+    pending: int
+    "The number of jobs submitted and not finished."
+
+    _avg_secs: float
+    _executor: ProcessPoolExecutor|None
+    _lock: threading.Lock
+
+    def __init__(self, config: Mapping[str, Any], /, *, metrics: AppMetrics|None = None):
+        self.config = MapProxy(config)
+        self.logger = get_logger(self, self.config)
+        self.metrics = metrics
+        self.size = config['proof_pool_size']
+        self.maxqueue = config['proof_queue_size']
+        self.grace = config['proof_kill_grace']
+        self.pending = 0
+        self._avg_secs = 1.0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        "Whether the worker processes are started."
+        return self._executor is not None
+
+    def start(self):
+        "Start the worker processes."
+        with self._lock:
+            self._start()
+
+    def shutdown(self):
+        "Cancel the waiting jobs, and stop the worker processes."
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def kill(self):
+        "Terminate the worker processes, failing the running and waiting jobs."
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self.logger.warning('Terminating proof pool workers')
+            # The executor has no public way to stop a running job. The
+            # workers are killed, since a forked worker may have inherited a
+            # SIGTERM handler from the server.
+            processes = getattr(executor, '_processes', None) or {}
+            if not processes:
+                self.logger.warning(
+                    'Cannot find the proof pool worker processes, '
+                    'running jobs will finish before the workers stop')
+            for process in tuple(processes.values()):
+                process.kill()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, logic: Any, argument: Argument, opts: Mapping[str, Any], /) -> Future[tuple[float, float, bytes]]:
+        """Submit a proof to the pool.
+
+        Args:
+            logic: The logic name or module.
+            argument (Argument): The argument.
+            opts (Mapping): The tableau options.
+
+        Returns:
+            A future for the result, which is read with :meth:`result`.
+
+        Raises:
+            PoolFull: if the queue is full.
+        """
+        name = registry(logic).Meta.name
+        with self._lock:
+            if self.pending >= self.size + self.maxqueue:
+                raise PoolFull(self._retry_after())
+            submitted = time.time()
+            future = self._start().submit(build, name, argument, dict(opts))
+            self.pending += 1
+        if self.metrics:
+            self.metrics.proofs_queue_depth().inc()
+        future.add_done_callback(functools.partial(self._done, submitted))
+        return future
+
+    @staticmethod
+    def result(future: Future, timeout: float|None = None, /) -> serial.TableauRecord:
+        """Get the tableau record from a future returned by :meth:`submit`.
+
+        Args:
+            future (Future): The future.
+            timeout (float): The seconds to wait, default is no limit.
+
+        Returns:
+            The finished tableau record.
+        """
+        return serial.loads(future.result(timeout)[2])
+
+    def build(self, logic: Any, argument: Argument, opts: Mapping[str, Any], /, *,
+        cancel: Callable[[], bool]|None = None) -> serial.TableauRecord:
+        """Submit a proof to the pool, and wait for the result.
+
+        Args:
+            logic: The logic name or module.
+            argument (Argument): The argument.
+            opts (Mapping): The tableau options.
+
+        Keyword Args:
+            cancel: Optional function checked while waiting. If it returns
+                true, the job is cancelled if it has not been handed to a
+                worker, and
+                ``CancelledError`` is raised.
+
+        Returns:
+            The finished tableau record.
+
+        Raises:
+            PoolFull: if the queue is full.
+            CancelledError: if the job was cancelled.
+            ProofTimeoutError: if the job timed out, or was killed.
+        """
+        future = self.submit(logic, argument, opts)
+        timeout = opts.get('build_timeout')
+        if self.grace and timeout is not None and timeout > 0:
+            limit = (timeout + self.grace) / 1000
+        else:
+            limit = None
+        started = None
+        while True:
+            try:
+                return self.result(future, self.poll)
+            except FutureTimeoutError:
+                if cancel is not None and cancel():
+                    future.cancel()
+                    raise CancelledError() from None
+                if limit is None or not future.running():
+                    continue
+                if started is None:
+                    started = time.perf_counter()
+                elif time.perf_counter() - started > limit:
+                    self.kill()
+                    raise Emsg.Timeout(timeout) from None
+
+    def _start(self) -> ProcessPoolExecutor:
+        # Called with the lock held.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.size)
+            self.logger.info(f'Started proof pool with {self.size} workers')
+        return self._executor
+
+    def _done(self, submitted: float, future: Future, /):
+        with self._lock:
+            self.pending -= 1
+        if self.metrics:
+            self.metrics.proofs_queue_depth().dec()
+        if future.cancelled() or future.exception() is not None:
+            return
+        started, finished, _ = future.result()
+        self._avg_secs += (finished - started - self._avg_secs) / 8
+        if self.metrics:
+            self.metrics.proofs_queue_wait_time().observe(max(0.0, started - submitted))
+
+    def _retry_after(self) -> int:
+        # The time for the queue to drain, by the running average build time.
+        return max(1, math.ceil(self._avg_secs * self.pending / max(1, self.size)))
+
+def build(logic: str, argument: Argument, opts: dict[str, Any], /) -> tuple[float, float, bytes]:
+    """Build a proof in a worker process.
+
+    Returns:
+        The start and finish times, and the serialized tableau.
+    """
+    started = time.time()
+    data = serial.dumps(Tableau(logic, argument, **opts).build())
+    return started, time.time(), data
@@ -73,6 +73,20 @@ def is_valid_email(value: str) -> bool:
     "Whether a string is a valid email address."
     return re_email.fullmatch(value) is not None
 
+def etag_matches(header: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header value matches the entity tag, by
+    the weak comparison of RFC 9110. The value is either ``*``, or a
+    comma-separated list of tags."""
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag.removeprefix('W/'):
+            return True
+    return False
+
 def cp_staticdir_conf(path, index='index.html'):
     conf = {
         'tools.staticdir.on': True,
@@ -21,7 +21,10 @@ pytableaux.web
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Mapping
+import select
+import socket
+import ssl
+from typing import TYPE_CHECKING, Any, Callable, Mapping
 
 import cherrypy
 import cherrypy._cpdispatch
@@ -29,7 +32,7 @@ from cherrypy import HTTPError, NotFound
 from cherrypy._cprequest import Request, Response
 
 from ..tools import EMPTY_MAP, PathedDict, dmerged
-from .util import errstr, fix_uri_req_data
+from .util import errstr, etag_matches, fix_uri_req_data
 
 if TYPE_CHECKING:
     from .app import App
@@ -79,7 +82,33 @@ class View:
     @property
     def logger(self) -> logging.Logger:
         return self.app.logger
-    
+
+    def is_disconnected(self) -> bool:
+        """Whether the client closed the connection. Returns False if the
+        socket cannot be found from the request, or is wrapped in TLS, since
+        the encrypted stream cannot be peeked without consuming it.
+        """
+        sock = self._client_socket()
+        if sock is None or isinstance(sock, ssl.SSLSocket):
+            return False
+        try:
+            readable, _, _ = select.select((sock,), (), (), 0)
+            # A readable socket with no data has been closed.
+            return bool(readable) and not sock.recv(1, socket.MSG_PEEK)
+        except (OSError, ValueError):
+            return True
+
+    def _client_socket(self) -> socket.socket|None:
+        """The client socket of the request, found through the private
+        attributes of the cheroot request body reader, or None if another
+        server or adapter is in use."""
+        try:
+            sock = self.request.wsgi_environ['wsgi.input'].rfile.raw._sock
+        except (AttributeError, KeyError, TypeError):
+            return None
+        if isinstance(sock, socket.socket):
+            return sock
+
     def __call__(self, *args, **kw):
         self.args = args
         self.errors = {}
@@ -90,6 +119,49 @@ class View:
         self.setup()
         return handler(*args)
 
+    def respond_cached(self, keydata: Any, call: Callable, /, *args, **kw):
+        """Get the response body from the app response cache, keyed by
+        `keydata`, or from `call(*args, **kw)`, caching it if the status is 200.
+        If `keydata` is None, or the cache is disabled, `call` is returned as is.
+
+        Sets the ``ETag`` header, and responds 304 if it matches
+        ``If-None-Match``. If the client accepts gzip, sends the compressed body.
+        """
+        cache = self.app.response_cache
+        if cache is None or keydata is None:
+            return call(*args, **kw)
+        metrics = self.app.metrics if self.config['metrics_enabled'] else None
+        name = type(self).__qualname__
+        key = cache.key(keydata)
+        entry = cache.get(key)
+        if entry is None:
+            if metrics:
+                metrics.response_cache_misses_count(name).inc()
+            body = call(*args, **kw)
+            if self.errors or str(self.status or 200)[:3] != '200':
+                return body
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            entry = cache.put(key, body, self.response.headers.get('Content-Type'))
+        else:
+            self.status = 200
+            if metrics:
+                metrics.response_cache_hits_count(name).inc()
+        headers = self.response.headers
+        if entry.content_type:
+            headers['Content-Type'] = entry.content_type
+        headers['ETag'] = entry.etag
+        headers['Vary'] = 'Accept-Encoding'
+        if etag_matches(self.request.headers.get('If-None-Match', ''), entry.etag):
+            self.status = 304
+            return b''
+        if 'gzip' in self.request.headers.get('Accept-Encoding', ''):
+            headers['Content-Encoding'] = 'gzip'
+            # Tells the gzip tool not to compress again.
+            self.request.cached = True
+            return entry.gzipped
+        return entry.body
+
     def get_handler(self, *args):
         if not (self.minargs <= len(args) <= self.maxargs):
             raise NotFound()
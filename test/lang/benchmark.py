@@ -0,0 +1,193 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux.lang.benchmark
+"""
+Benchmark the parsers on the sentences of generated families of arguments,
+written in each notation, and compare the results to a baseline::
+
+    python -m test.lang.benchmark run -o baseline.json
+    python -m test.lang.benchmark run -o current.json
+    python -m test.lang.benchmark compare baseline.json current.json
+"""
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import sys
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+from typing import Any
+
+from pytableaux.lang import LexWriter, Notation, Parser
+from pytableaux.synthetic import families
+
+from ..logics.benchmark import compare
+from ..utils import readlist
+
+logger = logging.getLogger('benchmark')
+
+DEFAULT_FAMILIES = ('disjunctions', 'cnf', 'syllogisms', 'modals')
+
+@dataclass(kw_only=True, slots=True)
+class Options:
+    notations: tuple[Notation, ...]
+    families: tuple[str, ...]
+    sizes: tuple[int, ...]
+    repeat: int
+    output: str|None
+
+@dataclass(kw_only=True, slots=True)
+class CompareOptions:
+    baseline: str
+    current: str
+    threshold: float
+    floor: float
+
+def parser():
+    parser = ArgumentParser(description='Benchmark parse time, and compare to a baseline')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='Run the benchmarks')
+    arg = run.add_argument
+    arg(
+        '--notation', '--notations', '-n',
+        dest='notations',
+        type=lambda opt: tuple(map(Notation.__getitem__, readlist(opt))),
+        default=tuple(Notation),
+        help='Comma-separated notations to run, default is all.')
+    arg(
+        '--family', '--families', '-f',
+        dest='families',
+        type=lambda opt: tuple(readlist(opt)),
+        default=DEFAULT_FAMILIES,
+        help=(
+            f'Comma-separated generated families, default is {",".join(DEFAULT_FAMILIES)}. '
+            f'Available: {",".join(families)}'))
+    arg(
+        '--sizes',
+        dest='sizes',
+        type=lambda opt: tuple(map(int, readlist(opt))),
+        default=(16, 64, 256),
+        help='Comma-separated sizes of the generated families, default is 16,64,256')
+    arg(
+        '--repeat', '-r',
+        dest='repeat',
+        type=int,
+        default=5,
+        help='The number of timed runs, of which the fastest is kept, default is 5')
+    arg(
+        '--output', '-o',
+        dest='output',
+        default=None,
+        help='The JSON file to write, default is stdout')
+    compare = commands.add_parser('compare', help='Compare results to a baseline')
+    arg = compare.add_argument
+    arg('baseline', help='The baseline JSON file')
+    arg('current', help='The current JSON file')
+    arg(
+        '--threshold', '-t',
+        dest='threshold',
+        type=float,
+        default=0.2,
+        help='The relative increase counted as a regression, default is 0.2')
+    arg(
+        '--floor',
+        dest='floor',
+        type=float,
+        default=1.0,
+        help='The absolute increase in milliseconds below which time is ignored, default is 1.0')
+    return parser
+
+class Runner:
+
+    def __init__(self, opts: Options):
+        self.opts = opts
+
+    def cases(self):
+        opts = self.opts
+        for name in opts.families:
+            for size in opts.sizes:
+                for notation in opts.notations:
+                    yield f'{name}/{size}/{notation.name}', notation, self.inputs(name, size, notation)
+
+    def inputs(self, name: str, size: int, notation: Notation) -> list[str]:
+        # The argument is not kept, so the parsed sentences are not interned
+        # already.
+        argument = families[name](size)
+        lw = LexWriter(notation, 'text')
+        return [lw(s) for s in (*argument.premises, argument.conclusion)]
+
+    def run(self) -> dict[str, Any]:
+        results = {}
+        for key, notation, inputs in self.cases():
+            results[key] = self.measure(notation, inputs)
+        logger.info(f'Ran {len(results)} benchmarks')
+        return dict(
+            meta = dict(
+                created  = datetime.now().isoformat(timespec='seconds'),
+                python   = platform.python_version(),
+                platform = platform.platform(),
+                repeat   = self.opts.repeat),
+            results = results)
+
+    def measure(self, notation: Notation, inputs: list[str]) -> dict[str, Any]:
+        times = []
+        for _ in range(max(1, self.opts.repeat)):
+            # A new parser each time, so auto predicates are created each run.
+            parse = Parser(notation)
+            start = perf_counter()
+            for input in inputs:
+                parse(input)
+            times.append((perf_counter() - start) * 1000)
+        wall_ms = min(times)
+        chars = sum(map(len, inputs))
+        return dict(
+            result   = 'Parsed',
+            inputs   = len(inputs),
+            chars    = chars,
+            wall_ms  = round(wall_ms, 3),
+            chars_per_sec = round(chars / wall_ms * 1000) if wall_ms else None)
+
+def main(*args):
+    ns = vars(parser().parse_args(args))
+    logging.basicConfig(level=logging.INFO)
+    if ns.pop('command') == 'compare':
+        opts = CompareOptions(**ns)
+        with open(opts.baseline) as file:
+            baseline = json.load(file)
+        with open(opts.current) as file:
+            current = json.load(file)
+        regressions = compare(baseline, current, opts.threshold, opts.floor)
+        for key, metric, a, b in regressions:
+            print(f'{key}: {metric} {a} -> {b}')
+        logger.info(f'{len(regressions)} regressions')
+        return int(bool(regressions))
+    opts = Options(**ns)
+    data = Runner(opts).run()
+    if opts.output is None:
+        json.dump(data, sys.stdout, indent=2)
+    else:
+        with open(opts.output, 'w') as file:
+            json.dump(data, file, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
@@ -19,6 +19,7 @@
 # pytableaux.lang.lex tests
 import operator as opr
 import pickle
+from concurrent.futures import ThreadPoolExecutor
 from itertools import product
 from typing import cast
 
@@ -341,6 +342,17 @@ class TestOperated(BaseCase):
         s2 = ~s1
         self.assertNotIn(s2, s2)
 
+    def test_signature(self):
+        self.assertEqual(self.p('Kab').signature,
+            (Operated, Operator.Conjunction, None, None))
+        self.assertEqual(self.p('NVxFx').signature,
+            (Operated, Operator.Negation, Quantified, Quantifier.Universal))
+        self.assertEqual(self.p('NFm').signature,
+            (Operated, Operator.Negation, Predicated, Predicate.first()))
+        self.assertEqual(self.p('Na').signature,
+            (Operated, Operator.Negation, Atomic, None))
+        self.assertEqual(self.p('a').signature, (Atomic, None, None, None))
+
 
 class TestBiCoords(BaseCase):
 
@@ -572,18 +584,49 @@ class TestClasses(BaseCase):
 
 class TestCache(BaseCase):
 
-    def test_cache_size_stays_at_1(self):
+    def test_equal_sentences_are_identical(self):
+        a, b = Atomic.gen(2)
+        s1 = Operator.Conjunction(a, ~b)
+        s2 = Operator.Conjunction(Atomic(0, 0), Operator.Negation(Atomic(1, 0)))
+        self.assertIs(s1, s2)
+        self.assertEqual(s1.id, s2.id)
+        self.assertIs(Sentence(s1.ident), s1)
+        self.assertIs(pickle.loads(pickle.dumps(s1)), s1)
+
+    def test_distinct_sentences_have_distinct_ids(self):
+        a, b = Atomic.gen(2)
+        self.assertNotEqual((a & b).id, (b & a).id)
+        self.assertNotEqual(a.id, (~a).id)
+
+    def test_unreferenced_items_are_released(self):
+        import gc
         cache = LexicalAbcMeta.__call__._cache
-        old = cache.queue, cache.idx, cache.rev
-        try:
-            cache.__init__(maxlen=1)
-            s1 = Atomic.first()
-            self.assertEqual(len(cache.queue), 1)
-            s2 = ~s1
-            self.assertEqual(len(cache.queue), 1)
-            self.assertEqual(cache.queue[0], s2)
-        finally:
-            cache.queue, cache.idx, cache.rev = old
+        a = Atomic(4, 999)
+        s = ~~a
+        sid = s.id
+        size = len(cache)
+        del s
+        gc.collect()
+        self.assertLess(len(cache), size)
+        self.assertNotEqual((~~a).id, sid)
+
+    def test_concurrent_interns_are_identical(self):
+        def build(_):
+            return [Operator.Conjunction(Atomic(i, 998), ~Atomic(i, 997)) for i in range(5)]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(build, range(32)))
+        for res in results:
+            for s1, s2 in zip(res, results[0]):
+                self.assertIs(s1, s2)
+
+    def test_deep_sentence_compare(self):
+        atoms = tuple(Atomic.gen(5))
+        s1 = s2 = atoms[0]
+        for i in range(2000):
+            s1 = s1 & atoms[i % 5]
+            s2 = s2 & atoms[(i + 1) % 5 if i == 1000 else i % 5]
+        self.assertNotEqual(s1, s2)
+        self.assertEqual(s1 < s2, s1.sort_tuple < s2.sort_tuple)
 
 class TestLexType(BaseCase):
 
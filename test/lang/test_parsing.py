@@ -120,6 +120,24 @@ class TestParsers(BaseCase):
         with self.assertRaises(ParseError):
             p('A % B,')
 
+    def test_deeply_nested(self):
+        n = 5000
+        s = std('(' * n + 'A' + ' & B)' * n)
+        self.assertEqual(s.operator, 'Conjunction')
+        self.assertEqual(s.rhs, Atomic(1, 0))
+        s = std('~' * n + 'A')
+        self.assertEqual(s.operator, 'Negation')
+
+    def test_error_messages(self):
+        with raises(ParseError, match=r"^Unexpected Marking.paren_open symbol '\(' at position 0$"):
+            std('(A & B')
+        with raises(ParseError, match=r"^Unexpected <enum 'Operator'> symbol '%' at position 2$"):
+            std('A % B,')
+        with raises(ParseError, match=r"^Unexpected end of input at position 2\.$"):
+            pol('Ka')
+        with raises(ParseError, match=r"^Unused bound variable \(0, 0\) near position 4$"):
+            pol('VxFm')
+
 class TestPolish(BaseCase):
 
     def test_parse_conjunction(self):
@@ -160,6 +178,21 @@ class TestPolish(BaseCase):
         res = a.__repr__()
         self.assertTrue('(0, 0)' in res or 'TestArg' in res)
     
+    def test_deeply_nested(self):
+        n = 5000
+        s = pol('N' * n + 'K' * n + 'a' * (n + 1))
+        self.assertEqual(s.operator, 'Negation')
+
+    def test_tokenize(self):
+        table = ParseTable.fetch('polish')
+        self.assertEqual(table.tokenize('Na1 2#'), [
+            ((Operator, Operator.Negation), 0),
+            ((Atomic, 0), 1),
+            ((Marking.digit, 1), 2),
+            ((Marking.digit, 2), 4),
+            ((None, None), 5)])
+        self.assertEqual(pol('Na1 2'), ~Atomic(0, 12))
+
     def test_subscript_non_standard_digit_char(self):
         table = ParseTable(dict(
             notation = Notation.polish,
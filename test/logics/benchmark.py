@@ -0,0 +1,254 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux.logics.benchmark
+"""
+Benchmark the logics against the example arguments, and generated families
+of arguments of increasing size, and compare the results to a baseline::
+
+    python -m test.logics.benchmark run -o baseline.json
+    python -m test.logics.benchmark run -o current.json
+    python -m test.logics.benchmark compare baseline.json current.json
+"""
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+from typing import Any
+
+from pytableaux.errors import ProofTimeoutError
+from pytableaux.examples import arguments as arguments
+from pytableaux.lang import Argument
+from pytableaux.logics import LogicType, registry
+from pytableaux.proof import Tableau
+from pytableaux.synthetic import families
+
+from ..utils import logicopt, readlist
+
+logger = logging.getLogger('benchmark')
+
+DEFAULT_FAMILIES = ('disjunctions', 'syllogisms', 'modals')
+
+@dataclass(kw_only=True, slots=True)
+class Options:
+    logics: tuple[LogicType, ...]
+    arguments: tuple[Argument, ...]
+    families: tuple[str, ...]
+    sizes: tuple[int, ...]
+    repeat: int
+    timeout: int|None
+    output: str|None
+
+@dataclass(kw_only=True, slots=True)
+class CompareOptions:
+    baseline: str
+    current: str
+    threshold: float
+    floor: float
+
+def parser():
+    parser = ArgumentParser(description='Benchmark proof time & memory, and compare to a baseline')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='Run the benchmarks')
+    arg = run.add_argument
+    arg(
+        '--logic', '--logics', '-l',
+        dest='logics',
+        type=logicopt,
+        default=tuple(map(registry, sorted(registry.all()))),
+        help=(
+            'Comma-separated logics to run, default is all. '
+            'To specify an exclusion list, prefix the option with ^.'))
+    arg(
+        '--argument', '--arguments', '-a',
+        dest='arguments',
+        type=lambda opt: tuple(Argument(arguments.get(a, a)) for a in readlist(opt)),
+        default=tuple(arguments.values()),
+        help='Comma-separated arguments to run, default is all. Can be example name or argstr.')
+    arg(
+        '--family', '--families', '-f',
+        dest='families',
+        type=lambda opt: tuple(readlist(opt)),
+        default=DEFAULT_FAMILIES,
+        help=(
+            f'Comma-separated generated families, default is {",".join(DEFAULT_FAMILIES)}. '
+            f'Available: {",".join(families)}'))
+    arg(
+        '--sizes',
+        dest='sizes',
+        type=lambda opt: tuple(map(int, readlist(opt))),
+        default=(2, 4, 8),
+        help='Comma-separated sizes of the generated families, default is 2,4,8')
+    arg(
+        '--repeat', '-r',
+        dest='repeat',
+        type=int,
+        default=3,
+        help='The number of timed runs, of which the fastest is kept, default is 3')
+    arg(
+        '--timeout',
+        dest='timeout',
+        type=int,
+        default=10000,
+        help='The build timeout in milliseconds, default is 10000')
+    arg(
+        '--output', '-o',
+        dest='output',
+        default=None,
+        help='The JSON file to write, default is stdout')
+    compare = commands.add_parser('compare', help='Compare results to a baseline')
+    arg = compare.add_argument
+    arg('baseline', help='The baseline JSON file')
+    arg('current', help='The current JSON file')
+    arg(
+        '--threshold', '-t',
+        dest='threshold',
+        type=float,
+        default=0.2,
+        help='The relative increase counted as a regression, default is 0.2')
+    arg(
+        '--floor',
+        dest='floor',
+        type=float,
+        default=1.0,
+        help='The absolute increase in milliseconds below which time is ignored, default is 1.0')
+    return parser
+
+class Runner:
+
+    def __init__(self, opts: Options):
+        self.opts = opts
+
+    def cases(self):
+        opts = self.opts
+        args = list(opts.arguments)
+        for name in opts.families:
+            args.extend(map(families[name], opts.sizes))
+        for logic in opts.logics:
+            for argument in args:
+                yield logic, argument
+
+    def run(self) -> dict[str, Any]:
+        results = {}
+        for logic, argument in self.cases():
+            result = self.measure(logic, argument)
+            results[f'{result["logic"]}/{result["argument"]}'] = result
+        logger.info(f'Ran {len(results)} benchmarks')
+        return dict(
+            meta = dict(
+                created  = datetime.now().isoformat(timespec='seconds'),
+                python   = platform.python_version(),
+                platform = platform.platform(),
+                repeat   = self.opts.repeat),
+            results = results)
+
+    def build(self, logic: LogicType, argument: Argument) -> Tableau|None:
+        try:
+            return Tableau(logic, argument, build_timeout=self.opts.timeout).build()
+        except ProofTimeoutError:
+            return None
+
+    def measure(self, logic: LogicType, argument: Argument) -> dict[str, Any]:
+        times = []
+        for _ in range(max(1, self.opts.repeat)):
+            start = perf_counter()
+            tab = self.build(logic, argument)
+            times.append((perf_counter() - start) * 1000)
+            if tab is None:
+                break
+        tracemalloc.start()
+        try:
+            self.build(logic, argument)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        wall_ms = min(times)
+        result = dict(
+            logic    = logic.Meta.name,
+            argument = argument.title or argument.argstr(),
+            result   = 'Timeout',
+            wall_ms  = round(wall_ms, 3),
+            peak_kb  = round(peak / 1024, 1))
+        if tab is not None:
+            nodes = tab.stats['distinct_nodes']
+            result.update(
+                result   = tab.stats['result'],
+                steps    = tab.stats['steps'],
+                branches = tab.stats['branches'],
+                nodes    = nodes,
+                nodes_per_sec = round(nodes / wall_ms * 1000) if wall_ms else None)
+        return result
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float, floor: float) -> list[tuple]:
+    """Compare current results to the baseline.
+
+    Returns:
+        A list of (key, metric, baseline, current) regressions. The wall time,
+        peak memory, and steps are compared against the threshold, and a change
+        in the result is always reported. The steps are not exact, since the
+        order of the targets can vary between runs.
+    """
+    regressions = []
+    base = baseline['results']
+    for key, cur in current['results'].items():
+        try:
+            old = base[key]
+        except KeyError:
+            continue
+        if old['result'] != cur['result']:
+            regressions.append((key, 'result', old['result'], cur['result']))
+            continue
+        for metric, minimum in (('wall_ms', floor), ('peak_kb', 0), ('steps', 0)):
+            a, b = old.get(metric), cur.get(metric)
+            if a is not None and b is not None:
+                if b - a > minimum and b > a * (1 + threshold):
+                    regressions.append((key, metric, a, b))
+    return regressions
+
+def main(*args):
+    ns = vars(parser().parse_args(args))
+    logging.basicConfig(level=logging.INFO)
+    if ns.pop('command') == 'compare':
+        opts = CompareOptions(**ns)
+        with open(opts.baseline) as file:
+            baseline = json.load(file)
+        with open(opts.current) as file:
+            current = json.load(file)
+        regressions = compare(baseline, current, opts.threshold, opts.floor)
+        for key, metric, a, b in regressions:
+            print(f'{key}: {metric} {a} -> {b}')
+        logger.info(f'{len(regressions)} regressions')
+        return int(bool(regressions))
+    opts = Options(**ns)
+    data = Runner(opts).run()
+    if opts.output is None:
+        json.dump(data, sys.stdout, indent=2)
+    else:
+        with open(opts.output, 'w') as file:
+            json.dump(data, file, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
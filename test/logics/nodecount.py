@@ -29,10 +29,12 @@ from tabulate import tabulate, tabulate_formats
 
 from pytableaux.examples import arguments as arguments
 from pytableaux.lang import Argument
-from pytableaux.logics import LogicSet, LogicType, registry
+from pytableaux.logics import LogicType, registry
 from pytableaux.proof import Tableau
 from pytableaux.tools import membr, wraps
 
+from ..utils import logicopt, readlist
+
 logger = logging.getLogger('nodcount')
 
 @dataclass(kw_only=True, slots=True)
@@ -159,18 +161,5 @@ def main(*args):
     print(builder.table())
     print(builder.totals())
 
-def logicopt(s: str):
-    logics = LogicSet()
-    exclude = s[0] == '^'
-    if exclude:
-        logics |= registry.all()
-        logics -= readlist(s[1:])
-    else:
-        logics |= readlist(s)
-    return logics
-
-def readlist(s: str, /, *, sep=','):
-    return filter(None, map(str.strip, s.split(sep)))
-
 if __name__ == '__main__':
     main(*sys.argv[1:])
\ No newline at end of file
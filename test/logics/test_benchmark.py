@@ -0,0 +1,55 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# test.logics.benchmark tests
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import TestCase as Base
+
+from pytableaux.logics import registry
+
+from . import benchmark
+
+
+class TestBenchmark(Base):
+
+    def test_default_logics_are_modules(self):
+        opts = benchmark.parser().parse_args(['run'])
+        self.assertEqual(len(opts.logics), len(list(registry.all())))
+        for logic in opts.logics:
+            self.assertIs(registry(logic), logic)
+
+    def test_run_default_logics_and_compare(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'baseline.json')
+            code = benchmark.main(
+                'run', '-a', 'Addition', '-f', 'disjunctions',
+                '--sizes', '1', '-r', '1', '-o', output)
+            self.assertFalse(code)
+            with open(output) as file:
+                data = json.load(file)
+            self.assertEqual(len(data['results']), 2 * len(list(registry.all())))
+            self.assertIn('CPL/Addition', data['results'])
+            with redirect_stdout(StringIO()):
+                code = benchmark.main('compare', output, output)
+            self.assertEqual(code, 0)
@@ -0,0 +1,98 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux.proof.batch tests
+from __future__ import annotations
+
+from pytableaux.examples import arguments as examples
+from pytableaux.lang import Argument, Atomic, Operator
+from pytableaux.proof import prove_many
+from pytableaux.proof.batch import ProofJob, ProofResult, prove
+
+from ..utils import BaseCase as Base
+
+
+class TestProveMany(Base):
+
+    def pairs(self):
+        return [
+            ('CPL', examples['Addition']),
+            ('CPL', examples['Affirming the Consequent']),
+            ('FDE', examples['Law of Excluded Middle']),
+            ('K', 'Uab:a')]
+
+    def test_serial_results(self):
+        results = list(prove_many(self.pairs(), workers=0))
+        self.assertEqual([res.index for res in results], [0, 1, 2, 3])
+        self.assertTrue(all(isinstance(res, ProofResult) for res in results))
+        self.assertEqual(
+            [res.valid for res in results],
+            [True, False, False, False])
+        self.assertEqual(results[0].result, 'Valid')
+        self.assertEqual(results[0].title, 'Addition')
+        self.assertEqual(results[0].logic, 'CPL')
+        self.assertGreater(results[0].stats['steps'], 0)
+
+    def test_pool_results_ordered(self):
+        results = list(prove_many(self.pairs(), workers=2, ordered=True))
+        self.assertEqual([res.index for res in results], [0, 1, 2, 3])
+        self.assertEqual(
+            [res.valid for res in results],
+            [True, False, False, False])
+
+    def test_pool_results_unordered_complete(self):
+        pairs = self.pairs() * 3
+        results = list(prove_many(pairs, workers=2))
+        self.assertEqual(sorted(res.index for res in results), list(range(len(pairs))))
+
+    def test_models(self):
+        res, = prove_many([('CPL', 'a:b')], workers=0, models=True)
+        self.assertTrue(res.models)
+        res, = prove_many([('CPL', 'a:b')], workers=0)
+        self.assertEqual(res.models, ())
+
+    def test_max_steps(self):
+        res, = prove_many([('CPL', examples['DeMorgan 1'])], workers=0, max_steps=1)
+        self.assertIsNone(res.valid)
+        self.assertEqual(res.stats['steps'], 1)
+
+    def test_timeout_recorded(self):
+        atoms = tuple(Atomic.gen(10))
+        arg = Argument(atoms[0] & atoms[-1], map(Operator.Disjunction, atoms, atoms[1:]))
+        res, = prove_many([('CPL', arg)], workers=0, timeout=1)
+        self.assertTrue(res.timed_out)
+        self.assertEqual(res.result, 'Timeout')
+        self.assertIsNone(res.valid)
+        self.assertTrue(res.error)
+
+    def test_error_recorded(self):
+        res = prove(ProofJob(0, 'NoSuchLogic', 'Uab:a', None, {}, False))
+        self.assertEqual(res.result, 'Error')
+        self.assertTrue(res.error)
+
+    def test_unknown_logic_recorded(self):
+        pairs = [('CPL', 'a:a'), ('NoSuchLogic', 'Uab:a'), ('CPL', 'a:b')]
+        for workers in (0, 2):
+            results = list(prove_many(pairs, workers=workers, ordered=True))
+            self.assertEqual([res.index for res in results], [0, 1, 2])
+            self.assertEqual(
+                [res.result for res in results],
+                ['Valid', 'Error', 'Invalid'])
+            self.assertEqual(results[1].logic, 'NoSuchLogic')
+            self.assertEqual(results[1].argstr, 'Uab:a')
+            self.assertTrue(results[1].error)
@@ -0,0 +1,126 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux.proof.cache tests
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+from pytableaux.errors import MissingValueError
+from pytableaux.examples import arguments as examples
+from pytableaux.lang import Argument
+from pytableaux.proof import Tableau
+from pytableaux.proof.cache import ProofCache
+
+from ..utils import BaseCase as Base
+
+
+class RebuildCodec:
+
+    def __init__(self):
+        self.loads_count = 0
+
+    def dumps(self, tab: Tableau):
+        opts = {k: v for k, v in tab.opts.items() if k == 'max_steps'}
+        return json.dumps([tab.logic.Meta.name, tab.argument.argstr(), opts]).encode()
+
+    def loads(self, data):
+        self.loads_count += 1
+        logic, argstr, opts = json.loads(data)
+        return Tableau(logic, Argument(argstr), **opts).build()
+
+class TestProofCache(Base):
+
+    def test_key_ignores_default_and_timeout_opts(self):
+        arg = examples['Addition']
+        self.assertEqual(
+            ProofCache.key('CPL', arg, {}),
+            ProofCache.key('cpl', arg, dict(is_group_optim=True, build_timeout=10)))
+        self.assertNotEqual(
+            ProofCache.key('CPL', arg, {}),
+            ProofCache.key('CPL', arg, dict(max_steps=5)))
+        self.assertNotEqual(
+            ProofCache.key('CPL', arg, {}),
+            ProofCache.key('FDE', arg, {}))
+
+    def test_key_includes_title(self):
+        arg = examples['Addition']
+        self.assertNotEqual(
+            ProofCache.key('CPL', arg, {}),
+            ProofCache.key('CPL', Argument(arg.conclusion, arg.premises, title='Other'), {}))
+
+    def test_put_builds_tree(self):
+        cache = ProofCache()
+        tab = Tableau('CPL', examples['Addition']).build()
+        self.assertEqual(tab.timers.tree.count, 0)
+        self.assertTrue(cache.put(tab))
+        self.assertEqual(tab.timers.tree.count, 1)
+
+    def test_build_hit_returns_same_tableau(self):
+        cache = ProofCache(2)
+        arg = examples['Addition']
+        tab1 = cache.build('CPL', arg, {})
+        tab2 = cache.build('CPL', arg, dict(build_timeout=1000))
+        self.assertIs(tab1, tab2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = ProofCache(2)
+        titles = ('Addition', 'DeMorgan 1', 'DeMorgan 2')
+        for title in titles:
+            cache.build('CPL', examples[title], {})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('CPL', examples['Addition'], {}))
+        self.assertIsNotNone(cache.get('CPL', examples['DeMorgan 2'], {}))
+
+    def test_get_moves_to_end(self):
+        cache = ProofCache(2)
+        cache.build('CPL', examples['Addition'], {})
+        cache.build('CPL', examples['DeMorgan 1'], {})
+        cache.get('CPL', examples['Addition'], {})
+        cache.build('CPL', examples['DeMorgan 2'], {})
+        self.assertIsNotNone(cache.get('CPL', examples['Addition'], {}))
+        self.assertIsNone(cache.get('CPL', examples['DeMorgan 1'], {}))
+
+    def test_put_unfinished_not_added(self):
+        cache = ProofCache()
+        tab = Tableau('CPL', examples['Addition'])
+        self.assertFalse(cache.put(tab))
+        self.assertEqual(len(cache), 0)
+
+    def test_disk_requires_codec(self):
+        with self.assertRaises(MissingValueError):
+            ProofCache(path=':memory:')
+
+    def test_disk_tier_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'proofs.db')
+            arg = examples['DeMorgan 1']
+            cache = ProofCache(path=path, codec=RebuildCodec())
+            tab = cache.build('CPL', arg, {})
+            cache.close()
+            codec = RebuildCodec()
+            cache = ProofCache(path=path, codec=codec)
+            res = cache.get('CPL', arg, {})
+            self.assertEqual(codec.loads_count, 1)
+            self.assertEqual(res.stats['result'], tab.stats['result'])
+            cache.get('CPL', arg, {})
+            self.assertEqual(codec.loads_count, 1)
+            cache.close()
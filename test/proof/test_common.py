@@ -323,6 +323,68 @@ class TestBranch(Base):
         self.assertEqual(len(self.case2(0)), 0)
         self.assertEqual(len(self.case2(6)), 6)
 
+    def test_copy_shares_prefix(self):
+        nn = self.nn1(5)
+        b1 = Branch().extend(nn[:3])
+        b2 = b1.copy(parent=b1)
+        self.assertIs(b2._seg.prev, b1._seg.prev)
+        b1.append(nn[3])
+        b2.append(nn[4])
+        self.assertEqual(list(b1), list(nn[:4]))
+        self.assertEqual(list(b2), [*nn[:3], nn[4]])
+        self.assertNotIn(nn[4], b1)
+        self.assertNotIn(nn[3], b2)
+        self.assertIs(b2[-1], nn[4])
+        self.assertIs(b2[1], nn[1])
+        self.assertEqual(b2.index(nn[4]), 3)
+        self.assertEqual(list(reversed(b2)), [nn[4], *reversed(nn[:3])])
+
+    def test_copy_ticks_are_per_branch(self):
+        nn = self.nn1(2)
+        b1 = Branch().extend(nn)
+        b1.tick(nn[0])
+        b2 = b1.copy()
+        b1.tick(nn[1])
+        self.assertTrue(b2.is_ticked(nn[0]))
+        self.assertFalse(b2.is_ticked(nn[1]))
+        b2.tick(nn[1])
+        self.assertTrue(b2.is_ticked(nn[1]))
+
+    def test_copy_index_search_chained(self):
+        s1, s2 = Atomic.gen(2)
+        b1 = Branch().append({'sentence': s1, 'world': 0})
+        b2 = b1.copy().append({'sentence': s1, 'world': 1})
+        b1.append({'sentence': s2, 'world': 1})
+        self.assertEqual(len(list(b2.search({'sentence': s1}))), 2)
+        self.assertTrue(b2.has({'sentence': s1, 'world': 1}))
+        self.assertFalse(b2.has({'sentence': s2}))
+        self.assertFalse(b1.has({'sentence': s1, 'world': 1}))
+
+    def test_find_literal_exact(self):
+        s1, s2 = Atomic.gen(2)
+        b1 = Branch().append({'sentence': s1, 'designated': True, 'world': 0})
+        b2 = b1.copy().append({'sentence': s2})
+        self.assertIs(b2.find_literal(s1, True, 0), b1[0])
+        self.assertIs(b2.find_literal(s2), b2[1])
+        self.assertIsNone(b2.find_literal(s1, False, 0))
+        self.assertIsNone(b2.find_literal(s1, True))
+        self.assertIsNone(b1.find_literal(s2))
+        b2.copy()
+        self.assertIs(b2._seg.prev.index.copy().literal((s2, None, None)), b2[1])
+
+    def test_copy_flattens_deep_chain(self):
+        b = Branch()
+        nodes = []
+        for i in range(Branch.FLATTEN_DEPTH + 5):
+            nodes.append(Node({'i': i}))
+            b.append(nodes[-1])
+            b.tick(nodes[-1])
+            b.copy()
+            self.assertLessEqual(b._seg.depth, Branch.FLATTEN_DEPTH + 1)
+        self.assertEqual(list(b), nodes)
+        self.assertTrue(all(map(b.is_ticked, nodes)))
+        self.assertTrue(b.has({'i': 3}))
+
 class TestTarget(Base):
 
     def test_missing_branch_raises(self):
@@ -0,0 +1,116 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux.proof.serial tests
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+
+from pytableaux.errors import IllegalStateError
+from pytableaux.examples import arguments as examples
+from pytableaux.proof import Tableau, serial
+from pytableaux.proof.cache import ProofCache
+from pytableaux.proof.writers.doctree import registry as writers
+from pytableaux.proof.writers.jinja import TextTabWriter
+
+from ..utils import BaseCase as Base
+
+
+def without_ids(s: str):
+    return re.sub(r'\d{6,}', 'ID', s)
+
+class TestSerial(Base):
+
+    def roundtrip(self, logic, title, **opts):
+        tab = Tableau(logic, examples[title], **opts).build()
+        return tab, serial.loads(serial.dumps(tab))
+
+    def test_loads_result_and_stats(self):
+        tab, rec = self.roundtrip('CPL', 'DeMorgan 1')
+        self.assertIsInstance(rec, serial.TableauRecord)
+        self.assertEqual(rec.argument, tab.argument)
+        self.assertIs(rec.logic, tab.logic)
+        self.assertTrue(rec.valid)
+        self.assertEqual(rec.stats, tab.stats)
+        self.assertEqual(len(rec), len(tab))
+        self.assertEqual(len(rec.history), len(tab.history))
+
+    def test_branches_and_ticks(self):
+        tab, rec = self.roundtrip('FDE', 'Conjunction Commutativity')
+        for b1, b2 in zip(tab, rec):
+            self.assertEqual(list(map(dict, b1)), list(map(dict, b2)))
+            self.assertEqual(b1.closed, b2.closed)
+            self.assertEqual(
+                [b1.is_ticked(n) for n in b1],
+                [b2.is_ticked(n) for n in b2])
+            self.assertEqual([n.step for n in b1], [n.step for n in b2])
+        for b1, b2 in zip(tab, rec):
+            if b1.parent is not None:
+                self.assertIs(b2.parent, rec[list(tab).index(b1.parent)])
+
+    def test_history_targets(self):
+        tab, rec = self.roundtrip('K', 'Necessity Distribution 1')
+        for s1, s2 in zip(tab.history, rec.history):
+            self.assertEqual(s1.rule.name, s2.rule.name)
+            self.assertEqual(s1.target.type, s2.target.type)
+            self.assertEqual(list(tab).index(s1.target.branch), list(rec).index(s2.target.branch))
+
+    def test_writers_same_output(self):
+        for logic, title in (('CPL', 'Addition'), ('K', 'Possibility Addition'), ('FDE', 'DeMorgan 3')):
+            tab, rec = self.roundtrip(logic, title)
+            for fmt in ('html', 'latex'):
+                pw = writers[fmt]()
+                self.assertEqual(without_ids(pw(tab)), without_ids(pw(rec)))
+
+    def test_text_writer_renders_record(self):
+        for logic, title in (('CPL', 'Addition'), ('K', 'Possibility Addition'), ('FDE', 'DeMorgan 3')):
+            tab, rec = self.roundtrip(logic, title)
+            pw = TextTabWriter()
+            self.assertEqual(pw(tab), pw(rec))
+
+    def test_models_rebuilt(self):
+        tab, rec = self.roundtrip('CPL', 'Affirming the Consequent', is_build_models=True)
+        self.assertTrue(rec.invalid)
+        self.assertEqual(len(rec.models), len(tab.models))
+        for branch in rec.open:
+            self.assertTrue(branch.model.is_countermodel_to(rec.argument))
+        _, rec = self.roundtrip('CPL', 'Affirming the Consequent')
+        self.assertFalse(rec.models)
+
+    def test_dumps_unfinished_raises(self):
+        with self.assertRaises(IllegalStateError):
+            serial.dumps(Tableau('CPL', examples['Addition']))
+
+    def test_loads_bad_data_raises(self):
+        with self.assertRaises(ValueError):
+            serial.loads(b'not a tableau')
+
+    def test_proof_cache_codec(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'proofs.db')
+            arg = examples['DeMorgan 2']
+            cache = ProofCache(path=path, codec=serial)
+            tab = cache.build('CPL', arg, {})
+            cache.close()
+            cache = ProofCache(path=path, codec=serial)
+            rec = cache.get('CPL', arg, {})
+            self.assertIsInstance(rec, serial.TableauRecord)
+            self.assertEqual(rec.stats, tab.stats)
+            cache.close()
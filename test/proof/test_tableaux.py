@@ -20,15 +20,18 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import skip
 
 from pytableaux.errors import *
 from pytableaux.examples import arguments as examples
-from pytableaux.lang import Argument
+from pytableaux.lang import Argument, Operated, Operator
+from pytableaux.logics import registry
 from pytableaux.proof import *
 from pytableaux.proof import rules
 from pytableaux.proof.filters import getkey
 from pytableaux.proof.helpers import *
+from pytableaux.proof.helpers import WorldConsts
 from pytableaux.proof.tableaux import *
 
 from ..utils import BaseCase as Base
@@ -66,6 +69,34 @@ class TestTableau(Base):
         with self.assertRaises(ProofTimeoutError):
             proof.build()
 
+    def test_timeout_records_overrun(self):
+        proof = self.tab('Addition', is_build=False, build_timeout=1)
+        with proof.timers.build:
+            time.sleep(0.005)
+        with self.assertRaises(ProofTimeoutError):
+            proof.build()
+        self.assertIn(Tableau.Flag.TIMED_OUT, proof.flag)
+        self.assertGreaterEqual(proof.stats['timeout_overrun_ms'], 0)
+        self.assertIsNone(self.tab('Addition').stats['timeout_overrun_ms'])
+
+    def test_deadline_in_rule_search(self):
+        proof = self.tab('Material Modus Ponens', is_build=False, build_timeout=1000)
+        proof.deadline = time.perf_counter() - 1
+        rule = proof.rules.get('MaterialConditional')
+        with self.assertRaises(ProofTimeoutError):
+            rule.target(proof[0])
+        self.assertTrue(proof.finished)
+        self.assertGreaterEqual(proof.stats['timeout_overrun_ms'], 1000)
+
+    def test_no_deadline_in_tree_after_finished(self):
+        proof = self.tab('Material Modus Ponens', build_timeout=100)
+        self.assertTrue(proof.valid)
+        time.sleep(0.105)
+        self.assertTrue(proof.tree.root)
+        self.assertNotIn(proof.flag.TIMED_OUT, proof.flag)
+        self.assertEqual(proof.stats['result'], 'Valid')
+        self.assertIsNone(proof.stats['timeout_overrun_ms'])
+
     def test_finish_empty_sets_build_duration_ms_0(self):
         self.assertEqual(Tableau().finish().stats['build_duration_ms'], 0)
 
@@ -185,7 +216,233 @@ class TestTableau(Base):
         tab = self.tab('Triviality 1', max_steps=1)
         self.assertIn('invalid', repr(tab))
 
-    
+    def test_agenda_option_disabled(self):
+        tab = self.tab('DeMorgan 1', is_agenda=False)
+        self.assertIsNone(tab._agenda)
+        self.assertTrue(tab.valid)
+
+    def test_agenda_same_result_as_rescan(self):
+        for title in ('DeMorgan 1', 'Triviality 1', 'Disjunctive Syllogism 1'):
+            tab1 = self.tab(title, is_agenda=False)
+            tab2 = self.tab(title, is_agenda=True)
+            self.assertEqual(tab1.stats['result'], tab2.stats['result'])
+            self.assertEqual(len(tab1), len(tab2))
+            self.assertEqual(
+                [entry.rule.name for entry in tab1.history],
+                [entry.rule.name for entry in tab2.history])
+
+    def test_agenda_idle_branches_have_no_application(self):
+        for logic in ('FDE', 'S5', 'CFOL'):
+            for title in ('Existential Syllogism', 'S5 Material Inference 1', 'DeMorgan 3'):
+                tab = Tableau(logic, examples[title])
+                agenda = tab._agenda
+                while not tab.finished:
+                    for branch in tab.open:
+                        if branch in agenda.entries and agenda.entries[branch] is None:
+                            self.assertIsNone(tab._get_branch_application(branch))
+                    tab.step()
+
+    def test_verify_models_all_countermodels(self):
+        tab = self.tab('Affirming the Consequent',
+            is_build_models=True, is_verify_models=True)
+        self.assertTrue(tab.invalid)
+        self.assertTrue(tab.countermodels)
+        self.assertEqual(tab.countermodels, tab.models)
+        for model in tab.countermodels:
+            self.assertTrue(model.is_countermodel_to(tab.argument))
+        self.assertEqual(tab.stats['models_verified'], len(tab.models))
+        self.assertEqual(tab.stats['countermodels'], len(tab.models))
+        self.assertEqual(len(tab.stats['model_verify_ms']), len(tab.models))
+
+    def test_verify_models_first_countermodel(self):
+        tab = self.tab('Affirming the Consequent',
+            is_build_models=True, is_verify_models=True, is_first_countermodel=True)
+        self.assertGreater(len(tab.models), 1)
+        self.assertEqual(len(tab.countermodels), 1)
+        self.assertEqual(tab.stats['models_verified'], 1)
+        self.assertIs(next(iter(tab.countermodels)), tab.open[0].model)
+
+    def test_verify_models_disabled_by_default(self):
+        tab = self.tab('Affirming the Consequent', is_build_models=True)
+        self.assertFalse(tab.countermodels)
+        self.assertEqual(tab.stats['models_verified'], 0)
+        self.assertEqual(tab.stats['model_verify_ms'], [])
+
+    def test_decide_only_same_result(self):
+        for title in ('DeMorgan 1', 'Triviality 1', 'Affirming the Consequent'):
+            for agenda in (True, False):
+                tab1 = self.tab(title, is_agenda=agenda)
+                tab2 = self.tab(title, is_agenda=agenda, decide_only=True)
+                self.assertEqual(tab1.valid, tab2.valid)
+                self.assertEqual(tab1.invalid, tab2.invalid)
+                self.assertLessEqual(len(tab2.history), len(tab1.history))
+
+    def test_decide_only_skips_tree(self):
+        tab = self.tab('Triviality 1', decide_only=True)
+        self.assertTrue(tab.invalid)
+        self.assertIsNone(tab.tree)
+
+    def test_decide_only_models_deciding_branch(self):
+        tab = self.tab('Affirming the Consequent', decide_only=True,
+            is_build_models=True, is_verify_models=True)
+        self.assertEqual(len(tab.models), 1)
+        self.assertEqual(tab.countermodels, tab.models)
+
+    def test_decide_only_modal_serial(self):
+        tab1 = Tableau('D', examples['Serial Inference 1']).build()
+        tab2 = Tableau('D', examples['Serial Inference 1'], decide_only=True).build()
+        self.assertEqual(tab1.valid, tab2.valid)
+
+    def test_tree_built_on_access(self):
+        tab = self.tab('Triviality 1')
+        self.assertEqual(tab.timers.tree.count, 0)
+        tree = tab.tree
+        self.assertTrue(tree.root)
+        self.assertIs(tab.tree, tree)
+        self.assertEqual(tab.timers.tree.count, 1)
+
+    def test_tree_built_once_concurrently(self):
+        tab = self.tab('Existential Syllogism')
+        with ThreadPoolExecutor(4) as executor:
+            trees = list(executor.map(lambda _: tab.tree, range(8)))
+        self.assertTrue(all(tree is trees[0] for tree in trees))
+        self.assertEqual(tab.timers.tree.count, 1)
+
+    def test_tree_duration_stat_after_access(self):
+        tab = self.tab('Triviality 1')
+        self.assertEqual(tab.stats['tree_duration_ms'], 0)
+        tab.tree
+        self.assertEqual(tab.stats['tree_duration_ms'], tab.timers.tree.elapsed_ms())
+
+    def test_tree_none_before_finished(self):
+        tab = self.tab('Triviality 1', is_build=False)
+        self.assertIsNone(tab.tree)
+
+    def test_stats_distinct_nodes_matches_tree(self):
+        for title in ('DeMorgan 1', 'Triviality 1', 'Affirming the Consequent'):
+            tab = self.tab(title)
+            self.assertEqual(tab.stats['distinct_nodes'], tab.tree.distinct_nodes)
+
+    def test_tree_walk_matches_tree(self):
+        def preorder(tree):
+            yield tree
+            for child in tree.children:
+                yield from preorder(child)
+        tab = self.tab('Denying the Antecedent')
+        walked = list(Tableau.Tree.walk(tab))
+        built = list(preorder(tab.tree))
+        self.assertGreater(len(built), 1)
+        self.assertEqual(len(walked), len(built))
+        for a, b in zip(walked, built):
+            self.assertEqual(a.nodes, b.nodes)
+            self.assertEqual(a.ticksteps, b.ticksteps)
+            for name in ('depth', 'left', 'index', 'degree', 'step', 'leaf', 'closed', 'branch_id'):
+                self.assertEqual(getattr(a, name), getattr(b, name))
+            self.assertFalse(a.children)
+
+    def test_tree_walk_matches_tree_every_logic(self):
+        def preorder(tree):
+            yield tree
+            for child in tree.children:
+                yield from preorder(child)
+        names = ('left', 'depth', 'index', 'degree', 'step', 'leaf', 'closed', 'branch_id')
+        for logic in map(registry, registry.all()):
+            for title in ('Denying the Antecedent', 'DeMorgan 3', 'Necessity Distribution 1'):
+                with self.subTest(logic=logic.Meta.name, title=title):
+                    tab = Tableau(logic, examples[title], max_steps=100).build()
+                    walked = list(Tableau.Tree.walk(tab))
+                    built = list(preorder(tab.tree))
+                    self.assertEqual(len(walked), len(built))
+                    for a, b in zip(walked, built):
+                        self.assertEqual(a.nodes, b.nodes)
+                        self.assertEqual(a.ticksteps, b.ticksteps)
+                        for name in names:
+                            self.assertEqual(getattr(a, name), getattr(b, name))
+
+    def test_tree_from_forks_matches_build(self):
+        def flatten(tree):
+            yield (tuple(tree.nodes), tree.ticksteps, tree.left, tree.right,
+                tree.width, tree.step, tree.branch_step, tree.has_open,
+                tree.has_closed, tree.balanced_line_width, tree.branch_id,
+                tree.descendant_node_count)
+            for child in tree.children:
+                yield from flatten(child)
+        for title in ('DeMorgan 1', 'Denying the Antecedent', 'Triviality 1'):
+            tab = Tableau('FDE', examples[title]).build()
+            self.assertIsNotNone(Tableau.Tree._forks(tab))
+            tree1 = Tableau.Tree.make(tab)
+            tree2 = Tableau.Tree._build(tab, tab)
+            self.assertEqual(tree1.distinct_nodes, tree2.distinct_nodes)
+            self.assertEqual(list(flatten(tree1)), list(flatten(tree2)))
+
+    def test_tree_without_forks_falls_back(self):
+        tab = Tableau()
+        tab.add(Branch().extend(({'a': 1}, {'b': 2})))
+        tab.add(Branch().extend(({'c': 3},)))
+        tab.finish()
+        self.assertIsNone(Tableau.Tree._forks(tab))
+        self.assertEqual(len(tab.tree.children), 2)
+        self.assertEqual(tab.tree.distinct_nodes, 3)
+
+    def test_profile_disabled_by_default(self):
+        tab = self.tab('Addition')
+        self.assertIsNone(tab.profile)
+
+    def test_profile_report(self):
+        tab = Tableau('CPL', examples['Addition'], is_profile=True).build()
+        self.assertTrue(tab.valid)
+        report = tab.profile.report()
+        rules = {entry['rule']: entry for entry in report['rules']}
+        self.assertEqual(set(rules), set(tab.rules.names()))
+        self.assertEqual(sum(entry['applied'] for entry in rules.values()), len(tab.history))
+        for rule in tab.rules:
+            self.assertEqual(rules[rule.name]['applied'], len(rule.history))
+            self.assertGreaterEqual(rules[rule.name]['targets'], rules[rule.name]['applied'])
+        trunk = sum(1 for node in tab[0] if node.step == 0)
+        self.assertEqual(
+            sum(entry['nodes'] for entry in rules.values()),
+            tab.stats['distinct_nodes'] - trunk)
+        self.assertTrue(any(entry['calls'] for entry in report['helpers']))
+        table = tab.profile.table()
+        self.assertIn('BranchTarget', table)
+        self.assertIn('ContradictionClosure', table)
+
+    def test_deltas_replay(self):
+        tab = self.tab('Material Modus Ponens', is_build=False)
+        branches, nodes, ticks, closed = [], {}, set(), set()
+        deltas = list(tab.deltas())
+        self.assertIsNone(deltas[0].entry)
+        self.assertEqual([d.entry for d in deltas[1:]], list(tab.history))
+        for delta in deltas:
+            for branch in delta.branches:
+                branches.append(branch)
+                nodes[branch] = list(branch[:tab.stat(branch, 'FORK') or 0])
+                if branch.parent:
+                    ticks.update((node, branch) for node, b in set(ticks) if b is branch.parent)
+            for node, branch in delta.nodes:
+                nodes[branch].append(node)
+            ticks.update(delta.ticks)
+            closed.update(delta.closed)
+        self.assertEqual(branches, list(tab))
+        for branch in tab:
+            self.assertEqual(nodes[branch], list(branch))
+            self.assertEqual(
+                {node for node, b in ticks if b is branch},
+                {node for node in branch if branch.is_ticked(node)})
+        self.assertEqual(closed, {branch for branch in tab if branch.closed})
+
+    def test_deltas_close_stops_build(self):
+        tab = self.tab('Material Modus Ponens', is_build=False)
+        deltas = tab.deltas()
+        next(deltas)
+        next(deltas)
+        deltas.close()
+        self.assertFalse(tab.finished)
+        self.assertEqual(len(tab.history), 1)
+        tab.build()
+        self.assertTrue(tab.valid)
+
+
 class TestBranchStat(Base):
     def test_view_coverage(self):
         stat = Tableau.BranchStat()
@@ -393,6 +650,50 @@ class TestFilters(Base):
         assert f(Node.for_mapping({'designated': True}))
         assert not f(Node({'foo': 'bar'}))
 
+    def test_signature_negated(self):
+        s = self.p('NKab')
+        sig1 = filters.signature(Node.for_mapping(dict(sentence=s, designated=True)))
+        sig2 = filters.signature(Node.for_mapping(dict(sentence=~s, designated=True)))
+        self.assertNotEqual(sig1, sig2)
+        self.assertEqual(sig1[2][2:], (Operated, Operator.Conjunction))
+        self.assertEqual(sig2[2][2:], (Operated, Operator.Negation))
+
+
+class TestNodeDispatch(Base):
+
+    logic = 'FDE'
+
+    def test_filter_caches_match_filters(self):
+        tab = self.tab('Universal Predicate Syllogism', is_build=False)
+        branch, = tab
+        for rule in tab.rules:
+            if FilterHelper not in rule.helpers:
+                continue
+            helper = rule[FilterHelper]
+            self.assertEqual(helper[branch],
+                set(node for node in branch if helper(node, branch)))
+
+    def test_signed_pred_matches_filters(self):
+        tab = self.tab('Universal Predicate Syllogism')
+        for rule in tab.rules:
+            if FilterHelper not in rule.helpers:
+                continue
+            config = rule[FilterHelper].config
+            self.assertIsInstance(config.pred, FilterHelper.SignedPred)
+            for branch in tab:
+                for node in branch:
+                    self.assertEqual(config.pred(node), config.pred.funcs(node))
+
+    def test_stats_dispatch_avoided(self):
+        tab = self.tab('DeMorgan 1')
+        self.assertGreater(tab.stats['dispatch_avoided'], 0)
+        self.assertGreater(tab.stats['dispatch_calls'], 0)
+
+    def test_add_after_lock_raises(self):
+        tab = self.tab('DeMorgan 1')
+        with self.assertRaises(IllegalStateError):
+            tab.rules.dispatch.add(bool, print)
+
 
 class TestEllispsisHelper(Base):
 
@@ -431,6 +732,22 @@ class TestMaxConstantsTracker(Base):
         branch = proof[0]
         self.assertEqual(rule[MaxConsts]._compute(branch), 3)
 
+    def test_shared_across_rules(self):
+        tab = self.tab()
+        found = [rule for rule in tab.rules if MaxConsts in rule.helpers]
+        self.assertGreater(len(found), 1)
+        helper = tab.rules.shared[MaxConsts]
+        for rule in found:
+            self.assertIs(rule[MaxConsts], helper)
+        self.assertIs(helper.wconsts, tab.rules.shared[WorldConsts])
+
+    def test_quit_flag_names_rule(self):
+        tab = self.tab()
+        rule = [rule for rule in tab.rules if MaxConsts in rule.helpers][-1]
+        tab.branch()
+        node = rule[MaxConsts].quit_flag(tab[0], rule)
+        self.assertTrue(node[Node.Key.info].startswith(f'{rule.name}:MaxConsts'))
+
     @skip(None)
     def xtest_compute_for_node_one_q_returns_1(self):
         n = {'sentence': self.p('VxFx'), 'world': 0}
@@ -29,6 +29,33 @@ class TestModels(Base):
         m = self.m().finish()
         self.assertEqual(m.value_of(s), m.Meta.unassigned_value)
 
+    def test_value_of_memoized(self):
+        s = Atomic(0, 0)
+        with self.m() as m:
+            m.set_value(s, 'T')
+        self.assertEqual(m.value_of(s), 'T')
+        self.assertEqual(m._memo[s, 0], 'T')
+        m._memo[s, 0] = 'F'
+        self.assertEqual(m.value_of(s), 'F')
+
+    def test_truth_function_uses_tables(self):
+        m = self.m()
+        tables = m.truth_function.tables
+        self.assertIn(Operator.Conjunction, tables)
+        for oper in m.Meta.truth_functional_operators:
+            for args, value in m.truth_table(oper).mapping.items():
+                self.assertEqual(tables[oper][args], value)
+                self.assertEqual(m.truth_function(oper, *args), value)
+
+    def test_is_countermodel_to(self):
+        a, b = Atomic(0, 0), Atomic(1, 0)
+        with self.m() as m:
+            m.set_value(a, 'T')
+            m.set_value(b, 'F')
+        self.assertTrue(m.is_countermodel_to(Argument(b, [a])))
+        self.assertFalse(m.is_countermodel_to(Argument(a, [b])))
+        self.assertFalse(m.is_countermodel_to(Argument(b, [a, b])))
+
 class TestAccess(Base):
 
     def test_flat_unsorted(self):
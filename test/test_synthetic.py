@@ -0,0 +1,51 @@
+
+from pytableaux.lang import *
+from pytableaux.proof import Tableau
+from pytableaux.synthetic import *
+
+from .utils import BaseCase
+
+
+class Base(BaseCase):
+    logic = 'CFOL'
+
+
+class TestFamilies(Base):
+
+    def test_deterministic(self):
+        for name, family in families.items():
+            for n in (1, 2, 3):
+                with self.subTest(name=name, n=n):
+                    arg = family(n)
+                    self.assertIsInstance(arg, Argument)
+                    self.assertEqual(arg, family(n))
+                    self.assertEqual(arg.title, family(n).title)
+
+    def test_seed_changes_argument(self):
+        for family in (cnf, dnf, designations):
+            self.assertNotEqual(
+                {family(6, seed=seed) for seed in range(5)},
+                {family(6, seed=0)})
+
+    def test_pigeonhole_size(self):
+        arg = pigeonhole(3)
+        # 4 pigeons, plus 3 holes with 6 pairs each
+        self.assertEqual(len(arg.premises), 4 + 3 * 6)
+        self.assertNotIn(arg.conclusion, arg.premises)
+
+    def test_cnf_shape(self):
+        arg = cnf(4, width=2, depth=3)
+        s = arg.premises[0]
+        self.assertIs(s.operator, Operator.Conjunction)
+        self.assertEqual(arg.title, 'cnf-4-2-3-0')
+
+    def test_valid(self):
+        for arg in (
+            disjunctions(4),
+            pigeonhole(2),
+            syllogisms(3),
+            alternations(2),
+            modals(3)):
+            with self.subTest(arg=arg.title):
+                logic = 'K' if arg.title.startswith('modals') else self.logic
+                self.assertTrue(Tableau(logic, arg).build().valid)
@@ -23,9 +23,12 @@ from urllib.parse import urlencode
 
 import cherrypy
 import json
+import socket
+import time
 from cherrypy.test import helper
 
 from pytableaux.errors import *
+from pytableaux.synthetic import pigeonhole
 from pytableaux.web.app import App
 from pytableaux.web.util import fix_uri_req_data
 
@@ -219,9 +222,229 @@ class AppTest(helper.CPWebCase):
         res = self.post_json('/api/bunky', body)
         self.assertEqual(res['status'], 404)
 
+    def test_api_prove_etag_not_modified(self):
+        body = json.dumps({'argument': 'a:a', 'logic': 'cpl'})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage('/api/prove', headers, 'POST', body)
+        self.assertStatus(200)
+        etag = self.assertHeader('ETag')
+        self.getPage('/api/prove', headers + [('If-None-Match', etag)], 'POST', body)
+        self.assertStatus(304)
+        self.assertGreaterEqual(self.app.response_cache.hits, 1)
+
+    def test_api_prove_batch(self):
+        body = json.dumps({
+            'jobs': [
+                {'logic': 'cpl', 'argument': 'a:a'},
+                {'logic': 'fde', 'argument': {'premises': ['a'], 'conclusion': 'Aab'}},
+                {'logic': 'cfol', 'argument': 'VxCFxHx:VxCFxGx:VxCGxHx', 'max_steps': 1},
+                {'logic': 'bunky', 'argument': 'a:a'}],
+            'deadline': 5000})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage('/api/prove/batch', headers, 'POST', body)
+        self.assertStatus(200)
+        *lines, end = map(json.loads, self.body.decode('utf-8').splitlines())
+        self.assertEqual(end['event'], 'end')
+        self.assertEqual(end['count'], 4)
+        res = {line['index']: line for line in lines}
+        self.assertEqual(set(res), {0, 1, 2, 3})
+        self.assertTrue(res[0]['result']['tableau']['valid'])
+        self.assertTrue(res[1]['result']['tableau']['valid'])
+        self.assertEqual(res[2]['result']['tableau']['result'], 'Unfinished')
+        self.assertEqual(res[3]['status'], 400)
+        self.assertIn('logic', res[3]['errors'])
+
+    def test_api_prove_batch_invalid_deadline(self):
+        res = self.post_json('/api/prove/batch', {
+            'jobs': [{'logic': 'cpl', 'argument': 'a:a'}],
+            'deadline': [1]})
+        self.assertEqual(res['status'], 400)
+        self.assertIn('deadline', res['errors'])
+
+    def test_api_prove_batch_negative_deadline(self):
+        for deadline in (-5, 0):
+            res = self.post_json('/api/prove/batch', {
+                'jobs': [{'logic': 'cpl', 'argument': 'a:a'}],
+                'deadline': deadline})
+            self.assertEqual(res['status'], 400)
+            self.assertIn('deadline', res['errors'])
+
+    def test_api_prove_batch_jobs_not_list(self):
+        for jobs in (5, 'a:a', {'0': {'logic': 'cpl', 'argument': 'a:a'}}):
+            res = self.post_json('/api/prove/batch', {'jobs': jobs})
+            self.assertEqual(res['status'], 400)
+            self.assertIn('jobs', res['errors'])
+
+    def test_api_prove_batch_job_not_mapping(self):
+        res = self.post_json('/api/prove/batch', {
+            'jobs': [{'logic': 'cpl', 'argument': 'a:a'}, 'a:a']})
+        self.assertEqual(res['status'], 400)
+        self.assertIn('index 1', res['errors']['jobs'])
+
+    def test_api_prove_batch_logics_not_list(self):
+        res = self.post_json('/api/prove/batch', {
+            'logics': 'cpl',
+            'argument': 'a:a'})
+        self.assertEqual(res['status'], 400)
+        self.assertIn('logics', res['errors'])
+
+    def test_api_prove_batch_too_many_jobs(self):
+        count = self.app.config['batch_max_jobs'] + 1
+        res = self.post_json('/api/prove/batch', {
+            'jobs': [{'logic': 'cpl', 'argument': 'a:a'}] * count})
+        self.assertEqual(res['status'], 400)
+        self.assertIn('jobs', res['errors'])
+
+    def test_api_prove_batch_too_many_serial_jobs(self):
+        self.assertIsNone(self.app.proof_pool)
+        count = self.app.config['batch_max_serial_jobs'] + 1
+        res = self.post_json('/api/prove/batch', {
+            'logics': ['cpl'] * count,
+            'argument': 'a:a'})
+        self.assertEqual(res['status'], 400)
+        self.assertIn(str(count - 1), res['errors']['jobs'])
+
+    def test_api_prove_stream(self):
+        body = json.dumps({'argument': 'Cab:a', 'logic': 'cpl'})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage('/api/prove/stream', headers, 'POST', body)
+        self.assertStatus(200)
+        self.assertHeader('Content-Type', 'application/x-ndjson')
+        self.assertNoHeader('ETag')
+        events = list(map(json.loads, self.body.decode('utf-8').splitlines()))
+        self.assertEqual(events[0]['event'], 'start')
+        self.assertEqual(events[-1]['event'], 'end')
+        self.assertFalse(events[-1]['valid'])
+        steps = [event['step'] for event in events[1:-1]]
+        self.assertTrue(steps)
+        self.assertEqual(steps, sorted(steps))
+
+    def test_api_prove_stream_event_source(self):
+        body = json.dumps({'argument': 'a:a', 'logic': 'cpl'})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body))),
+            ('Accept', 'text/event-stream')]
+        self.getPage('/api/prove/stream', headers, 'POST', body)
+        self.assertStatus(200)
+        self.assertTrue(self.assertHeader('Content-Type').startswith('text/event-stream'))
+        chunks = self.body.decode('utf-8').split('\n\n')
+        self.assertEqual(chunks.pop(), '')
+        for chunk in chunks:
+            self.assertTrue(chunk.startswith('data: '))
+        self.assertEqual(json.loads(chunks[-1][6:])['event'], 'end')
+
     def test_fix_form_data_braces_1(self):
         form_data = {
             'test[]': 'a'
         }
         res = fix_uri_req_data(form_data)
         self.assertEqual(res['test[]'], ['a'])
+
+
+class PoolAppTest(helper.CPWebCase):
+
+    @classmethod
+    def setup_server(cls):
+        cls.app = App(
+            proof_pool_size=1,
+            proof_queue_size=0,
+            response_cache_bytes=0)
+        cherrypy.tree.mount(cls.app, '/', cls.app.cp_config)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.app.proof_pool.shutdown()
+        super().teardown_class()
+
+    def post(self, page, data):
+        body = json.dumps(data)
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage(page, headers, 'POST', body)
+        return json.loads(self.body)
+
+    def test_api_prove(self):
+        res = self.post('/api/prove', {'argument': 'a:a', 'logic': 'cpl'})
+        self.assertStatus(200)
+        self.assertTrue(res['result']['tableau']['valid'])
+
+    def test_api_prove_full_retry_after(self):
+        pool = self.app.proof_pool
+        future = pool.submit('CPL', pigeonhole(4), dict(build_timeout=2000))
+        try:
+            self.post('/api/prove', {'argument': 'Cab:a', 'logic': 'cpl'})
+            self.assertStatus(503)
+            self.assertGreaterEqual(int(self.assertHeader('Retry-After')), 1)
+        finally:
+            future.cancel()
+            try:
+                pool.result(future)
+            except ProofTimeoutError:
+                pass
+
+    def test_api_prove_disconnect_cancels_job(self):
+        pool = self.app.proof_pool
+        futures = []
+        def submit(*args):
+            future = type(pool).submit(pool, *args)
+            futures.append(future)
+            return future
+        blocker = pool.submit('CPL', pigeonhole(4), dict(build_timeout=10000))
+        pool.submit = submit
+        pool.maxqueue = 1
+        try:
+            deadline = time.monotonic() + 10
+            while not blocker.running():
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            body = json.dumps({'argument': 'CaCbc:a', 'logic': 'cpl'}).encode()
+            with socket.create_connection((self.interface(), self.PORT)) as sock:
+                sock.sendall(
+                    b'POST /api/prove HTTP/1.1\r\n'
+                    b'Host: %s\r\n'
+                    b'Content-Type: application/json\r\n'
+                    b'Content-Length: %d\r\n\r\n%s' % (
+                        self.interface().encode(), len(body), body))
+                while not futures:
+                    self.assertLess(time.monotonic(), deadline)
+                    time.sleep(0.01)
+            while not futures[0].cancelled():
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+        finally:
+            del pool.submit
+            pool.maxqueue = 0
+            pool.kill()
+
+    def test_api_prove_batch(self):
+        body = json.dumps({'logics': ['cpl', 'fde', 'k3'], 'argument': 'a:a'})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage('/api/prove/batch', headers, 'POST', body)
+        self.assertStatus(200)
+        *lines, end = map(json.loads, self.body.decode('utf-8').splitlines())
+        self.assertEqual(end['count'], 3)
+        self.assertEqual(sorted(line['index'] for line in lines), [0, 1, 2])
+        for line in lines:
+            self.assertEqual(line['status'], 200)
+            self.assertTrue(line['result']['tableau']['valid'])
+
+    def test_api_prove_batch_more_than_serial_jobs(self):
+        count = self.app.config['batch_max_serial_jobs'] + 1
+        body = json.dumps({'logics': ['cpl'] * count, 'argument': 'a:a'})
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Content-Length', str(len(body)))]
+        self.getPage('/api/prove/batch', headers, 'POST', body)
+        self.assertStatus(200)
+        *lines, end = map(json.loads, self.body.decode('utf-8').splitlines())
+        self.assertEqual(end['count'], count)
@@ -0,0 +1,156 @@
+# pytableaux, a multi-logic proof generator.
+# Copyright (C) 2014-2023 Doug Owings.
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# 
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# 
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ------------------
+#
+# pytableaux - web server support test cases, without cherrypy
+from __future__ import annotations
+
+import gzip
+import time
+from concurrent.futures import BrokenExecutor, CancelledError
+from unittest import TestCase
+
+from pytableaux.errors import ProofTimeoutError
+from pytableaux.examples import arguments as examples
+from pytableaux.synthetic import pigeonhole
+from pytableaux.web import EnvConfig
+from pytableaux.web.cache import ResponseCache
+from pytableaux.web.pool import PoolFull, ProofPool
+from pytableaux.web.util import etag_matches
+
+
+class TestEtagMatches(TestCase):
+
+    def test_matches(self):
+        etag = '"abc"'
+        self.assertTrue(etag_matches('"abc"', etag))
+        self.assertTrue(etag_matches('"x", W/"abc"', etag))
+        self.assertTrue(etag_matches(' * ', etag))
+        self.assertFalse(etag_matches('', etag))
+        self.assertFalse(etag_matches('"ab"', etag))
+        self.assertFalse(etag_matches('"xabcx"', etag))
+        self.assertFalse(etag_matches('"abc"x', etag))
+
+
+class TestProofPool(TestCase):
+
+    def setUp(self):
+        config = EnvConfig.env_config() | dict(proof_pool_size=1, proof_queue_size=1)
+        self.pool = ProofPool(config)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_build(self):
+        rec = self.pool.build('CPL', examples['Addition'], {})
+        self.assertTrue(rec.valid)
+        self.assertEqual(self.pool.pending, 0)
+
+    def test_timeout_raises(self):
+        with self.assertRaises(ProofTimeoutError):
+            self.pool.build('CPL', pigeonhole(4), dict(build_timeout=100))
+        self.assertEqual(self.pool.pending, 0)
+
+    def test_cancel_raises(self):
+        with self.assertRaises(CancelledError):
+            self.pool.build('CPL', pigeonhole(4), dict(build_timeout=5000),
+                cancel = lambda: True)
+
+    def test_full_raises(self):
+        futures = [
+            self.pool.submit('CFOL', examples['Existential Syllogism'], {})
+            for _ in range(2)]
+        with self.assertRaises(PoolFull) as ctx:
+            self.pool.submit('CPL', examples['Addition'], {})
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+        for future in futures:
+            self.assertTrue(self.pool.result(future).valid)
+
+    def wait_running(self, future, timeout = 10):
+        deadline = time.monotonic() + timeout
+        while not future.running():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_kill_running_job(self):
+        future = self.pool.submit('CPL', pigeonhole(4), dict(build_timeout=20000))
+        self.wait_running(future)
+        self.pool.kill()
+        with self.assertRaises(BrokenExecutor):
+            self.pool.result(future, 10)
+        self.assertTrue(self.pool.build('CPL', examples['Addition'], {}).valid)
+
+    def test_kill_without_processes_attribute(self):
+        future = self.pool.submit('CPL', examples['Addition'], {})
+        self.pool.result(future)
+        executor = self.pool._executor
+        processes = executor._processes
+        del executor._processes
+        try:
+            with self.assertLogs(self.pool.logger, 'WARNING') as logs:
+                self.pool.kill()
+        finally:
+            executor._processes = processes
+            executor.shutdown()
+        self.assertIn('Cannot find', logs.output[-1])
+        self.assertFalse(self.pool.running)
+
+    def test_kill_restarts_workers(self):
+        future = self.pool.submit('CPL', examples['Addition'], {})
+        self.pool.kill()
+        self.assertFalse(self.pool.running)
+        try:
+            self.pool.result(future)
+        except BrokenExecutor:
+            pass
+        rec = self.pool.build('CPL', examples['Addition'], {})
+        self.assertTrue(rec.valid)
+
+
+class TestResponseCache(TestCase):
+
+    def test_key_normalized(self):
+        cache = ResponseCache(1024)
+        self.assertEqual(
+            cache.key({'b': 1, 'a': {'c': ()}}),
+            cache.key({'a': {'c': []}, 'b': 1}))
+
+    def test_get_put(self):
+        cache = ResponseCache(1024)
+        self.assertIsNone(cache.get('x'))
+        entry = cache.put('x', b'body' * 10, 'text/plain')
+        self.assertIs(cache.get('x'), entry)
+        self.assertEqual(gzip.decompress(entry.gzipped), entry.body)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_etag_is_content_hash(self):
+        cache = ResponseCache(1024)
+        a = cache.put('a', b'body')
+        b = cache.put('b', b'body')
+        c = cache.put('c', b'other')
+        self.assertEqual(a.etag, b.etag)
+        self.assertNotEqual(a.etag, c.etag)
+        self.assertTrue(etag_matches(a.etag, b.etag))
+
+    def test_evicts_by_size(self):
+        cache = ResponseCache(300)
+        for key in 'abc':
+            cache.put(key, bytes(100))
+        self.assertNotIn('a', cache)
+        self.assertLessEqual(cache.size, 300)
+        cache.put('big', bytes(1000))
+        self.assertNotIn('big', cache)
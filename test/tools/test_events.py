@@ -42,3 +42,45 @@ class TestListeners(Base):
         self.assertIn(cb, e['test'])
         e.off('test', cb)
         self.assertEqual(len(e['test']), 0)
+
+    def test_on_after_emit_recompiles(self):
+        calls = []
+        e = EventsListeners('test')
+        e.on('test', calls.append)
+        e.emit('test', 1)
+        e.on('test', lambda x: calls.append(-x))
+        self.assertEqual(e.emit('test', 2), 2)
+        e.off('test', calls.append)
+        e.emit('test', 3)
+        self.assertEqual(calls, [1, 2, -2, -3])
+
+    def test_once_then_fast_path(self):
+        calls = []
+        e = EventsListeners('test')
+        e.on('test', calls.append)
+        e.once('test', lambda x: calls.append(-x))
+        e.emit('test', 1)
+        e.emit('test', 2)
+        self.assertEqual(calls, [1, -1, 2])
+        self.assertFalse(e['test'].onces)
+
+    def test_counting_false(self):
+        e = EventsListeners('test', counting=False)
+        e.on('test', lambda: None)
+        self.assertEqual(e.emit('test'), 1)
+        self.assertEqual(e.emitcount, 0)
+        self.assertEqual(e['test'].callcount, 0)
+        self.assertFalse(e.copy().counting)
+        e = EventsListeners('test')
+        e.on('test', lambda: None)
+        e.emit('test')
+        self.assertEqual(e.emitcount, 1)
+        self.assertEqual(e.callcount, 1)
+
+    def test_copy_listeners_keeps_type(self):
+        def cb(): pass
+        e = EventsListeners('test')
+        e.on('test', cb)
+        c = e.copy(listeners=True)
+        self.assertIsInstance(c, EventsListeners)
+        self.assertIn(cb, c['test'])
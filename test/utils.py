@@ -26,7 +26,7 @@ from unittest import TestCase
 
 from pytableaux.examples import arguments as examples
 from pytableaux.lang import *
-from pytableaux.logics import LogicType, registry
+from pytableaux.logics import LogicSet, LogicType, registry
 from pytableaux.proof import *
 from pytableaux.tools import EMPTY_MAP, inflect
 
@@ -36,7 +36,9 @@ _RT = TypeVar('_RT', bound=Rule)
 
 __all__ = (
     'BaseCase',
+    'logicopt',
     'maketest',
+    'readlist',
     'tabiter')
 
 class BaseCase(TestCase):
@@ -187,3 +189,16 @@ def tabiter(*logics, build=True, grouparg=False, registry=registry, shuffle=Fals
         if build:
             tab.build()
         yield tab
+
+def logicopt(s: str):
+    logics = LogicSet()
+    exclude = s[0] == '^'
+    if exclude:
+        logics |= registry.all()
+        logics -= readlist(s[1:])
+    else:
+        logics |= readlist(s)
+    return logics
+
+def readlist(s: str, /, *, sep=','):
+    return filter(None, map(str.strip, s.split(sep)))